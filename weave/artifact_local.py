@@ -1,6 +1,7 @@
 import contextlib
 import dataclasses
 import hashlib
+import logging
 import os
 import json
 import typing
@@ -8,6 +9,8 @@ import shutil
 from datetime import datetime
 import pathlib
 import tempfile
+import threading
+import time
 
 from . import uris
 from . import util
@@ -20,6 +23,9 @@ from . import file_base
 from . import file_util
 from . import filesystem
 from . import environment
+from . import engine_trace
+
+statsd = engine_trace.statsd()  # type: ignore
 
 WORKING_DIR_PREFIX = "__working__"
 
@@ -45,6 +51,157 @@ def md5_string(string: str) -> str:
     return hash_md5.hexdigest()
 
 
+# Saved versions are directories of hard links into a content addressed blob
+# store shared by all local artifacts, with a manifest of each file's md5.
+# Saving a new version from an existing one links the files it keeps instead
+# of copying them, and takes their hashes from the manifest instead of
+# re-reading them. A blob that no version links to anymore has a link count
+# of one, and collect_garbage_blobs removes it. The IO server runs that
+# periodically, see start_blob_gc_thread.
+#
+# Filesystems without hard links get copies, as before the blob store.
+BLOB_DIR_NAME = ".blobs"
+MANIFEST_FILENAME = ".artifact-manifest.json"
+METADATA_FILENAME = ".artifact-version.json"
+_VERSION_BOOKKEEPING_FILES = (MANIFEST_FILENAME, METADATA_FILENAME)
+
+
+def blob_dir() -> str:
+    return os.path.join(local_artifact_dir(), BLOB_DIR_NAME)
+
+
+def _blob_path(digest: str) -> str:
+    return os.path.join(blob_dir(), digest[:2], digest)
+
+
+def _add_blob(path: str, digest: str) -> None:
+    blob_path = _blob_path(digest)
+    if os.path.exists(blob_path):
+        return
+    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+    try:
+        os.link(path, blob_path)
+    except FileExistsError:
+        pass
+    except OSError:
+        # No hard links on this filesystem, versions keep their own copies.
+        pass
+
+
+def _link_file(sources: typing.Iterable[str], target_path: str) -> None:
+    # The first source can be a blob that collect_garbage_blobs removes under
+    # us, so fall through to the next one.
+    sources = list(sources)
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    for src_path in sources:
+        try:
+            os.link(src_path, target_path)
+            return
+        except FileNotFoundError:
+            continue
+        except OSError:
+            break
+    shutil.copyfile(sources[-1], target_path)
+
+
+def _walk_files(dirname: str) -> typing.Iterator[str]:
+    for dirpath, dnames, fnames in os.walk(dirname):
+        for f in fnames:
+            full_path = os.path.join(dirpath, f)
+            relpath = os.path.relpath(full_path, dirname)
+            if relpath not in _VERSION_BOOKKEEPING_FILES:
+                yield relpath
+
+
+def _hash_files(dirname: str) -> dict[str, str]:
+    return {
+        relpath: md5_hash_file(os.path.join(dirname, relpath))
+        for relpath in _walk_files(dirname)
+    }
+
+
+def collect_garbage_blobs(
+    min_age_sec: float = 60.0, blob_root: typing.Optional[str] = None
+) -> int:
+    """Remove blobs no saved version links to. Returns the bytes freed.
+
+    Blobs linked or added within min_age_sec are kept, a save may be about
+    to link them into its new version.
+    """
+    if blob_root is None:
+        blob_root = blob_dir()
+    cutoff = time.time() - min_age_sec
+    freed_bytes = 0
+    freed_blobs = 0
+    for dirpath, dnames, fnames in os.walk(blob_root):
+        for f in fnames:
+            path = os.path.join(dirpath, f)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            # Linking changes the inode's ctime, not its mtime.
+            if st.st_nlink > 1 or st.st_ctime > cutoff:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            freed_bytes += st.st_size
+            freed_blobs += 1
+    statsd.increment("weave.local_artifact.blob_gc.bytes", freed_bytes)
+    statsd.increment("weave.local_artifact.blob_gc.blobs", freed_blobs)
+    return freed_bytes
+
+
+def _all_blob_dirs() -> typing.Iterator[str]:
+    # Each user's filesystem dir has its own local artifacts, see
+    # filesystem.get_filesystem_dir.
+    root = environment.weave_filesystem_dir()
+    try:
+        user_dirs = [os.path.join(root, d) for d in os.listdir(root)]
+    except FileNotFoundError:
+        return
+    for fs_dir in [root] + user_dirs:
+        path = os.path.join(fs_dir, "local-artifacts", BLOB_DIR_NAME)
+        if os.path.isdir(path):
+            yield path
+
+
+def collect_all_garbage_blobs(min_age_sec: float = 60.0) -> int:
+    """collect_garbage_blobs for every user's blob store."""
+    return sum(
+        collect_garbage_blobs(min_age_sec, blob_root)
+        for blob_root in _all_blob_dirs()
+    )
+
+
+class BlobGCThread(threading.Thread):
+    def __init__(self, interval_sec: float) -> None:
+        super().__init__(name="Weave local artifact blob gc", daemon=True)
+        self.interval_sec = interval_sec
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval_sec):
+            try:
+                collect_all_garbage_blobs()
+            except Exception:
+                logging.exception("Local artifact blob gc failed")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+def start_blob_gc_thread() -> typing.Optional[BlobGCThread]:
+    interval_sec = environment.local_artifact_blob_gc_interval_sec()
+    if interval_sec is None:
+        return None
+    thread = BlobGCThread(interval_sec)
+    thread.start()
+    return thread
+
+
 def local_artifact_exists(name: str, branch: str) -> bool:
     return os.path.exists(os.path.join(local_artifact_dir(), name, branch))
 
@@ -328,7 +485,7 @@ class LocalArtifact(artifact_fs.FilesystemArtifact):
         if not self._read_dirname:
             return {}
         with file_util.safe_open(
-            os.path.join(self._read_dirname, ".artifact-version.json")
+            os.path.join(self._read_dirname, METADATA_FILENAME)
         ) as f:
             obj = json.load(f)
             obj["created_at"] = datetime.fromisoformat(obj["created_at"])
@@ -336,33 +493,41 @@ class LocalArtifact(artifact_fs.FilesystemArtifact):
 
     def write_metadata(self, dirname, metadata):
         self._makedir(dirname)
-        with file_util.safe_open(
-            os.path.join(dirname, ".artifact-version.json"), "w"
-        ) as f:
+        with file_util.safe_open(os.path.join(dirname, METADATA_FILENAME), "w") as f:
             json.dump({"created_at": datetime.now().isoformat(), **metadata}, f)
 
+    def _read_manifest(self) -> dict[str, str]:
+        # Versions saved before the blob store have no manifest.
+        manifest_path = os.path.join(self._read_dirname, MANIFEST_FILENAME)
+        try:
+            with file_util.safe_open(manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return _hash_files(self._read_dirname)
+
+    def _write_manifest(self, dirname: str, manifest: dict[str, str]) -> None:
+        with file_util.safe_open(os.path.join(dirname, MANIFEST_FILENAME), "w") as f:
+            json.dump(manifest, f)
+
     def save(self, branch=None):
         for handler in self._path_handlers.values():
             handler.close()
         self._path_handlers = {}
-        manifest = {}
-        if self._read_dirname:
-            for dirpath, dnames, fnames in os.walk(self._read_dirname):
-                for f in fnames:
-                    if f != ".artifact-version.json":
-                        full_path = os.path.join(dirpath, f)
-                        manifest[f] = md5_hash_file(full_path)
-        for dirpath, dnames, fnames in os.walk(self._write_dirname):
-            for f in fnames:
-                if f != ".artifact-version.json":
-                    full_path = os.path.join(dirpath, f)
-                    manifest[f] = md5_hash_file(full_path)
-        commit_hash = md5_string(json.dumps(manifest, sort_keys=True, indent=2))[
+        read_files = self._read_manifest() if self._read_dirname else {}
+        write_files = _hash_files(self._write_dirname)
+        # Version hashes are over file names, not paths, as they always were.
+        hash_manifest = {}
+        for relpath, digest in [*read_files.items(), *write_files.items()]:
+            hash_manifest[os.path.basename(relpath)] = digest
+        commit_hash = md5_string(json.dumps(hash_manifest, sort_keys=True, indent=2))[
             : artifact_wandb.WANDB_COMMIT_HASH_LENGTH
         ]
 
         new_dirname = os.path.join(self._root, commit_hash)
 
+        for relpath, digest in write_files.items():
+            _add_blob(os.path.join(self._write_dirname, relpath), digest)
+
         if not self._read_dirname:
             # we're not read-modify-writing an existing version, so
             # just rename the write dir
@@ -373,34 +538,36 @@ class LocalArtifact(artifact_fs.FilesystemArtifact):
                 if os.path.exists(self._write_dirname):
                     shutil.rmtree(self._write_dirname)
         else:
-            # read-modify-write of existing version, so copy existing
-            # files into new dir first, then overwrite with new files
+            # read-modify-write of existing version, so link the files we
+            # keep from the blob store, then move in the new files
 
             # using a working directory so we can atomic rename at end
             tmpdir = os.path.join(self._root, "tmpwritedir-%s" % util.rand_string_n(12))
             os.makedirs(tmpdir, exist_ok=True)
-            if self._read_dirname:
-                for path in os.listdir(self._read_dirname):
-                    src_path = os.path.join(self._read_dirname, path)
-                    target_path = os.path.join(tmpdir, path)
-                    if os.path.isdir(src_path):
-                        shutil.copytree(src_path, target_path)
-                    else:
-                        shutil.copyfile(src_path, target_path)
+            for relpath, digest in read_files.items():
+                if relpath in write_files:
+                    continue
+                read_path = os.path.join(self._read_dirname, relpath)
+                _link_file(
+                    [_blob_path(digest), read_path], os.path.join(tmpdir, relpath)
+                )
+                _add_blob(read_path, digest)
             if os.path.exists(self._write_dirname):
-                for path in os.listdir(self._write_dirname):
-                    src_path = os.path.join(self._write_dirname, path)
-                    target_path = os.path.join(tmpdir, path)
-                    if os.path.isdir(src_path):
-                        shutil.copytree(src_path, target_path, dirs_exist_ok=True)
-                    else:
-                        shutil.copyfile(src_path, target_path)
+                for dirpath, dnames, fnames in os.walk(self._write_dirname):
+                    relpath = os.path.relpath(dirpath, self._write_dirname)
+                    os.makedirs(os.path.join(tmpdir, relpath), exist_ok=True)
+                for relpath in write_files:
+                    os.replace(
+                        os.path.join(self._write_dirname, relpath),
+                        os.path.join(tmpdir, relpath),
+                    )
             try:
                 os.rename(tmpdir, new_dirname)
             except OSError:
                 shutil.rmtree(tmpdir)
             if os.path.exists(self._write_dirname):
                 shutil.rmtree(self._write_dirname)
+        self._write_manifest(new_dirname, {**read_files, **write_files})
 
         if branch is None:
             branch = self._branch
@@ -470,7 +637,7 @@ class LocalArtifact(artifact_fs.FilesystemArtifact):
             sub_dirs = {}
             for sub_path in local_path.iterdir():
                 relpath = str(sub_path.relative_to(read_dirname))
-                if relpath == ".artifact-version.json":
+                if relpath in _VERSION_BOOKKEEPING_FILES:
                     continue
                 if sub_path.is_file():
                     sub_files[sub_path.name] = artifact_fs.FilesystemArtifactFile(
@@ -1,5 +1,9 @@
-import typing
+import collections
+import dataclasses
 import datetime
+import sys
+import threading
+import typing
 
 from . import engine_trace
 from . import wandb_api
@@ -18,14 +22,28 @@ def get_user_cache_key() -> typing.Optional[str]:
     return ctx.user_id
 
 
-# TODO: stats, test
-
 CacheKeyType = typing.TypeVar("CacheKeyType")
 CacheValueType = typing.TypeVar("CacheValueType")
 
+FullKeyType = typing.Tuple[typing.Optional[str], CacheKeyType]
+
+
+@dataclasses.dataclass
+class _Entry(typing.Generic[CacheValueType]):
+    # Time the value was set. Reading an entry does not change this, so
+    # max_age bounds how stale a value can be, regardless of how hot it is.
+    set_at: datetime.datetime
+    value: CacheValueType
+    size: int
+
 
 class LruTimeWindowCache(typing.Generic[CacheKeyType, CacheValueType]):
-    """A cache that stores values for a fixed amount of time.
+    """A bounded LRU cache whose values expire a fixed time after they are set.
+
+    Entries are evicted when they are older than max_age, or, least recently
+    used first, when the cache holds more than max_entries entries or more than
+    max_bytes bytes as measured by size_fn. An entry that is larger than
+    max_bytes on its own is not cached.
 
     Respects the user cache key, so that different users don't share the same cache.
     """
@@ -39,45 +57,97 @@ class LruTimeWindowCache(typing.Generic[CacheKeyType, CacheValueType]):
         self,
         max_age: datetime.timedelta,
         now_fn: typing.Callable[[], datetime.datetime] = datetime.datetime.now,
+        max_entries: typing.Optional[int] = None,
+        max_bytes: typing.Optional[int] = None,
+        size_fn: typing.Callable[[CacheValueType], int] = sys.getsizeof,
+        name: str = "default",
     ) -> None:
         self.max_age = max_age
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
         self._now_fn = now_fn
+        self._size_fn = size_fn
+        self._tags = [f"cache:{name}"]
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        # Recency order, least recently used at the front.
+        self._cache: collections.OrderedDict[
+            FullKeyType, _Entry[CacheValueType]
+        ] = collections.OrderedDict()
+        # Set order, oldest at the front. Lets us expire in O(1) per entry
+        # even though reads reorder _cache.
+        self._set_order: collections.OrderedDict[
+            FullKeyType, None
+        ] = collections.OrderedDict()
+
+    def _full_key(self, key: CacheKeyType) -> FullKeyType:
+        return (get_user_cache_key(), key)
 
-        # Items are time ordered, with oldest at the front.
-        self._cache: dict[
-            typing.Tuple[typing.Optional[str], CacheKeyType],
-            typing.Tuple[datetime.datetime, CacheValueType],
-        ] = {}
+    def _remove(self, full_key: FullKeyType) -> None:
+        entry = self._cache.pop(full_key)
+        del self._set_order[full_key]
+        self._bytes -= entry.size
 
-    def _full_key(
-        self, key: CacheKeyType
-    ) -> typing.Tuple[typing.Optional[str], CacheKeyType]:
-        return (get_user_cache_key(), key)
+    def _evict(self, full_key: FullKeyType, reason: str) -> None:
+        self._remove(full_key)
+        statsd.increment("weave.cache.evict", tags=self._tags + [f"reason:{reason}"])
+
+    def _expired(self, entry: _Entry[CacheValueType], now: datetime.datetime) -> bool:
+        return now - entry.set_at > self.max_age
 
     def _prune(self, now: datetime.datetime) -> None:
-        for key, val in list(self._cache.items()):
-            if now - val[0] > self.max_age:
-                del self._cache[key]
-            else:
+        while self._set_order:
+            full_key = next(iter(self._set_order))
+            if not self._expired(self._cache[full_key], now):
                 break
-        statsd.gauge("weave.cache.size", len(self._cache))
+            self._evict(full_key, "age")
+        while self.max_entries is not None and len(self._cache) > self.max_entries:
+            self._evict(next(iter(self._cache)), "entries")
+        while self.max_bytes is not None and self._bytes > self.max_bytes:
+            self._evict(next(iter(self._cache)), "bytes")
+        statsd.gauge("weave.cache.size", len(self._cache), tags=self._tags)
+        statsd.gauge("weave.cache.bytes", self._bytes, tags=self._tags)
 
     def get(self, key: CacheKeyType) -> typing.Union[NotFound, CacheValueType]:
         full_key = self._full_key(key)
-        val = self._cache.get(full_key)
-        if val is None:
-            statsd.increment("weave.cache.miss")
-            return self.NOT_FOUND
-        # Set the value again to move it to the end of the cache
-        self.set(key, val[1])
-        statsd.increment("weave.cache.hit")
-        return val[1]
+        now = self._now_fn()
+        with self._lock:
+            entry = self._cache.get(full_key)
+            if entry is not None and self._expired(entry, now):
+                self._evict(full_key, "age")
+                entry = None
+            if entry is None:
+                statsd.increment("weave.cache.miss", tags=self._tags)
+                return self.NOT_FOUND
+            self._cache.move_to_end(full_key)
+        statsd.increment("weave.cache.hit", tags=self._tags)
+        return entry.value
 
     def set(self, key: CacheKeyType, value: CacheValueType) -> None:
         full_key = self._full_key(key)
         now = self._now_fn()
-        if full_key in self._cache:
-            # Delete so we move to the end of the cache
-            del self._cache[full_key]
-        self._cache[full_key] = (now, value)
-        self._prune(now)
+        size = self._size_fn(value)
+        with self._lock:
+            if full_key in self._cache:
+                self._remove(full_key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                statsd.increment("weave.cache.too_large", tags=self._tags)
+            else:
+                self._cache[full_key] = _Entry(now, value, size)
+                self._set_order[full_key] = None
+                self._bytes += size
+            self._prune(now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._set_order.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
@@ -29,6 +29,7 @@ from . import input_provider
 from . import partial_object
 from . import gql_to_weave
 from . import gql_op_plugin
+from . import compile_plan_cache
 
 from .language_features.tagging import tagged_value_type_helpers
 
@@ -38,6 +39,8 @@ from .language_features.tagging import tagged_value_type_helpers
 
 DEBUG_COMPILE = False
 
+statsd = engine_trace.statsd()  # type: ignore
+
 
 def _dispatch_error_is_client_error(
     op_name: str, input_types: dict[str, types.Type]
@@ -237,8 +240,11 @@ def _simple_optimizations(node: graph.Node) -> typing.Optional[graph.Node]:
         # refinement, table row count, and with logic that is conditioned on
         # empty tables
         arr_node = node.from_op.inputs["arr"]
-        if isinstance(arr_node, graph.OutputNode) and arr_node.from_op.name.startswith(
-            "run-history"
+        if (
+            isinstance(arr_node, graph.OutputNode)
+            and arr_node.from_op.name.startswith("run-history")
+            # Sampled history has fewer rows than the full history
+            and not arr_node.from_op.name.startswith("run-history3_sampled")
         ):
             run_node = arr_node.from_op.inputs["run"]
             return graph.OutputNode(
@@ -391,11 +397,22 @@ _execute_nodes_map_fn = _make_auto_op_map_fn(
 _quote_nodes_map_fn = _make_inverse_auto_op_map_fn(types.Function, _quote_node)
 
 
+def _is_awl_typed_dict_get(node: graph.Node) -> bool:
+    from .ops_arrow import ArrowWeaveListType
+
+    return (
+        isinstance(node, graph.OutputNode)
+        and node.from_op.name == "get"
+        and isinstance(node.type, ArrowWeaveListType)
+        and isinstance(node.type.object_type, types.TypedDict)
+    )
+
+
 def compile_apply_column_pushdown(
     leaf_nodes: list[graph.Node], on_error: graph.OnErrorFnType = None
 ) -> list[graph.Node]:
-    # This is specific to project-runs2 (not yet used in W&B production) for now. But it
-    # is a general pattern that will work for all arrow tables.
+    # This is specific to project-runs2, history and gets of saved ArrowWeaveLists
+    # for now. But it is a general pattern that will work for all arrow tables.
 
     op_names = [
         "project-runs2",
@@ -405,17 +422,57 @@ def compile_apply_column_pushdown(
         "mapped_run-history",
         "run-history3",
         "mapped_run-history3",
+        "run-history3_sampled",
+        "mapped_run-history3_sampled",
     ]
 
-    if not graph.filter_nodes_full(
-        leaf_nodes,
-        lambda n: isinstance(n, graph.OutputNode) and n.from_op.name in op_names,
-    ):
+    has_history_nodes = bool(
+        graph.filter_nodes_full(
+            leaf_nodes,
+            lambda n: isinstance(n, graph.OutputNode) and n.from_op.name in op_names,
+        )
+    )
+    has_get_nodes = bool(graph.filter_nodes_full(leaf_nodes, _is_awl_typed_dict_get))
+    if not has_history_nodes and not has_get_nodes:
         return leaf_nodes
 
-    p = stitch.stitch(leaf_nodes, on_error=on_error)
+    # Pushing columns into gets needs to see every use of the get, so it's
+    # skipped if stitch fails for any part of the graph.
+    stitch_errors: list[Exception] = []
+
+    def _on_stitch_error(node_ndx: int, e: Exception) -> typing.Any:
+        stitch_errors.append(e)
+        # Graphs with only gets didn't need stitch before, so their stitch
+        # errors aren't the caller's to handle.
+        if on_error is None or not has_history_nodes:
+            raise e
+        return on_error(node_ndx, e)
+
+    try:
+        p = stitch.stitch(leaf_nodes, on_error=_on_stitch_error)
+    except Exception:
+        if has_history_nodes:
+            raise
+        return leaf_nodes
 
     def _replace_with_column_pushdown(node: graph.Node) -> graph.Node:
+        if (
+            not stitch_errors
+            and _is_awl_typed_dict_get(node)
+            and isinstance(node.from_op.inputs["uri"], graph.ConstNode)
+            and p.has_result(node)
+        ):
+            columns = compile_table.get_top_level_columns(p, node, leaf_nodes)
+            object_type = node.type.object_type  # type: ignore
+            if columns and set(columns) < set(object_type.property_types):
+                return graph.OutputNode(
+                    node.type,
+                    "get_with_columns",
+                    {
+                        "uri": node.from_op.inputs["uri"],
+                        "columns": weave_internal.const(columns),
+                    },
+                )
         if isinstance(node, graph.OutputNode) and node.from_op.name in op_names:
             forward_obj = p.get_result(node)
             run_cols = compile_table.get_projection(forward_obj)
@@ -434,6 +491,25 @@ def compile_apply_column_pushdown(
             if "run-history" in node.from_op.name:
                 history_cols = list(run_cols.keys())
 
+                if len(history_cols) > 0 and node.from_op.name.endswith(
+                    "run-history3_sampled"
+                ):
+                    return graph.OutputNode(
+                        node.type,
+                        node.from_op.name.replace(
+                            "run-history3_sampled", "run-history3_pushdown"
+                        ),
+                        {
+                            "run": node.from_op.inputs["run"],
+                            "history_cols": weave_internal.const(
+                                list(set([*history_cols, "_step"]))
+                            ),
+                            "min_step": weave_internal.const(None),
+                            "max_step": weave_internal.const(None),
+                            "max_points": node.from_op.inputs["max_points"],
+                            "sample_mode": node.from_op.inputs["sample_mode"],
+                        },
+                    )
                 if len(history_cols) > 0:
                     return graph.OutputNode(
                         node.type,
@@ -450,15 +526,242 @@ def compile_apply_column_pushdown(
     return graph.map_nodes_full(leaf_nodes, _replace_with_column_pushdown, on_error)
 
 
+_HISTORY_STEP_PUSHDOWN_OP_NAMES = ["run-history3_with_columns", "run-history3_pushdown"]
+
+StepRange = typing.Tuple[typing.Optional[float], typing.Optional[float]]
+
+
+def _is_history_step_pick(node: graph.Node, row_var_name: str) -> bool:
+    if not (
+        isinstance(node, graph.OutputNode)
+        and node.from_op.name in ["pick", "typedDict-pick"]
+    ):
+        return False
+    obj_node, key_node = list(node.from_op.inputs.values())
+    return (
+        isinstance(obj_node, graph.VarNode)
+        and obj_node.name == row_var_name
+        and isinstance(key_node, graph.ConstNode)
+        and key_node.val == "_step"
+    )
+
+
+def _const_number(node: graph.Node) -> typing.Optional[float]:
+    if (
+        isinstance(node, graph.ConstNode)
+        and isinstance(node.val, (int, float))
+        and not isinstance(node.val, bool)
+    ):
+        return node.val
+    return None
+
+
+def _intersect_step_ranges(a: StepRange, b: StepRange) -> StepRange:
+    lo = max((x for x in (a[0], b[0]) if x is not None), default=None)
+    hi = min((x for x in (a[1], b[1]) if x is not None), default=None)
+    return (lo, hi)
+
+
+def _step_range_from_predicate(
+    node: graph.Node, row_var_name: str
+) -> typing.Optional[StepRange]:
+    # Returns a step range that contains every row for which the predicate is
+    # true, or None if we can't tell. Strict comparisons produce inclusive
+    # bounds, which is fine since the filter itself is still applied.
+    if not isinstance(node, graph.OutputNode):
+        return None
+    op_name = node.from_op.name
+    if op_name == "and":
+        ranges = [
+            _step_range_from_predicate(n, row_var_name)
+            for n in node.from_op.inputs.values()
+        ]
+        known = [r for r in ranges if r is not None]
+        if not known:
+            return None
+        result: StepRange = (None, None)
+        for r in known:
+            result = _intersect_step_ranges(result, r)
+        return result
+    if op_name not in [
+        "number-greater",
+        "number-greaterEqual",
+        "number-less",
+        "number-lessEqual",
+    ]:
+        return None
+    lhs, rhs = list(node.from_op.inputs.values())
+    is_lower_bound = op_name.startswith("number-greater")
+    if _is_history_step_pick(lhs, row_var_name):
+        bound = _const_number(rhs)
+    elif _is_history_step_pick(rhs, row_var_name):
+        bound = _const_number(lhs)
+        is_lower_bound = not is_lower_bound
+    else:
+        return None
+    if bound is None:
+        return None
+    return (bound, None) if is_lower_bound else (None, bound)
+
+
+def compile_apply_history_step_pushdown(
+    leaf_nodes: list[graph.Node], on_error: graph.OnErrorFnType = None
+) -> list[graph.Node]:
+    # Pushes `_step` range predicates of a filter into the history op it
+    # filters, so that parquet row groups outside of the range are skipped.
+    # The filter is kept, the pushdown only reduces how much data is read.
+
+    def _push_step_range(node: graph.Node) -> graph.Node:
+        if not (
+            isinstance(node, graph.OutputNode)
+            and node.from_op.name in ["ArrowWeaveList-filter", "filter"]
+        ):
+            return node
+        arr_name, fn_name = list(node.from_op.inputs.keys())
+        arr_node = node.from_op.inputs[arr_name]
+        fn_node = node.from_op.inputs[fn_name]
+        if not (
+            isinstance(arr_node, graph.OutputNode)
+            and arr_node.from_op.name in _HISTORY_STEP_PUSHDOWN_OP_NAMES
+            and isinstance(fn_node, graph.ConstNode)
+            and isinstance(fn_node.type, types.Function)
+            and isinstance(fn_node.val, graph.Node)
+            and fn_node.type.input_types
+        ):
+            return node
+        row_var_name = next(iter(fn_node.type.input_types))
+        step_range = _step_range_from_predicate(fn_node.val, row_var_name)
+        if step_range is None:
+            return node
+
+        hist_inputs = arr_node.from_op.inputs
+        max_points_node = hist_inputs.get("max_points")
+        if max_points_node is not None and not (
+            isinstance(max_points_node, graph.ConstNode) and max_points_node.val is None
+        ):
+            # The op downsamples the rows in its step range, so narrowing the
+            # range would change which rows the filter sees.
+            return node
+        pushdown_inputs = {
+            "run": hist_inputs["run"],
+            "history_cols": hist_inputs["history_cols"],
+            "min_step": weave_internal.const(None),
+            "max_step": weave_internal.const(None),
+            "max_points": hist_inputs.get("max_points", weave_internal.const(None)),
+            "sample_mode": hist_inputs.get("sample_mode", weave_internal.const(None)),
+        }
+        if arr_node.from_op.name == "run-history3_pushdown":
+            min_node = hist_inputs["min_step"]
+            max_node = hist_inputs["max_step"]
+            if not (
+                isinstance(min_node, graph.ConstNode)
+                and isinstance(max_node, graph.ConstNode)
+            ):
+                return node
+            step_range = _intersect_step_ranges(
+                (min_node.val, max_node.val), step_range
+            )
+            if step_range == (min_node.val, max_node.val):
+                return node
+        pushdown_inputs["min_step"] = weave_internal.const(step_range[0])
+        pushdown_inputs["max_step"] = weave_internal.const(step_range[1])
+        return graph.OutputNode(
+            node.type,
+            node.from_op.name,
+            {
+                arr_name: graph.OutputNode(
+                    arr_node.type, "run-history3_pushdown", pushdown_inputs
+                ),
+                fn_name: fn_node,
+            },
+        )
+
+    return graph.map_nodes_full(leaf_nodes, _push_step_range, on_error)
+
+
+def _consumer_counts(leaf_nodes: list[graph.Node]) -> dict[graph.Node, int]:
+    counts: dict[graph.Node, int] = {}
+    for node in leaf_nodes:
+        counts[node] = counts.get(node, 0) + 1
+    for node in graph.all_nodes_full(leaf_nodes):
+        if isinstance(node, graph.OutputNode):
+            for input_node in node.from_op.inputs.values():
+                counts[input_node] = counts.get(input_node, 0) + 1
+    return counts
+
+
+def _const_non_negative_int(node: graph.Node) -> typing.Optional[int]:
+    if (
+        isinstance(node, graph.ConstNode)
+        and isinstance(node.val, int)
+        and not isinstance(node.val, bool)
+        and node.val >= 0
+    ):
+        return node.val
+    return None
+
+
+def compile_apply_sort_limit_pushdown(
+    leaf_nodes: list[graph.Node], on_error: graph.OnErrorFnType = None
+) -> list[graph.Node]:
+    # Rewrites limit(sort(arr)) and limit(offset(sort(arr))) on
+    # ArrowWeaveLists into a single top-K op, which doesn't fully sort arr
+    # and only takes the rows that are returned. The sort (and offset) must
+    # have no other consumers, otherwise we'd sort twice.
+    consumer_counts = _consumer_counts(leaf_nodes)
+
+    def _only_consumed_once(node: graph.Node) -> bool:
+        return consumer_counts.get(node) == 1
+
+    def _push_limit_into_sort(node: graph.Node) -> graph.Node:
+        if not (
+            isinstance(node, graph.OutputNode)
+            and node.from_op.name == "ArrowWeaveList-limit"
+        ):
+            return node
+        arr_node, limit_node = list(node.from_op.inputs.values())
+        limit = _const_non_negative_int(limit_node)
+        if limit is None:
+            return node
+        offset = 0
+        if (
+            isinstance(arr_node, graph.OutputNode)
+            and arr_node.from_op.name == "ArrowWeaveList-offset"
+            and _only_consumed_once(arr_node)
+        ):
+            arr_node, offset_node = list(arr_node.from_op.inputs.values())
+            offset = _const_non_negative_int(offset_node)  # type: ignore
+            if offset is None:
+                return node
+        if not (
+            isinstance(arr_node, graph.OutputNode)
+            and arr_node.from_op.name == "ArrowWeaveList-sort"
+            and _only_consumed_once(arr_node)
+        ):
+            return node
+        self_node, comp_fn_node, col_dirs_node = list(arr_node.from_op.inputs.values())
+        return graph.OutputNode(
+            node.type,
+            "ArrowWeaveList-sortTopK",
+            {
+                "self": self_node,
+                "comp_fn": comp_fn_node,
+                "col_dirs": col_dirs_node,
+                "offset": weave_internal.const(offset),
+                "limit": weave_internal.const(limit),
+            },
+        )
+
+    return graph.map_nodes_full(leaf_nodes, _push_limit_into_sort, on_error)
+
+
 def compile_dedupe(
     leaf_nodes: list[graph.Node], on_error: graph.OnErrorFnType = None
 ) -> list[graph.Node]:
     nodes: dict[str, graph.Node] = {}
 
     def _dedupe(node: graph.Node) -> graph.Node:
-        from . import serialize
-
-        node_id = serialize.node_id(node)
+        node_id = node.digest()
         if node_id in nodes:
             return nodes[node_id]
         nodes[node_id] = node
@@ -932,104 +1235,96 @@ def _track_errors(fn):
     return final
 
 
-def _compile(
-    nodes: typing.List[graph.Node],
-) -> value_or_error.ValueOrErrors[graph.Node]:
-    tracer = engine_trace.tracer()
-    # logging.info("Starting compilation of graph with %s leaf nodes" % len(nodes))
-
-    results = value_or_error.ValueOrErrors.from_values(nodes)
+_CompilePassFn = typing.Callable[
+    [typing.List[graph.Node], graph.OnErrorFnType], typing.List[graph.Node]
+]
 
+# The compile pipeline, in order. Each entry is (trace name, pass).
+_COMPILE_PASSES: list[typing.Tuple[str, _CompilePassFn]] = [
     # If we're being called from WeaveJS, we need to use dispatch to determine
     # which ops to use. Critically, this first phase does not actually refine
     # op output types, so after this, the types in the graph are not yet correct.
-    with tracer.trace("compile:fix_calls"):
-        results = results.batch_map(_track_errors(compile_fix_calls))
-
+    ("compile:fix_calls", compile_fix_calls),
     # Auto-transforms, where we insert operations to convert between types
     # as needed.
     # TODO: is it ok to have this before final refine?
-    with tracer.trace("compile:await"):
-        results = results.batch_map(_track_errors(compile_await))
-    with tracer.trace("compile:execute"):
-        results = results.batch_map(_track_errors(compile_execute))
-    with tracer.trace("compile:function_calls"):
-        results = results.batch_map(_track_errors(compile_function_calls))
-    with tracer.trace("compile:quote"):
-        # Mission critical to call `compile:quote` before and node re-writing
-        # compilers such as compile:node_ops and compile:gql. Why?:
-        #
-        # It is useful to define a "static lambda". A "static lambda" is a const
-        # node of type function with no inputs. This is used in our system to
-        # represent a constant value which is a node. Useful for generating
-        # boards or any sort of op that operates on nodes themselves.
-        #
-        # Moreover, this compile step will automatically "quote" inputs to ops
-        # that expect node inputs - effectively making static lambdas when
-        # called for.
-        #
-        # Furthermore, it is important to know that stream table rows (and many
-        # other ops) now support expansion (meaning they get expanded into a
-        # chain of new nodes in the compile pass).
-        #
-        # Conceptually, this created an issue: Compile passes that mutate nodes
-        # (eg node expansion or gql compile) would modify the quoted node. But,
-        # these functions that consume nodes do not want modified nodes.
-        # Instead, we want the raw node that the caller intended. For this
-        # reason we should always call compile:quote before any node re-writing.
-        results = results.batch_map(_track_errors(compile_quote))
-
-    with tracer.trace("compile:static_function_types"):
-        results = results.batch_map(_track_errors(compile_static_function_types))
-
+    ("compile:await", compile_await),
+    ("compile:execute", compile_execute),
+    ("compile:function_calls", compile_function_calls),
+    # Mission critical to call `compile:quote` before and node re-writing
+    # compilers such as compile:node_ops and compile:gql. Why?:
+    #
+    # It is useful to define a "static lambda". A "static lambda" is a const
+    # node of type function with no inputs. This is used in our system to
+    # represent a constant value which is a node. Useful for generating
+    # boards or any sort of op that operates on nodes themselves.
+    #
+    # Moreover, this compile step will automatically "quote" inputs to ops
+    # that expect node inputs - effectively making static lambdas when
+    # called for.
+    #
+    # Furthermore, it is important to know that stream table rows (and many
+    # other ops) now support expansion (meaning they get expanded into a
+    # chain of new nodes in the compile pass).
+    #
+    # Conceptually, this created an issue: Compile passes that mutate nodes
+    # (eg node expansion or gql compile) would modify the quoted node. But,
+    # these functions that consume nodes do not want modified nodes.
+    # Instead, we want the raw node that the caller intended. For this
+    # reason we should always call compile:quote before any node re-writing.
+    ("compile:quote", compile_quote),
+    ("compile:static_function_types", compile_static_function_types),
     # Some ops require const input nodes. This pass executes any branches necessary
     # to ensure that requirement holds.
     # Only gql ops require this for now.
-    with tracer.trace("compile:resolve_required_consts"):
-        results = results.batch_map(_track_errors(compile_resolve_required_consts))
-
-    with tracer.trace("compile:node_ops"):
-        results = results.batch_map(_track_errors(compile_node_ops))
-
-    with tracer.trace("compile:simple_optimizations"):
-        # Simple Optimizations should happen after `node_ops` to ensure we operate on
-        # the expanded nodes.
-        results = results.batch_map(_track_errors(compile_simple_optimizations))
-
+    ("compile:resolve_required_consts", compile_resolve_required_consts),
+    ("compile:node_ops", compile_node_ops),
+    # Simple Optimizations should happen after `node_ops` to ensure we operate on
+    # the expanded nodes.
+    ("compile:simple_optimizations", compile_simple_optimizations),
     # The node ops phase above can expand nodes, leading to new nodes in the graph
     # that are potentially duplicates of others. dedupe will merge these nodes.
-    with tracer.trace("compile:dedupe"):
-        results = results.batch_map(_track_errors(compile_dedupe))
-
+    ("compile:dedupe", compile_dedupe),
     # Stitch is used in stages following this one. Stitch requires that lambdas
     # are unique in memory if they are arguments to unique ops. We can receive
     # graphs that violate this requirement, and dedupe will happily merge lambdas
     # even if they are used in different ops. lambda_uniqueness pulls them back
     # apart.
-    with tracer.trace("compile:lambda_uniqueness"):
-        results = results.batch_map(_track_errors(compile_lambda_uniqueness))
-
+    ("compile:lambda_uniqueness", compile_lambda_uniqueness),
     # Now that we have the correct calls, we can do our forward-looking pushdown
     # optimizations. These do not depend on having correct types in the graph.
-
-    with tracer.trace("compile:gql_query"):
-        results = results.batch_map(
-            _track_errors(compile_domain.apply_domain_op_gql_translation)
-        )
-
-    with tracer.trace("compile:initialize_gql_types"):
-        results = results.batch_map(_track_errors(compile_initialize_gql_types))
-
-    with tracer.trace("compile:column_pushdown"):
-        results = results.batch_map(_track_errors(compile_apply_column_pushdown))
-
+    ("compile:gql_query", compile_domain.apply_domain_op_gql_translation),
+    ("compile:initialize_gql_types", compile_initialize_gql_types),
+    ("compile:column_pushdown", compile_apply_column_pushdown),
+    ("compile:history_step_pushdown", compile_apply_history_step_pushdown),
+    ("compile:sort_limit_pushdown", compile_apply_sort_limit_pushdown),
     # Final refine, to ensure the graph types are exactly what Weave python
     # produces. This phase can execute parts of the graph. It's very important
     # that this is the final phase, so that when we execute the rest of the
     # graph, we reuse any results produced in this phase, instead of re-executing
     # those nodes.
-    with tracer.trace("compile:refine_and_propagate_gql"):
-        results = results.batch_map(_track_errors(compile_refine_and_propagate_gql))
+    ("compile:refine_and_propagate_gql", compile_refine_and_propagate_gql),
+]
+
+
+def _compile(
+    nodes: typing.List[graph.Node],
+    start_pass: int = 0,
+    on_pass_done: typing.Optional[
+        typing.Callable[[int, value_or_error.ValueOrErrors[graph.Node]], None]
+    ] = None,
+) -> value_or_error.ValueOrErrors[graph.Node]:
+    tracer = engine_trace.tracer()
+    # logging.info("Starting compilation of graph with %s leaf nodes" % len(nodes))
+
+    results = value_or_error.ValueOrErrors.from_values(nodes)
+
+    for pass_ndx in range(start_pass, len(_COMPILE_PASSES)):
+        trace_name, compile_pass = _COMPILE_PASSES[pass_ndx]
+        with tracer.trace(trace_name):
+            results = results.batch_map(_track_errors(compile_pass))
+        if on_pass_done is not None:
+            on_pass_done(pass_ndx + 1, results)
 
     # This is very expensive!
     # loggable_nodes = graph_debug.combine_common_nodes(n)
@@ -1047,6 +1342,50 @@ def _compile(
     return results
 
 
+def _compile_with_plan_cache(
+    nodes: typing.List[graph.Node], plan_cache: compile_plan_cache.PlanCache
+) -> value_or_error.ValueOrErrors[graph.Node]:
+    key = compile_plan_cache.plan_key(nodes)
+    if key is None:
+        return _compile(nodes)
+
+    plan = plan_cache.get(key)
+    start_pass = 0
+    start_nodes = nodes
+    if plan is not None:
+        if plan.pass_count == len(_COMPILE_PASSES):
+            statsd.increment("weave.compile_plan_cache.hit")
+            return value_or_error.ValueOrErrors.from_values(plan.nodes)
+        statsd.increment("weave.compile_plan_cache.partial_hit")
+        start_pass = plan.pass_count
+        start_nodes = plan.nodes
+    else:
+        statsd.increment("weave.compile_plan_cache.miss")
+
+    reusable_plan: typing.Optional[compile_plan_cache.CompiledPlan] = None
+
+    with compile_plan_cache.compile_record() as record:
+
+        def _checkpoint(
+            pass_count: int, results: value_or_error.ValueOrErrors[graph.Node]
+        ) -> None:
+            # Once any pass has executed data, nothing after it is reusable.
+            nonlocal reusable_plan
+            if record.executed_data:
+                return
+            if any(err is not None for _, err in results.iter_items()):
+                return
+            reusable_plan = compile_plan_cache.CompiledPlan(
+                pass_count, results.unwrap()
+            )
+
+        results = _compile(start_nodes, start_pass, _checkpoint)
+
+    if reusable_plan is not None and reusable_plan.pass_count > start_pass:
+        plan_cache.set(key, reusable_plan)
+    return results
+
+
 _compile_disabled: contextvars.ContextVar[bool] = contextvars.ContextVar(
     "_compile_disabled", default=False
 )
@@ -1087,4 +1426,7 @@ def compile(
     if _is_compiling():
         return value_or_error.ValueOrErrors.from_values(nodes)
     with disable_compile():
-        return _compile(nodes)
+        plan_cache = compile_plan_cache.get_plan_cache()
+        if plan_cache is None:
+            return _compile(nodes)
+        return _compile_with_plan_cache(nodes, plan_cache)
@@ -0,0 +1,134 @@
+# A cross-request cache of compiled plans.
+#
+# Dashboards send the same graph shapes to the server over and over, and every
+# request runs the full compile pipeline in compile.py. Most compile passes are
+# pure graph rewrites: their output only depends on the input graph and the op
+# registry. A few passes (refine, required const resolution, node_ops expansion)
+# may execute parts of the graph, so their output depends on data.
+#
+# While compiling, we record whether any data was executed. The output of the
+# last pass that completed before the first data execution is reusable by any
+# later request that sends a structurally identical graph. If no data was
+# executed at all, the whole plan is reusable. On a partial hit, compile resumes
+# from the first pass that was not cached, so only the data dependent passes
+# are re-run.
+#
+# Const values are part of the key: the gql translation and required const
+# passes bake const values into the plan, so they can't be parameterized out.
+
+import collections
+import contextlib
+import contextvars
+import dataclasses
+import logging
+import threading
+import typing
+
+from . import cache
+from . import engine_trace
+from . import environment
+from . import errors
+from . import graph
+
+statsd = engine_trace.statsd()  # type: ignore
+
+PlanKey = typing.Tuple[typing.Optional[str], typing.Tuple[str, ...]]
+
+
+@dataclasses.dataclass
+class CompiledPlan:
+    # Number of compile passes that have been applied to nodes.
+    pass_count: int
+    nodes: list[graph.Node]
+
+
+class CompileRecord:
+    def __init__(self) -> None:
+        self.executed_data = False
+
+
+_compile_record: contextvars.ContextVar[
+    typing.Optional[CompileRecord]
+] = contextvars.ContextVar("_compile_record", default=None)
+
+
+@contextlib.contextmanager
+def compile_record() -> typing.Iterator[CompileRecord]:
+    record = CompileRecord()
+    token = _compile_record.set(record)
+    try:
+        yield record
+    finally:
+        _compile_record.reset(token)
+
+
+def record_data_execution() -> None:
+    """Called by the executor. Marks the in-progress compile as data dependent."""
+    record = _compile_record.get()
+    if record is not None:
+        record.executed_data = True
+
+
+class PlanCache:
+    """A bounded LRU of compiled plans, shared across requests and threads."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._plans: collections.OrderedDict[
+            PlanKey, CompiledPlan
+        ] = collections.OrderedDict()
+
+    def get(self, key: PlanKey) -> typing.Optional[CompiledPlan]:
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+        return plan
+
+    def set(self, key: PlanKey, plan: CompiledPlan) -> None:
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+                statsd.increment("weave.compile_plan_cache.evict")
+            statsd.gauge("weave.compile_plan_cache.size", len(self._plans))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+
+_plan_cache: typing.Optional[PlanCache] = None
+_plan_cache_lock = threading.Lock()
+
+
+def get_plan_cache() -> typing.Optional[PlanCache]:
+    global _plan_cache
+    max_entries = environment.compile_plan_cache_size()
+    if max_entries <= 0:
+        return None
+    with _plan_cache_lock:
+        if _plan_cache is None:
+            _plan_cache = PlanCache(max_entries)
+        _plan_cache.max_entries = max_entries
+    return _plan_cache
+
+
+def plan_key(nodes: list[graph.Node]) -> typing.Optional[PlanKey]:
+    try:
+        user_key = cache.get_user_cache_key()
+    except errors.WeaveAccessDeniedError:
+        return None
+    try:
+        node_ids = tuple(n.digest() for n in nodes)
+    except Exception:
+        # Some consts (Python objects in panel configs for example) can't be
+        # serialized. Just compile those graphs without the cache.
+        logging.debug("Unable to compute compile plan key", exc_info=True)
+        return None
+    return (user_key, node_ids)
@@ -3,7 +3,9 @@
 import typing
 
 from . import errors
+from . import graph
 from . import stitch
+from . import weave_types as types
 
 
 KeyTree = typing.Dict[str, "KeyTree"]  # type:ignore
@@ -48,3 +50,76 @@ def get_projection(obj: stitch.ObjectRecorder) -> KeyTree:
     if all_keys:
         cols = {}
     return cols
+
+
+# Ops that return some of the rows of their first input. Ops with functions
+# that read the rows, like sortTopK, don't belong here unless stitch records
+# their calls.
+_ROW_SUBSET_OP_SUFFIXES = ("limit", "offset", "index", "__getitem__")
+# Ops that don't read any columns.
+_COLUMN_FREE_OP_SUFFIXES = ("count",)
+# Ops that stitch passes through, recording the calls their functions make
+# on the rows.
+_FUNCTION_OP_SUFFIXES = ("map", "sort", "filter", "groupby", "joinAll")
+
+
+def get_top_level_columns(
+    p: stitch.StitchedGraph, node: graph.Node, leaf_nodes: list[graph.Node]
+) -> typing.Optional[list[str]]:
+    """The top-level keys of node's rows that the graph reads.
+
+    Unlike get_projection, this returns None unless it's sure nothing else is
+    read: when rows are returned from the graph, or passed to ops that may
+    read all of their keys.
+    """
+    from .ops_primitives import _dict_utils
+
+    recorders = [p.get_result(node)]
+    columns: set[str] = set()
+    i = 0
+    while i < len(recorders):
+        for call in recorders[i].calls:
+            op_name = call.node.from_op.name
+            if op_name.endswith("pick") or op_name.endswith("__getattr__"):
+                key = call.inputs[1].val
+                if not isinstance(key, str):
+                    return None
+                first_key = _dict_utils.split_escaped_string(key)[0]
+                if first_key == "*":
+                    return None
+                columns.add(_dict_utils.unescape_dots(first_key))
+            elif op_name.endswith(_ROW_SUBSET_OP_SUFFIXES):
+                recorders.append(call.output)
+            elif not op_name.endswith(_COLUMN_FREE_OP_SUFFIXES):
+                return None
+        i += 1
+
+    recorder_ids = {id(r) for r in recorders}
+    called_node_ids = {id(call.node) for r in recorders for call in r.calls}
+    leaf_node_ids = {id(n) for n in leaf_nodes}
+
+    def is_rows(n: graph.Node) -> bool:
+        return p.has_result(n) and id(p.get_result(n)) in recorder_ids
+
+    for n in graph.all_nodes_full(leaf_nodes):
+        if is_rows(n) and id(n) in leaf_node_ids:
+            return None
+        if (
+            isinstance(n, graph.ConstNode)
+            and isinstance(n.type, types.Function)
+            and isinstance(n.val, graph.Node)
+            and is_rows(n.val)
+        ):
+            # A function that returns rows, like a groupby on the whole row
+            return None
+        if not isinstance(n, graph.OutputNode) or id(n) in called_node_ids:
+            continue
+        for input_ndx, input_node in enumerate(n.from_op.inputs.values()):
+            if not is_rows(input_node):
+                continue
+            if p.has_result(n) and p.get_result(n) is p.get_result(input_node):
+                continue
+            if input_ndx == 0 and n.from_op.name.endswith(_FUNCTION_OP_SUFFIXES):
+                continue
+            return None
+    return sorted(columns)
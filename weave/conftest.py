@@ -18,6 +18,8 @@ from . import logs
 from . import io_service
 from . import logs
 from . import environment
+from . import execute
+from . import result_cache
 import logging
 
 from flask.testing import FlaskClient
@@ -127,8 +129,11 @@ def pre_post_each_test(test_artifact_dir, caplog):
     except (FileNotFoundError, OSError):
         pass
     os.environ["WEAVE_LOCAL_ARTIFACT_DIR"] = test_artifact_dir
+    # Cached results refer to the previous test's artifacts
+    result_cache.clear_result_cache()
     with isolated_tagging_context():
         yield
+    execute.flush_run_writes()
     del os.environ["WEAVE_LOCAL_ARTIFACT_DIR"]
 
 
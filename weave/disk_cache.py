@@ -0,0 +1,186 @@
+# Size-bounded eviction for files downloaded by wandb_file_manager.
+#
+# Downloads land under <filesystem dir>/[<user>/]wandb_file_manager/, and
+# converted tables under <filesystem dir>/[<user>/]table_cache/. Without
+# eviction those directories grow forever on long-running servers. The
+# DiskCacheEvictor walks those directories on a background thread and removes
+# least recently used files until the total size is back under budget.
+#
+# Recency is max(atime, mtime). Reads through filesystem.open_read update atime
+# when WEAVE_ENABLE_TOUCH_ON_READ is set, and wandb_file_manager and
+# table_cache touch files on every cache hit, so this works on filesystems
+# mounted with noatime too.
+#
+# Files are never evicted while they are open through filesystem.open_read, or
+# within min_age_sec of their last use. The second rule covers paths handed out
+# by ensure_file that the caller hasn't opened yet, and readers in other
+# processes.
+
+import dataclasses
+import logging
+import os
+import threading
+import time
+import typing
+
+from . import engine_trace
+from . import environment
+from . import filesystem
+
+statsd = engine_trace.statsd()  # type: ignore
+
+CACHE_DIR_NAMES = ("wandb_file_manager", "table_cache")
+
+# After going over budget, evict down to this fraction of it so we don't
+# evict on every pass when the cache hovers around the limit.
+LOW_WATER_FRACTION = 0.9
+
+
+@dataclasses.dataclass
+class DiskCacheStats:
+    hits: int = 0
+    misses: int = 0
+    bytes_evicted: int = 0
+    files_evicted: int = 0
+
+    @property
+    def hit_rate(self) -> typing.Optional[float]:
+        total = self.hits + self.misses
+        if total == 0:
+            return None
+        return self.hits / total
+
+
+_stats = DiskCacheStats()
+_stats_lock = threading.Lock()
+
+
+def stats() -> DiskCacheStats:
+    with _stats_lock:
+        return dataclasses.replace(_stats)
+
+
+def record_hit() -> None:
+    with _stats_lock:
+        _stats.hits += 1
+    statsd.increment("weave.file_cache.hit")
+
+
+def record_miss() -> None:
+    with _stats_lock:
+        _stats.misses += 1
+    statsd.increment("weave.file_cache.miss")
+
+
+def enabled() -> bool:
+    return environment.file_cache_max_bytes() is not None
+
+
+def _is_partial_write(name: str) -> bool:
+    # filesystem.open_write writes to <path>.tmp-<random> and renames
+    return ".tmp-" in name
+
+
+class DiskCacheEvictor:
+    def __init__(
+        self,
+        root: str,
+        max_bytes: int,
+        min_age_sec: float = 60.0,
+        now_fn: typing.Callable[[], float] = time.time,
+    ) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.min_age_sec = min_age_sec
+        self._now_fn = now_fn
+
+    def _cache_dirs(self) -> list[str]:
+        # The unscoped dir, plus one per user (see filesystem.get_filesystem_dir)
+        dirs = [os.path.join(self.root, name) for name in CACHE_DIR_NAMES]
+        try:
+            with os.scandir(self.root) as it:
+                for entry in it:
+                    if entry.is_dir() and entry.name not in CACHE_DIR_NAMES:
+                        dirs.extend(
+                            os.path.join(entry.path, name) for name in CACHE_DIR_NAMES
+                        )
+        except FileNotFoundError:
+            return []
+        return [d for d in dirs if os.path.isdir(d)]
+
+    def _scan(self) -> tuple[int, list[tuple[float, int, str]]]:
+        total = 0
+        files = []
+        for cache_dir in self._cache_dirs():
+            for dirpath, _, filenames in os.walk(cache_dir):
+                for name in filenames:
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    total += st.st_size
+                    if _is_partial_write(name):
+                        continue
+                    files.append((max(st.st_atime, st.st_mtime), st.st_size, path))
+        return total, files
+
+    def evict(self) -> int:
+        """Evict LRU files until under budget. Returns the number of bytes evicted."""
+        with engine_trace.tracer().trace("disk_cache.evict"):
+            total, files = self._scan()
+            statsd.gauge("weave.file_cache.bytes", total)
+            if total <= self.max_bytes:
+                return 0
+            target = int(self.max_bytes * LOW_WATER_FRACTION)
+            cutoff = self._now_fn() - self.min_age_sec
+            files.sort()
+            evicted_bytes = 0
+            evicted_files = 0
+            for last_used, size, path in files:
+                if total <= target or last_used > cutoff:
+                    break
+                if filesystem.is_open_for_read(path):
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                evicted_bytes += size
+                evicted_files += 1
+            with _stats_lock:
+                _stats.bytes_evicted += evicted_bytes
+                _stats.files_evicted += evicted_files
+            statsd.increment("weave.file_cache.bytes_evicted", evicted_bytes)
+            statsd.increment("weave.file_cache.files_evicted", evicted_files)
+            statsd.gauge("weave.file_cache.bytes", total)
+            return evicted_bytes
+
+
+class EvictionThread(threading.Thread):
+    def __init__(self, evictor: DiskCacheEvictor, interval_sec: float) -> None:
+        super().__init__(name="Weave disk cache eviction", daemon=True)
+        self.evictor = evictor
+        self.interval_sec = interval_sec
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval_sec):
+            try:
+                self.evictor.evict()
+            except Exception:
+                logging.exception("Disk cache eviction failed")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+def start_eviction_thread() -> typing.Optional[EvictionThread]:
+    max_bytes = environment.file_cache_max_bytes()
+    if max_bytes is None:
+        return None
+    evictor = DiskCacheEvictor(environment.weave_filesystem_dir(), max_bytes)
+    thread = EvictionThread(evictor, environment.file_cache_eviction_interval_sec())
+    thread.start()
+    return thread
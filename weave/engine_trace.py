@@ -302,6 +302,9 @@ class DummyStatsd:
     def gauge(self, *args, **kwargs):
         pass
 
+    def histogram(self, *args, **kwargs):
+        pass
+
     def flush(self, *args, **kwargs):
         pass
 
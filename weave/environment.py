@@ -83,6 +83,24 @@ def cache_mode() -> CacheMode:
     )
 
 
+# How execute.execute_forward schedules nodes:
+# - waves: run every ready node, grouped by op, then compute the next frontier
+# - dependency: run each node as soon as its inputs are ready, on a worker pool
+class ExecuteScheduler(enum.Enum):
+    WAVES = "waves"
+    DEPENDENCY = "dependency"
+
+
+def execute_scheduler() -> ExecuteScheduler:
+    env_mode = os.getenv("WEAVE_EXECUTE_SCHEDULER", ExecuteScheduler.WAVES.value)
+    for mode in ExecuteScheduler:
+        if mode.value == env_mode:
+            return mode
+    raise errors.WeaveConfigurationError(
+        f"WEAVE_EXECUTE_SCHEDULER must be one of {list(ExecuteScheduler)}"
+    )
+
+
 def wandb_production() -> bool:
     return os.getenv("WEAVE_ENV") == "wandb_production"
 
@@ -223,3 +241,171 @@ def usage_analytics_enabled() -> bool:
 
 def gql_schema_path() -> typing.Optional[str]:
     return os.environ.get(WEAVE_GQL_SCHEMA_PATH) or None
+
+
+def compile_plan_cache_size() -> int:
+    """Max number of compiled plans kept across requests. 0 disables the cache."""
+    raw = util.parse_number_env_var("WEAVE_COMPILE_PLAN_CACHE_SIZE")
+    if raw is None:
+        return 0
+    return int(raw)
+
+
+def manifest_cache_max_entries() -> typing.Optional[int]:
+    """Max number of artifact manifests held in memory. Unbounded by default."""
+    raw = util.parse_number_env_var("WEAVE_MANIFEST_CACHE_MAX_ENTRIES")
+    if raw is None or raw <= 0:
+        return None
+    return int(raw)
+
+
+def manifest_cache_max_bytes() -> typing.Optional[int]:
+    """Approximate memory budget for in-memory artifact manifests. <= 0 is unbounded."""
+    raw = util.parse_number_env_var("WEAVE_MANIFEST_CACHE_MAX_BYTES")
+    if raw is None:
+        return 256 * 1024 * 1024
+    if raw <= 0:
+        return None
+    return int(raw)
+
+
+def file_cache_max_bytes() -> typing.Optional[int]:
+    """Disk budget for downloaded wandb files. Unset or <= 0 disables eviction."""
+    raw = util.parse_number_env_var("WEAVE_FILE_CACHE_MAX_BYTES")
+    if raw is None or raw <= 0:
+        return None
+    return int(raw)
+
+
+def file_cache_eviction_interval_sec() -> float:
+    raw = util.parse_number_env_var("WEAVE_FILE_CACHE_EVICTION_INTERVAL_SEC")
+    if raw is None:
+        return 60.0
+    return float(raw)
+
+
+def local_artifact_blob_gc_interval_sec() -> typing.Optional[float]:
+    """How often unreferenced local artifact blobs are removed. <= 0 disables it."""
+    raw = util.parse_number_env_var("WEAVE_LOCAL_ARTIFACT_BLOB_GC_INTERVAL_SEC")
+    if raw is None:
+        return 600.0
+    if raw <= 0:
+        return None
+    return float(raw)
+
+
+def table_cache_enabled() -> bool:
+    """Whether converted W&B tables are cached on local disk (see ops_domain/table_cache.py)."""
+    return not util.parse_boolean_env_var("WEAVE_DISABLE_TABLE_CACHE")
+
+
+def request_capture_sample_rate() -> float:
+    """Fraction of execute requests captured for replay (see request_capture.py). 0 disables capture."""
+    raw = util.parse_number_env_var("WEAVE_REQUEST_CAPTURE_SAMPLE_RATE")
+    if raw is None:
+        return 0.0
+    return min(float(raw), 1.0)
+
+
+def request_capture_max_request_bytes() -> typing.Optional[int]:
+    """Requests larger than this are not captured. <= 0 captures any size."""
+    raw = util.parse_number_env_var("WEAVE_REQUEST_CAPTURE_MAX_REQUEST_BYTES")
+    if raw is None:
+        return 1024 * 1024
+    if raw <= 0:
+        return None
+    return int(raw)
+
+
+def request_capture_path() -> str:
+    return os.environ.get("WEAVE_REQUEST_CAPTURE_FILE") or os.path.join(
+        "/tmp/weave/log", "execute_requests.jsonl"
+    )
+
+
+def request_capture_max_file_bytes() -> int:
+    """Size at which the capture file is rotated."""
+    raw = util.parse_number_env_var("WEAVE_REQUEST_CAPTURE_MAX_FILE_BYTES")
+    if raw is None:
+        return 100 * 1024 * 1024
+    return int(raw)
+
+
+def wandb_gql_pool_size() -> int:
+    """Max connections kept open to the W&B API, per host."""
+    raw = util.parse_number_env_var("WEAVE_WANDB_GQL_POOL_SIZE")
+    if raw is None or raw <= 0:
+        return 50
+    return int(raw)
+
+
+def gql_response_cache_ttl_sec() -> float:
+    """How long gqlroot-wbgqlquery responses are reused across requests. 0 disables the cache."""
+    raw = util.parse_number_env_var("WEAVE_GQL_RESPONSE_CACHE_TTL_SEC")
+    if raw is None:
+        return 0.0
+    return float(raw)
+
+
+def gql_response_cache_max_bytes() -> typing.Optional[int]:
+    """Memory budget for cached gql responses. <= 0 is unbounded."""
+    raw = util.parse_number_env_var("WEAVE_GQL_RESPONSE_CACHE_MAX_BYTES")
+    if raw is None:
+        return 64 * 1024 * 1024
+    if raw <= 0:
+        return None
+    return int(raw)
+
+
+def result_cache_max_bytes() -> int:
+    """Memory budget for op results cached in process (see result_cache.py). 0, the default, disables it."""
+    raw = util.parse_number_env_var("WEAVE_RESULT_CACHE_MAX_BYTES")
+    if raw is None:
+        return 0
+    return int(raw)
+
+
+# What StreamTable.log does when its queue of unsent rows is full:
+# - block: wait for the writer thread to make room
+# - drop_oldest: drop the oldest queued row
+# - sample: keep a shrinking fraction of new rows once the queue is half full
+class StreamTableOverflowPolicy(enum.Enum):
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    SAMPLE = "sample"
+
+
+def stream_table_overflow_policy() -> StreamTableOverflowPolicy:
+    env_policy = os.getenv(
+        "WEAVE_STREAM_TABLE_OVERFLOW_POLICY", StreamTableOverflowPolicy.BLOCK.value
+    )
+    for policy in StreamTableOverflowPolicy:
+        if policy.value == env_policy:
+            return policy
+    raise errors.WeaveConfigurationError(
+        f"WEAVE_STREAM_TABLE_OVERFLOW_POLICY must be one of {list(StreamTableOverflowPolicy)}"
+    )
+
+
+def stream_table_max_queue_rows() -> int:
+    """Rows StreamTable.log holds before applying the overflow policy."""
+    raw = util.parse_number_env_var("WEAVE_STREAM_TABLE_MAX_QUEUE_ROWS")
+    if raw is None or raw <= 0:
+        return 10000
+    return int(raw)
+
+
+def stream_table_batch_rows() -> int:
+    """Rows the StreamTable writer thread encodes and sends per batch."""
+    raw = util.parse_number_env_var("WEAVE_STREAM_TABLE_BATCH_ROWS")
+    if raw is None or raw <= 0:
+        return 1000
+    return int(raw)
+
+
+def type_of_sample_rows() -> typing.Optional[int]:
+    """Lists longer than this have their type inferred from a sample of this many items, if the sample agrees. Off by default."""
+    raw = util.parse_number_env_var("WEAVE_TYPE_OF_SAMPLE_ROWS")
+    if raw is None or raw <= 0:
+        return None
+    return max(int(raw), 2)
@@ -1,4 +1,7 @@
+import collections
+import concurrent.futures
 import dataclasses
+import functools
 import logging
 import contextlib
 import contextvars
@@ -24,6 +27,7 @@ from . import value_or_error
 
 # Planner/Compiler
 from . import compile
+from . import compile_plan_cache
 from . import forward_graph
 from . import graph
 from . import graph_debug
@@ -40,6 +44,8 @@ from .language_features.tagging import opdef_util
 # Trace / cache
 from . import op_policy
 from . import trace_local
+from . import result_cache
+from . import value_fingerprint
 from . import ref_base
 from . import object_context
 from . import memo
@@ -52,9 +58,28 @@ from . import parallelism
 
 TRACE_LOCAL = trace_local.TraceLocal()
 
+# Computing run keys and saving op outputs serializes input and output objects,
+# which temporarily attaches in-memory refs to them. The dependency scheduler
+# runs nodes that share an input on different threads, so there that has to
+# happen one at a time. Only that is locked: loading inputs and cached outputs
+# runs concurrently. The wave scheduler doesn't need the lock at all.
+_run_cache_lock = threading.RLock()
+
+
+def _run_cache_guard() -> typing.ContextManager:
+    if environment.execute_scheduler() == environment.ExecuteScheduler.DEPENDENCY:
+        return _run_cache_lock
+    return contextlib.nullcontext()
+
+
+_run_writer = result_cache.RunWriter(_run_cache_guard)
+
 # Set this to true when debugging for costly, but detailed storyline of execution
 PRINT_DEBUG = False
 
+OnResultFn = typing.Callable[[int, value_or_error.ValueOrError[typing.Any]], None]
+OnNodeDoneFn = typing.Callable[[forward_graph.ForwardNode], None]
+
 
 class OpExecuteStats(typing.TypedDict):
     cache_used: int
@@ -179,7 +204,62 @@ def get_top_level_stats() -> typing.Optional[ExecuteStats]:
     return _top_level_stats_ctx.get()
 
 
-def execute_nodes(nodes, no_cache=False) -> value_or_error.ValueOrErrors[typing.Any]:
+class _TargetResultReporter:
+    """Calls on_result(index, result) for each target node as soon as its
+    result is ready, instead of when the whole batch is done."""
+
+    def __init__(
+        self,
+        fg: forward_graph.ForwardGraph,
+        compile_results: value_or_error.ValueOrErrors[graph.Node],
+        on_result: OnResultFn,
+    ) -> None:
+        self._on_result = on_result
+        self._targets: dict[
+            forward_graph.ForwardNode, list[int]
+        ] = collections.defaultdict(list)
+        for i, (node, error) in enumerate(compile_results.iter_items()):
+            if error is not None:
+                on_result(i, value_or_error.Error(error))
+            elif isinstance(node, graph.ConstNode):
+                on_result(i, value_or_error.Value(node.val))
+            else:
+                forward_node = fg.get_forward_node(node)
+                if forward_node.has_result:
+                    on_result(i, self._result_of(forward_node))
+                else:
+                    self._targets[forward_node].append(i)
+
+    @staticmethod
+    def _result_of(
+        forward_node: forward_graph.ForwardNode,
+    ) -> value_or_error.ValueOrError[typing.Any]:
+        result = forward_node.result
+        if isinstance(result, forward_graph.ErrorResult):
+            return value_or_error.Error(result.error)
+        return value_or_error.Value(result)
+
+    def node_done(self, forward_node: forward_graph.ForwardNode) -> None:
+        for i in self._targets.pop(forward_node, ()):
+            self._on_result(i, self._result_of(forward_node))
+
+    def finish(self) -> None:
+        for forward_node in list(self._targets):
+            self.node_done(forward_node)
+
+
+def execute_nodes(
+    nodes, no_cache=False, on_result: typing.Optional[OnResultFn] = None
+) -> value_or_error.ValueOrErrors[typing.Any]:
+    """Execute nodes, returning their results in order.
+
+    If on_result is given, it is also called with (index, result) for each node
+    as soon as that node's result is ready.
+    """
+    # If we're called from within a compile pass, that pass depends on data and
+    # its output can't be reused by the compile plan cache.
+    compile_plan_cache.record_data_execution()
+
     tracer = engine_trace.tracer()
     with tracer.trace("execute-log-graph"):
         logging.info(
@@ -227,9 +307,19 @@ def execute_nodes(nodes, no_cache=False) -> value_or_error.ValueOrErrors[typing.
                     fg = forward_graph.ForwardGraph()
                     compile_results = compile_results.safe_apply(fg.add_node)
 
+                    reporter = None
+                    if on_result is not None:
+                        reporter = _TargetResultReporter(fg, compile_results, on_result)
+
                     with context.execution_client():
                         # TODO: Get errors from here
-                        stats = execute_forward(fg, no_cache=no_cache)
+                        stats = execute_forward(
+                            fg,
+                            no_cache=no_cache,
+                            on_node_done=reporter.node_done if reporter else None,
+                        )
+                        if reporter is not None:
+                            reporter.finish()
                         summary = stats.op_summary()
                         logging.info("Execution summary\n%s" % pprint.pformat(summary))
                         if PRINT_DEBUG:
@@ -254,11 +344,209 @@ def execute_nodes(nodes, no_cache=False) -> value_or_error.ValueOrErrors[typing.
     return res
 
 
-def execute_forward(fg: forward_graph.ForwardGraph, no_cache=False) -> ExecuteStats:
+def execute_forward(
+    fg: forward_graph.ForwardGraph,
+    no_cache=False,
+    on_node_done: typing.Optional[OnNodeDoneFn] = None,
+) -> ExecuteStats:
+    if (
+        environment.execute_scheduler() == environment.ExecuteScheduler.DEPENDENCY
+        and parallelism.get_parallel_budget() > 1
+        and not _has_mutations(fg)
+    ):
+        return _execute_forward_dependency_driven(
+            fg, no_cache=no_cache, on_node_done=on_node_done
+        )
+    return _execute_forward_waves(fg, no_cache=no_cache, on_node_done=on_node_done)
+
+
+def _has_mutations(fg: forward_graph.ForwardGraph) -> bool:
+    # Mutations are recorded and flushed in order, only run them in waves.
+    return any(
+        registry_mem.memory_registry.get_op(forward_node.node.from_op.name).mutation
+        for forward_node in fg.iter_forward_nodes()
+    )
+
+
+def _execute_forward_node_traced(
+    fg: forward_graph.ForwardGraph,
+    forward_node: forward_graph.ForwardNode,
+    op_def: op_def.OpDef,
+    no_cache: bool,
+) -> "NodeExecutionReport":
+    tracer = engine_trace.tracer()
+    span = None
+    if isinstance(forward_node.node, graph.OutputNode):
+        span = tracer.trace("op.%s" % graph.op_full_name(forward_node.node.from_op))
+    try:
+        with tag_store.set_curr_node(
+            id(forward_node.node),
+            [
+                id(input_node)
+                for input_node in forward_node.node.from_op.inputs.values()
+            ],
+        ):
+            # Lambdas and async functions do not use object_context (object caching
+            # and mutational transactions).
+            if op_def.is_async or (
+                any(
+                    isinstance(input_node.type, types.Function)
+                    for input_node in forward_node.node.from_op.inputs.values()
+                )
+                and not op_def.mutation
+            ):
+                report = execute_forward_node(fg, forward_node, no_cache=no_cache)
+            else:
+                with object_context.object_context():
+                    report = execute_forward_node(fg, forward_node, no_cache=no_cache)
+
+    except Exception as e:
+        logging.info(
+            "Exception during execution of: %s\n%s"
+            % (
+                graph_debug.node_expr_str_full(forward_node.node),
+                traceback.format_exc(),
+            )
+        )
+        if value_or_error.DEBUG:
+            raise
+        forward_node.set_result(forward_graph.ErrorResult(e))
+        report = {
+            "cache_used": False,
+            "already_executed": False,
+            "bytes_read_to_arrow": 0,
+        }
+    finally:
+        if span is not None:
+            span.finish()
+
+    if span is not None:
+        span.set_tag("bytes_read_to_arrow", report["bytes_read_to_arrow"])
+    return report
+
+
+def _execute_forward_dependency_driven(
+    fg: forward_graph.ForwardGraph,
+    no_cache=False,
+    on_node_done: typing.Optional[OnNodeDoneFn] = None,
+) -> ExecuteStats:
+    """Run each node as soon as all of its inputs have results.
+
+    Unlike the wave scheduler, a slow node only delays the nodes that depend
+    on it. Nodes run on a worker pool sized by the parallel budget, and each
+    op's concurrency class (see op_policy) caps how many of its kind run at
+    once.
+    """
+    stats = ExecuteStats()
+    outer_top_level_stats = get_top_level_stats()
+    parallel_budget = parallelism.get_parallel_budget()
+    limits = {
+        concurrency_class: parallelism.get_concurrency_limit(concurrency_class)
+        for concurrency_class in op_policy.ConcurrencyClass
+    }
+    running = {concurrency_class: 0 for concurrency_class in limits}
+    ready: dict[
+        op_policy.ConcurrencyClass, collections.deque[forward_graph.ForwardNode]
+    ] = {concurrency_class: collections.deque() for concurrency_class in limits}
+    scheduled: set[forward_graph.ForwardNode] = set()
+    in_flight: dict[
+        concurrent.futures.Future,
+        typing.Tuple[forward_graph.ForwardNode, op_policy.ConcurrencyClass],
+    ] = {}
+
+    def _schedule(forward_node: forward_graph.ForwardNode) -> None:
+        scheduled.add(forward_node)
+        op_name = forward_node.node.from_op.name
+        ready[op_policy.concurrency_class(op_name)].append(forward_node)
+
+    def _release_downstream(forward_node: forward_graph.ForwardNode) -> None:
+        for downstream_forward_node in forward_node.input_to:
+            if downstream_forward_node in scheduled:
+                continue
+            if all(
+                fg.has_result(param_node)
+                for param_node in downstream_forward_node.node.from_op.inputs.values()
+            ):
+                _schedule(downstream_forward_node)
+
+    def _run_one(
+        forward_node: forward_graph.ForwardNode, budget: int
+    ) -> typing.Tuple[NodeExecutionReport, float, ExecuteStats]:
+        # Runs in a copy of the scheduler's context. Nested executions get their
+        # own top level stats, which we merge on the scheduler thread.
+        start_time = time.time()
+        _top_level_stats_ctx.set(None)
+        op_def = registry_mem.memory_registry.get_op(forward_node.node.from_op.name)
+        with parallelism.parallel_budget_ctx(budget):
+            with top_level_stats() as task_stats:
+                report = _execute_forward_node_traced(
+                    fg, forward_node, op_def, no_cache
+                )
+        return report, time.time() - start_time, task_stats
+
+    def _submit_ready(pool: concurrent.futures.ThreadPoolExecutor) -> None:
+        progressed = True
+        while progressed:
+            progressed = False
+            for concurrency_class, queue in ready.items():
+                while queue and running[concurrency_class] < limits[concurrency_class]:
+                    forward_node = queue.popleft()
+                    progressed = True
+                    if forward_node.has_result:
+                        # Already computed, for example during compile's refine
+                        # phase. No need to use a worker.
+                        stats.add_node(forward_node.node, 0, False, True, 0)
+                        if on_node_done is not None:
+                            on_node_done(forward_node)
+                        _release_downstream(forward_node)
+                        continue
+                    pending_count = len(in_flight) + sum(len(q) for q in ready.values())
+                    budget = parallelism.get_remaining_budget_per_thread(
+                        pending_count + 1
+                    )
+                    future = pool.submit(
+                        contextvars.copy_context().run, _run_one, forward_node, budget
+                    )
+                    in_flight[future] = (forward_node, concurrency_class)
+                    running[concurrency_class] += 1
+
+    for forward_node in fg.roots:
+        _schedule(forward_node)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=parallel_budget) as pool:
+        _submit_ready(pool)
+        while in_flight:
+            done, _ = concurrent.futures.wait(
+                in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                forward_node, concurrency_class = in_flight.pop(future)
+                running[concurrency_class] -= 1
+                report, duration, task_stats = future.result()
+                stats.add_node(
+                    forward_node.node,
+                    duration,
+                    report["cache_used"],
+                    report.get("already_executed") or False,
+                    report.get("bytes_read_to_arrow") or 0,
+                )
+                if outer_top_level_stats is not None:
+                    outer_top_level_stats.merge(task_stats)
+                if on_node_done is not None:
+                    on_node_done(forward_node)
+                _release_downstream(forward_node)
+            _submit_ready(pool)
+    return stats
+
+
+def _execute_forward_waves(
+    fg: forward_graph.ForwardGraph,
+    no_cache=False,
+    on_node_done: typing.Optional[OnNodeDoneFn] = None,
+) -> ExecuteStats:
     to_run = fg.roots
 
     stats = ExecuteStats()
-    tracer = engine_trace.tracer()
     while len(to_run):
         running_now = list(to_run)
         to_run = {}
@@ -321,67 +609,16 @@ def execute_forward(fg: forward_graph.ForwardGraph, no_cache=False) -> ExecuteSt
                         report.get("already_executed") or False,
                         report["bytes_read_to_arrow"],
                     )
+                    if on_node_done is not None:
+                        on_node_done(fn)
 
             else:
                 # Sequential in process case
                 for forward_node in group:
                     start_time = time.time()
-                    span = None
-                    if isinstance(forward_node.node, graph.OutputNode):
-                        span = tracer.trace(
-                            "op.%s" % graph.op_full_name(forward_node.node.from_op)
-                        )
-                    try:
-                        with tag_store.set_curr_node(
-                            id(forward_node.node),
-                            [
-                                id(input_node)
-                                for input_node in forward_node.node.from_op.inputs.values()
-                            ],
-                        ):
-                            # Lambdas and async functions do not use object_context (object caching
-                            # and mutational transactions).
-                            if op_def.is_async or (
-                                any(
-                                    isinstance(input_node.type, types.Function)
-                                    for input_node in forward_node.node.from_op.inputs.values()
-                                )
-                                and not op_def.mutation
-                            ):
-                                report = execute_forward_node(
-                                    fg, forward_node, no_cache=no_cache
-                                )
-                            else:
-                                with object_context.object_context():
-                                    report = execute_forward_node(
-                                        fg, forward_node, no_cache=no_cache
-                                    )
-
-                    except Exception as e:
-                        logging.info(
-                            "Exception during execution of: %s\n%s"
-                            % (
-                                graph_debug.node_expr_str_full(forward_node.node),
-                                traceback.format_exc(),
-                            )
-                        )
-                        if value_or_error.DEBUG:
-                            raise
-                        forward_node.set_result(forward_graph.ErrorResult(e))
-                        report = {
-                            "cache_used": False,
-                            "already_executed": False,
-                            "bytes_read_to_arrow": 0,
-                        }
-                    finally:
-                        if span is not None:
-                            span.finish()
-
-                    if span is not None:
-                        span.set_tag(
-                            "bytes_read_to_arrow", report["bytes_read_to_arrow"]
-                        )
-
+                    report = _execute_forward_node_traced(
+                        fg, forward_node, op_def, no_cache
+                    )
                     stats.add_node(
                         forward_node.node,
                         time.time() - start_time,
@@ -389,6 +626,8 @@ def execute_forward(fg: forward_graph.ForwardGraph, no_cache=False) -> ExecuteSt
                         report.get("already_executed") or False,
                         report.get("bytes_read_to_arrow") or 0,
                     )
+                    if on_node_done is not None:
+                        on_node_done(forward_node)
         for forward_node in running_now:
             for downstream_forward_node in forward_node.input_to:
                 ready_to_run = True
@@ -494,6 +733,22 @@ def _tag_safe_deref(ref):
     return res
 
 
+def flush_run_writes() -> None:
+    """Blocks until runs saved in the background are on disk."""
+    _run_writer.flush()
+
+
+def _save_run(
+    run_key: trace_local.RunKey,
+    input_refs: dict[str, ref_base.Ref],
+    output: typing.Any,
+) -> None:
+    # Runs on the run writer's thread, after the request's object context
+    # has been finished.
+    with object_context.new_object_context():
+        TRACE_LOCAL.new_run(run_key, inputs=input_refs, output=output)
+
+
 def execute_forward_node(
     fg: forward_graph.ForwardGraph,
     forward_node: forward_graph.ForwardNode,
@@ -514,6 +769,7 @@ def execute_forward_node(
                 no_cache = False
 
     use_cache = not no_cache
+    memory_cache = result_cache.get_result_cache() if use_cache else None
     if isinstance(node, graph.ConstNode):
         return {
             "cache_used": False,
@@ -546,54 +802,59 @@ def execute_forward_node(
         run_key = None
         if use_cache or op_def.is_async:
             # Compute the run ID, which is deterministic if the op is pure
-            run_key = trace_local.make_run_key(
-                op_def, input_refs, impure_cache_key=client_cache_key
-            )
+            with _run_cache_guard():
+                run_key = trace_local.make_run_key(
+                    op_def, input_refs, impure_cache_key=client_cache_key
+                )
 
         if run_key:
-            run = TRACE_LOCAL.get_run_val(run_key)
-            if run is not None and run != None:  # stupid box none makes us check !=
-                # Watch out, we handle loading async runs in different ways.
-                if op_def.is_async:
-                    forward_node.set_result(TRACE_LOCAL.get_run(run_key))
-                    return {
-                        "cache_used": True,
-                        "already_executed": False,
-                        "bytes_read_to_arrow": 0,
-                    }
-                else:
-                    if run.output is not None:
-                        output_ref = run.output
-                        # We must deref here to restore tags
-                        output = output_ref.get()
-                        logging.debug("Cache hit, returning")
-
-                        # Flowed tags are not cacheable(!),
-                        # because they may contain graph dependent information,
-                        # as in the case of gql tags that contain results for downstream
-                        # nodes. So we fix that up here, by flowing tags and overriding
-                        # the cached tags.
-                        # Note, this only works for outer tags, not tags that are inside
-                        # values. For those, we don't have a solution yet.
-                        if opdef_util.should_flow_tags(op_def):
-                            arg0_ref = next(iter(input_refs.values()))
-                            arg0 = ref_base.deref(arg0_ref)
-
-                            output = output_ref.get()
-
-                            process_opdef_resolve_fn.flow_tags(arg0, output)
-
-                        forward_node.set_result(output_ref)
-
+            output_ref = None
+            if memory_cache is not None and not op_def.is_async:
+                output_ref = memory_cache.get(run_key)
+            if output_ref is None:
+                run = TRACE_LOCAL.get_run_val(run_key)
+                if run is not None and run != None:  # stupid box none makes us check !=
+                    # Watch out, we handle loading async runs in different ways.
+                    if op_def.is_async:
+                        forward_node.set_result(TRACE_LOCAL.get_run(run_key))
                         return {
                             "cache_used": True,
                             "already_executed": False,
-                            "bytes_read_to_arrow": get_bytes_read_to_arrow(
-                                node, output
-                            ),
+                            "bytes_read_to_arrow": 0,
                         }
+                    output_ref = run.output
                 # otherwise, the run's output was not saveable, so we need
                 # to recompute it.
+                if output_ref is not None and memory_cache is not None:
+                    output_ref.get()
+                    memory_cache.set(run_key, output_ref)
+            if output_ref is not None:
+                # We must deref here to restore tags
+                output = output_ref.get()
+                logging.debug("Cache hit, returning")
+
+                # Flowed tags are not cacheable(!),
+                # because they may contain graph dependent information,
+                # as in the case of gql tags that contain results for downstream
+                # nodes. So we fix that up here, by flowing tags and overriding
+                # the cached tags.
+                # Note, this only works for outer tags, not tags that are inside
+                # values. For those, we don't have a solution yet.
+                if opdef_util.should_flow_tags(op_def):
+                    arg0_ref = next(iter(input_refs.values()))
+                    arg0 = ref_base.deref(arg0_ref)
+
+                    output = output_ref.get()
+
+                    process_opdef_resolve_fn.flow_tags(arg0, output)
+
+                forward_node.set_result(output_ref)
+
+                return {
+                    "cache_used": True,
+                    "already_executed": False,
+                    "bytes_read_to_arrow": get_bytes_read_to_arrow(node, output),
+                }
         inputs = {
             input_name: _tag_safe_deref(input)
             for input_name, input in input_refs.items()
@@ -631,6 +892,7 @@ def execute_forward_node(
                     )
             else:
                 result = execute_sync_op(op_def, inputs)
+                value_fingerprint.set_derived_digest(op_def, input_refs, result)
 
         with tracer.trace("execute-write-cache"):
             ref = ref_base.get_ref(result)
@@ -648,7 +910,8 @@ def execute_forward_node(
                 result = ref
             else:
                 if use_cache and run_key and not box.is_none(result):
-                    result = TRACE_LOCAL.save_run_output(op_def, run_key, result)
+                    with _run_cache_guard():
+                        result = TRACE_LOCAL.save_run_output(op_def, run_key, result)
 
             forward_node.set_result(result)
 
@@ -663,7 +926,15 @@ def execute_forward_node(
                 and not box.is_none(result)
             ):
                 logging.debug("Saving run")
-                TRACE_LOCAL.new_run(run_key, inputs=input_refs, output=result)
+                if memory_cache is None:
+                    with _run_cache_guard():
+                        TRACE_LOCAL.new_run(run_key, inputs=input_refs, output=result)
+                else:
+                    if isinstance(result, ref_base.Ref):
+                        memory_cache.set(run_key, result)
+                    _run_writer.submit(
+                        functools.partial(_save_run, run_key, input_refs, result)
+                    )
         return {
             "cache_used": False,
             "already_executed": False,
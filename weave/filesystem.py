@@ -10,6 +10,8 @@
 # to this interface.
 
 import asyncio
+import collections
+import threading
 import time
 import typing
 import contextlib
@@ -33,6 +35,32 @@ async_utime = aiofiles_os.wrap(os.utime)  # type: ignore
 # they are completely executed (see https://docs.python.org/3/library/asyncio-task.html#asyncio.create_task)
 background_tasks: set[asyncio.Task] = set()
 
+# Absolute paths of files that are currently open for reading, with open
+# counts. Used by disk cache eviction to avoid removing files out from under
+# readers.
+_open_reads: collections.Counter[str] = collections.Counter()
+_open_reads_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _track_open_read(abs_path: str) -> typing.Iterator[None]:
+    abs_path = os.path.normpath(abs_path)
+    with _open_reads_lock:
+        _open_reads[abs_path] += 1
+    try:
+        yield
+    finally:
+        with _open_reads_lock:
+            _open_reads[abs_path] -= 1
+            if _open_reads[abs_path] <= 0:
+                del _open_reads[abs_path]
+
+
+def is_open_for_read(abs_path: str) -> bool:
+    abs_path = os.path.normpath(abs_path)
+    with _open_reads_lock:
+        return abs_path in _open_reads
+
 
 def is_subdir(path: str, root: str) -> bool:
     path = os.path.abspath(path)
@@ -76,17 +104,24 @@ class Filesystem:
         path = self.path(path)
         os.makedirs(os.path.dirname(path), exist_ok=True)
         tmp_name = f"{path}.tmp-{util.rand_string_n(16)}"
-        with open(tmp_name, mode) as f:
-            yield f
-        with tracer.trace("rename"):
-            os.rename(tmp_name, path)
+        try:
+            with open(tmp_name, mode) as f:
+                yield f
+            with tracer.trace("rename"):
+                os.replace(tmp_name, path)
+        except BaseException:
+            # Don't leave partial writes behind. Readers only ever see path,
+            # which is either absent or complete.
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
 
     @contextlib.contextmanager
     def open_read(
         self, path: str, mode: str = "rb"
     ) -> typing.Generator[typing.IO, None, None]:
         safe_path = self.path(path)
-        with open(safe_path, mode) as f:
+        with _track_open_read(safe_path), open(safe_path, mode) as f:
             if environment.enable_touch_on_read():
                 self.touch(path)
             yield f
@@ -140,10 +175,16 @@ class FilesystemAsync:
         path = self.path(path)
         await aiofiles_os.makedirs(os.path.dirname(path), exist_ok=True)
         tmp_name = f"{path}.tmp-{util.rand_string_n(16)}"
-        async with aiofiles.open(tmp_name, mode) as f:
-            yield f
-        with tracer.trace("rename"):
-            await aiofiles_os.rename(tmp_name, path)
+        try:
+            async with aiofiles.open(tmp_name, mode) as f:
+                yield f
+            with tracer.trace("rename"):
+                await aiofiles_os.replace(tmp_name, path)
+        except BaseException:
+            # See Filesystem.open_write
+            if await aiofiles_os.path.exists(tmp_name):
+                await aiofiles_os.remove(tmp_name)
+            raise
 
     @typing.overload
     def open_read(
@@ -168,14 +209,15 @@ class FilesystemAsync:
         mode: typing.Union[typing.Literal["r"], typing.Literal["rb"]] = "rb",
     ) -> typing.Any:
         safe_path = self.path(path)
-        async with aiofiles.open(safe_path, mode) as f:
-            if environment.enable_touch_on_read():
-                now = time.time()  # ensure the new atime is from before the yield
-                # fire and forget, dont block yield of f
-                task = asyncio.create_task(self.touch(path, newtime=now))
-                background_tasks.add(task)
-                task.add_done_callback(background_tasks.discard)
-            yield f
+        with _track_open_read(safe_path):
+            async with aiofiles.open(safe_path, mode) as f:
+                if environment.enable_touch_on_read():
+                    now = time.time()  # ensure the new atime is from before the yield
+                    # fire and forget, dont block yield of f
+                    task = asyncio.create_task(self.touch(path, newtime=now))
+                    background_tasks.add(task)
+                    task.add_done_callback(background_tasks.discard)
+                yield f
 
 
 def get_filesystem() -> Filesystem:
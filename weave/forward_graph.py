@@ -153,6 +153,11 @@ class ForwardGraph:
             if is_root:
                 self.roots[forward_node] = True
 
+    def iter_forward_nodes(self) -> typing.Iterator[ForwardNode]:
+        for node, forward_node in self._node_to_forward_node.items():
+            if isinstance(node, graph.OutputNode):
+                yield forward_node
+
     def get_forward_node(self, node: typing.Union[graph.OutputNode, graph.VarNode]):
         return self._node_to_forward_node[node]
 
@@ -0,0 +1,160 @@
+# A cross-request cache of gqlroot-wbgqlquery responses.
+#
+# compile_domain merges all of a request's root ops into one gql query, but
+# wbgqlquery is impure, so that query is sent again on every request.
+# Dashboards refresh every few seconds with identical queries. With
+# WEAVE_GQL_RESPONSE_CACHE_TTL_SEC set, responses are kept for that many
+# seconds, per user, keyed by the query string without insignificant whitespace and its
+# variables. Concurrent requests for the same query wait for the first one
+# rather than sending their own.
+#
+# The client cache key (WEAVE_CLIENT_CACHE_KEY_HEADER) is part of the cache
+# key, as it is for impure ops in the run cache: a client that needs fresh
+# data sends a new cache key.
+#
+# Responses are stored as json text. Every hit gets its own copy of the
+# response, so no caller can mutate what another one sees.
+
+import datetime
+import json
+import threading
+import typing
+
+import graphql
+
+from . import cache
+from . import context_state
+from . import engine_trace
+from . import environment
+from . import errors
+
+statsd = engine_trace.statsd()  # type: ignore
+
+GqlResponseKey = typing.Tuple[str, str, typing.Optional[str]]
+
+
+class _InFlight:
+    def __init__(self) -> None:
+        self._done = threading.Event()
+        self._result: typing.Optional[str] = None
+        self._exception: typing.Optional[BaseException] = None
+
+    def set_result(self, result: str) -> None:
+        self._result = result
+        self._done.set()
+
+    def set_exception(self, exception: BaseException) -> None:
+        self._exception = exception
+        self._done.set()
+
+    def wait(self) -> str:
+        self._done.wait()
+        if self._exception is not None:
+            raise self._exception
+        assert self._result is not None
+        return self._result
+
+
+def normalize_query(query_str: str) -> str:
+    # Only whitespace outside of string literals is insignificant.
+    try:
+        return graphql.utilities.strip_ignored_characters(query_str)
+    except graphql.GraphQLError:
+        return query_str
+
+
+class GqlResponseCache:
+    def __init__(
+        self,
+        ttl: datetime.timedelta,
+        max_bytes: typing.Optional[int],
+        now_fn: typing.Callable[[], datetime.datetime] = datetime.datetime.now,
+    ) -> None:
+        self._cache: cache.LruTimeWindowCache[
+            GqlResponseKey, str
+        ] = cache.LruTimeWindowCache(
+            ttl, now_fn=now_fn, max_bytes=max_bytes, size_fn=len, name="gql_response"
+        )
+        self._lock = threading.Lock()
+        self._in_flight: dict[
+            tuple[typing.Optional[str], GqlResponseKey], _InFlight
+        ] = {}
+
+    def configure(
+        self, ttl: datetime.timedelta, max_bytes: typing.Optional[int]
+    ) -> None:
+        self._cache.max_age = ttl
+        self._cache.max_bytes = max_bytes
+
+    def get_or_fetch(
+        self,
+        query_str: str,
+        variables: dict[str, typing.Any],
+        fetch: typing.Callable[[], typing.Any],
+    ) -> typing.Any:
+        try:
+            user_key = cache.get_user_cache_key()
+        except errors.WeaveAccessDeniedError:
+            return fetch()
+        key = (
+            normalize_query(query_str),
+            json.dumps(variables, sort_keys=True),
+            context_state.get_client_cache_key(),
+        )
+        cached = self._cache.get(key)
+        if not isinstance(cached, cache.LruTimeWindowCache.NotFound):
+            return json.loads(cached)
+
+        flight_key = (user_key, key)
+        with self._lock:
+            in_flight = self._in_flight.get(flight_key)
+            is_leader = in_flight is None
+            if in_flight is None:
+                in_flight = _InFlight()
+                self._in_flight[flight_key] = in_flight
+        if not is_leader:
+            statsd.increment("weave.gql_response_cache.single_flight_join")
+            return json.loads(in_flight.wait())
+
+        try:
+            result = fetch()
+            serialized = json.dumps(result)
+            self._cache.set(key, serialized)
+            in_flight.set_result(serialized)
+            return result
+        except BaseException as e:
+            in_flight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[flight_key]
+
+
+_gql_response_cache: typing.Optional[GqlResponseCache] = None
+_gql_response_cache_lock = threading.Lock()
+
+
+def get_gql_response_cache() -> typing.Optional[GqlResponseCache]:
+    global _gql_response_cache
+    ttl_sec = environment.gql_response_cache_ttl_sec()
+    if ttl_sec <= 0:
+        return None
+    ttl = datetime.timedelta(seconds=ttl_sec)
+    max_bytes = environment.gql_response_cache_max_bytes()
+    with _gql_response_cache_lock:
+        if _gql_response_cache is None:
+            _gql_response_cache = GqlResponseCache(ttl, max_bytes)
+        else:
+            _gql_response_cache.configure(ttl, max_bytes)
+    return _gql_response_cache
+
+
+def cached_query(
+    query_str: str,
+    variables: dict[str, typing.Any],
+    fetch: typing.Callable[[], typing.Any],
+) -> typing.Any:
+    response_cache = get_gql_response_cache()
+    if response_cache is None:
+        return fetch()
+    return response_cache.get_or_fetch(query_str, variables, fetch)
@@ -1,4 +1,5 @@
 import functools
+import hashlib
 import json
 import typing
 
@@ -15,6 +16,9 @@ T = typing.TypeVar("T")
 class Node(typing.Generic[T]):
     type: weave_types.Type
 
+    # Structural digest, see digest() below.
+    _digest: typing.Optional[str] = None
+
     def __deepcopy__(self, memo: dict) -> "Node":
         return self.node_from_json(self.to_json())
 
@@ -34,6 +38,23 @@ class Node(typing.Generic[T]):
     def to_json(self) -> dict:
         raise NotImplementedError
 
+    def digest(self) -> str:
+        """A structural identity for this node.
+
+        Two nodes with the same digest compute the same value. It is built
+        from the digests of the node's inputs, and cached on the node, so
+        hashing a whole graph is a single pass. Nodes must not be mutated
+        once their digest has been taken.
+        """
+        if self._digest is None:
+            hash = hashlib.md5()
+            hash.update(json.dumps(self._digest_parts()).encode())
+            self._digest = hash.hexdigest()
+        return self._digest
+
+    def _digest_parts(self) -> typing.Any:
+        raise errors.WeaveInternalError("invalid node encountered: %s" % self)
+
     def __hash__(self) -> int:
         # We store nodes in a memoize cache in execute.py. They need to be
         # hashable. But the number.py ops override __eq__ which makes the default
@@ -134,6 +155,15 @@ class OutputNode(Node, typing.Generic[OpInputNodeT]):
     def iteritems_op_inputs(self) -> typing.Iterator[typing.Tuple[str, Node]]:
         return iter(self.from_op.inputs.items())
 
+    def _digest_parts(self) -> typing.Any:
+        # The output type is not included, it is determined by the op and
+        # its inputs.
+        return [
+            "output",
+            self.from_op.name,
+            [[k, n.digest()] for k, n in self.from_op.inputs.items()],
+        ]
+
     def to_json(self) -> dict:
         return {
             "nodeType": "output",
@@ -168,6 +198,11 @@ class VarNode(Node):
     def to_json(self) -> dict:
         return {"nodeType": "var", "type": self.type.to_dict(), "varName": self.name}
 
+    def _digest_parts(self) -> typing.Any:
+        # Must include type here, Const and OutputNode types can
+        # be inferred from the graph, but VarNode types cannot.
+        return ["var", self.name, _type_fingerprint(self.type)]
+
 
 class ConstNode(Node):
     val: typing.Any
@@ -201,6 +236,18 @@ class ConstNode(Node):
         #     val = val.to_json()
         return {"nodeType": "const", "type": self.type.to_dict(), "val": val}
 
+    def _digest_parts(self) -> typing.Any:
+        val: typing.Any
+        if isinstance(self.val, (OutputNode, VarNode)):
+            val = ["lambda", self.val.digest()]
+        elif self.val is None or isinstance(self.val, (str, int, float)):
+            # Fast path for the vast majority of consts, the type below
+            # disambiguates these.
+            val = self.val
+        else:
+            val = storage.to_python(self.val)
+        return ["const", val, _type_fingerprint(self.type)]
+
 
 class VoidNode(Node):
     type = weave_types.Invalid()
@@ -209,6 +256,17 @@ class VoidNode(Node):
         return {"nodeType": "void", "type": "invalid"}
 
 
+def _type_fingerprint(t: weave_types.Type) -> str:
+    # Types are immutable, so cache the serialized form on the instance (like
+    # weave_types._cached_hash does for __hash__).
+    try:
+        return t.__dict__["_fingerprint"]
+    except KeyError:
+        fingerprint = json.dumps(t.to_dict())
+        t.__dict__["_fingerprint"] = fingerprint
+        return fingerprint
+
+
 def nodes_equal(n1: Node, n2: Node) -> bool:
     return n1.to_json() == n2.to_json()
 
@@ -21,7 +21,9 @@ import traceback
 import threading
 
 
+from . import artifact_local
 from . import artifact_wandb
+from . import disk_cache
 from . import errors
 from . import engine_trace
 from . import filesystem
@@ -143,6 +145,23 @@ class ServerResponse:
         }
 
 
+# BatchItemError is returned in place of a value for items of a batch request
+# that failed, so one bad item doesn't fail the whole batch.
+@dataclasses.dataclass
+class BatchItemError:
+    http_error_code: int
+    message: str
+
+    def to_exception(self) -> Exception:
+        return server_error_handling.WeaveInternalHttpException.from_code(
+            self.http_error_code, self.message
+        )
+
+
+BatchResultType = TypeVar("BatchResultType")
+BatchResult = typing.Union[BatchResultType, Exception]
+
+
 class ShutDown:
     def __eq__(self, other: Any) -> bool:
         return isinstance(other, ShutDown)
@@ -192,6 +211,11 @@ class Server:
         self._response_queue_feeder_ready_event = threading.Event()
         self._response_queue_feeder_ready_to_shut_down_event = threading.Event()
 
+        self._disk_cache_eviction_thread: typing.Optional[
+            disk_cache.EvictionThread
+        ] = None
+        self._blob_gc_thread: typing.Optional[artifact_local.BlobGCThread] = None
+
         # Register handlers
         self.register_handler_fn("ensure_manifest", self.handle_ensure_manifest)
         self.register_handler_fn(
@@ -200,6 +224,7 @@ class Server:
         self.register_handler_fn("ensure_file", self.handle_ensure_file)
         self.register_handler_fn("direct_url", self.handle_direct_url)
         self.register_handler_fn("sleep", self.handle_sleep)
+        self.register_handler_fn("batch", self.handle_batch)
 
         if process:
             self.request_handler = aioprocessing.AioProcess(
@@ -234,6 +259,10 @@ class Server:
         self.response_queue_router.start()
         self._request_handler_ready_event.wait()
         self._response_queue_feeder_ready_event.wait()
+        # Runs in the user process, where most downloaded files are read, so
+        # it can see which files are open.
+        self._disk_cache_eviction_thread = disk_cache.start_eviction_thread()
+        self._blob_gc_thread = artifact_local.start_blob_gc_thread()
         atexit.register(self.shutdown)
 
     # cleanup performs cleanup actions, such as flushing stats
@@ -255,6 +284,10 @@ class Server:
 
             self.response_queue_router.join()
             self.request_handler.join()
+            if self._disk_cache_eviction_thread is not None:
+                self._disk_cache_eviction_thread.stop()
+            if self._blob_gc_thread is not None:
+                self._blob_gc_thread.stop()
             self.cleanup()
 
     def _response_queue_router_fn(self) -> None:
@@ -396,6 +429,31 @@ class Server:
         uri = artifact_wandb.WeaveWBArtifactURI.parse(artifact_uri)
         return await self.wandb_file_manager.direct_url(uri)
 
+    async def handle_batch(
+        self, name: str, args_list: typing.List[typing.Tuple]
+    ) -> typing.List[typing.Any]:
+        # Run all items of the batch concurrently on the server loop. Results
+        # are returned in order.
+        handler = self.handlers[name]
+        results = await asyncio.gather(
+            *(handler(*args) for args in args_list), return_exceptions=True
+        )
+        batch_results: typing.List[typing.Any] = []
+        for res in results:
+            if isinstance(res, Exception):
+                logging.error(
+                    "WBArtifactManager batch item error: %s\n",
+                    "".join(
+                        traceback.format_exception(type(res), res, res.__traceback__)
+                    ),
+                )
+                res = BatchItemError(
+                    server_error_handling.maybe_extract_code_from_exception(res) or 500,
+                    str(res),
+                )
+            batch_results.append(res)
+        return batch_results
+
     async def handle_sleep(self, seconds: float) -> float:
         # used for testing to simulate long running processes
         await asyncio.sleep(seconds)
@@ -585,6 +643,19 @@ class SyncClient:
             )
         return server_resp.value
 
+    def request_batch(
+        self, name: str, args_list: typing.List[typing.Tuple]
+    ) -> typing.List[typing.Any]:
+        # Sends one request for the whole batch, so we pay for one round trip
+        # instead of len(args_list). Items that failed are returned as
+        # exceptions rather than raised.
+        if not args_list:
+            return []
+        results = self.request("batch", name, args_list)
+        return [
+            r.to_exception() if isinstance(r, BatchItemError) else r for r in results
+        ]
+
     def manifest(
         self, artifact_uri: artifact_wandb.WeaveWBArtifactURI
     ) -> typing.Optional[artifact_wandb.WandbArtifactManifest]:
@@ -593,14 +664,35 @@ class SyncClient:
         )
         return manifest
 
+    def manifests(
+        self, artifact_uris: typing.Sequence[artifact_wandb.WeaveWBArtifactURI]
+    ) -> typing.List[
+        BatchResult[typing.Optional[artifact_wandb.WandbArtifactManifest]]
+    ]:
+        return self.request_batch(
+            "ensure_manifest", [(str(uri),) for uri in artifact_uris]
+        )
+
     def ensure_file(
         self, artifact_uri: artifact_wandb.WeaveWBArtifactURI
     ) -> typing.Optional[str]:
         return self.request("ensure_file", str(artifact_uri))
 
+    def ensure_files(
+        self, artifact_uris: typing.Sequence[artifact_wandb.WeaveWBArtifactURI]
+    ) -> typing.List[BatchResult[typing.Optional[str]]]:
+        return self.request_batch("ensure_file", [(str(uri),) for uri in artifact_uris])
+
     def ensure_file_downloaded(self, download_url: str) -> typing.Optional[str]:
         return self.request("ensure_file_downloaded", download_url)
 
+    def ensure_files_downloaded(
+        self, download_urls: typing.Sequence[str]
+    ) -> typing.List[BatchResult[typing.Optional[str]]]:
+        return self.request_batch(
+            "ensure_file_downloaded", [(url,) for url in download_urls]
+        )
+
     def direct_url(
         self, artifact_uri: artifact_wandb.WeaveWBArtifactURI
     ) -> typing.Optional[str]:
@@ -632,6 +724,36 @@ class ServerlessClient:
     def ensure_file_downloaded(self, download_url: str) -> typing.Optional[str]:
         return self.wandb_file_manager.ensure_file_downloaded(download_url)
 
+    def _batch(
+        self,
+        fn: typing.Callable[[typing.Any], BatchResultType],
+        items: typing.Sequence[typing.Any],
+    ) -> typing.List[BatchResult[BatchResultType]]:
+        results: typing.List[BatchResult[BatchResultType]] = []
+        for item in items:
+            try:
+                results.append(fn(item))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def manifests(
+        self, artifact_uris: typing.Sequence[artifact_wandb.WeaveWBArtifactURI]
+    ) -> typing.List[
+        BatchResult[typing.Optional[artifact_wandb.WandbArtifactManifest]]
+    ]:
+        return self._batch(self.manifest, artifact_uris)
+
+    def ensure_files(
+        self, artifact_uris: typing.Sequence[artifact_wandb.WeaveWBArtifactURI]
+    ) -> typing.List[BatchResult[typing.Optional[str]]]:
+        return self._batch(self.ensure_file, artifact_uris)
+
+    def ensure_files_downloaded(
+        self, download_urls: typing.Sequence[str]
+    ) -> typing.List[BatchResult[typing.Optional[str]]]:
+        return self._batch(self.ensure_file_downloaded, download_urls)
+
     def direct_url(
         self, artifact_uri: artifact_wandb.WeaveWBArtifactURI
     ) -> typing.Optional[str]:
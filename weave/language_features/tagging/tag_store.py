@@ -240,6 +240,20 @@ def is_tagged(obj: typing.Any) -> bool:
     return id_val in mem_map
 
 
+# is_tagged for checking many objects at once, against the current tag store.
+def is_tagged_checker() -> typing.Callable[[typing.Any], bool]:
+    visited = _VISITED_OBJ_IDS.get()
+    mem_map = _current_obj_tag_mem_map()
+    if not mem_map:
+        return lambda obj: False
+
+    def check(obj: typing.Any) -> bool:
+        id_val = get_id(obj)
+        return id_val not in visited and id_val in mem_map
+
+    return check
+
+
 def clear_tag_store() -> None:
     tag_store = _OBJ_TAGS_MEM_MAP.get()
     cur_obj_tag_mem_map = _OBJ_TAGS_CURR_NODE_ID.get()
@@ -153,5 +153,18 @@ def object_context() -> typing.Iterator[ObjectContext]:
             ctx.finish_mutations()
 
 
+@contextlib.contextmanager
+def new_object_context() -> typing.Iterator[ObjectContext]:
+    """Like object_context, but never joins an enclosing one. For work that
+    outlives the context it was started from."""
+    ctx = ObjectContext()
+    token = _object_context.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _object_context.reset(token)
+        ctx.finish_mutations()
+
+
 def get_object_context() -> typing.Optional[ObjectContext]:
     return _object_context.get()
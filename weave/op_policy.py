@@ -1,3 +1,5 @@
+import enum
+
 # Cache policy for when cache mode is minimal.
 # We don't declare these directly on op defs for now. I want op definitions
 # to be more declarative than that. Ie they should be cached if they are
@@ -40,7 +42,12 @@ CACHE_OP_NAMES = [
     "gqlroot-wbgqlquery",
 ] + CACHE_AND_PARALLEL_OP_NAMES
 
-ARROW_FS_OPS = ["run-history3", "run-history3_with_columns", "table-rows"]
+ARROW_FS_OPS = [
+    "run-history3",
+    "run-history3_with_columns",
+    "run-history3_pushdown",
+    "table-rows",
+]
 
 
 # history ops are parallelized by derive_op only, in a custom way
@@ -62,3 +69,43 @@ def should_cache(op_name: str) -> bool:
 
 def should_table_cache(op_name: str) -> bool:
     return False
+
+
+# Concurrency classes, used by the dependency driven scheduler in execute.py.
+# I/O-bound ops spend most of their time waiting on the network or disk, so
+# they can use the whole parallel budget. Everything else is treated as
+# CPU-bound, and gets a smaller share so it doesn't just contend for the GIL.
+class ConcurrencyClass(enum.Enum):
+    IO_BOUND = "io_bound"
+    CPU_BOUND = "cpu_bound"
+
+
+IO_BOUND_OP_NAMES = [
+    "gqlroot-wbgqlquery",
+    "get",
+    "run-history",
+    "run-history2",
+    "run-history3",
+    "run-history_with_columns",
+    "run-history2_with_columns",
+    "run-history3_with_columns",
+    "run-history3_pushdown",
+    "project-runs2",
+    "project-runs2_with_columns",
+    "artifactVersion-file",
+    "file-contents",
+    "file-readcsv",
+    "file-table",
+    "file-partitionedTable",
+    "file-joinedTable",
+    "table-rows",
+    "op-openai_embed",
+] + CACHE_AND_PARALLEL_OP_NAMES
+
+
+def concurrency_class(op_name: str) -> ConcurrencyClass:
+    if op_name.startswith("mapped_"):
+        op_name = op_name[len("mapped_") :]
+    if op_name in IO_BOUND_OP_NAMES:
+        return ConcurrencyClass.IO_BOUND
+    return ConcurrencyClass.CPU_BOUND
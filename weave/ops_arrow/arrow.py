@@ -212,19 +212,40 @@ class ArrowWeaveListType(types.Type):
         else:
             table = pa.table({"arr": obj._arrow_data})
         with artifact.new_file(f"{name}.ArrowWeaveList.feather", binary=True) as f:
-            pf.write_feather(table, f)
+            # One record batch, so each column loads as a single chunk that we
+            # can use without combining. Uncompressed, so memory mapped loads
+            # use the file's pages directly instead of decompressing columns
+            # onto the heap, at the cost of larger files.
+            pf.write_feather(
+                table,
+                f,
+                compression="uncompressed",
+                chunksize=max(len(table), 1),
+            )
 
         with artifact.new_file(f"{name}.ArrowWeaveList.type.json") as f:
             json.dump(obj.object_type.to_dict(), f)
 
     def load_instance(
-        self, artifact: artifact_fs.FilesystemArtifact, name: str, extra=None
+        self,
+        artifact: artifact_fs.FilesystemArtifact,
+        name: str,
+        extra=None,
+        columns: typing.Optional[list[str]] = None,
     ):
+        """Load a saved ArrowWeaveList.
+
+        If columns is given, and the list's objects are TypedDicts, only those
+        keys are loaded (see get_with_columns).
+        """
         with artifact.open(f"{name}.ArrowWeaveList.type.json") as f:
             object_type = json.load(f)
             object_type = types.TypeRegistry.type_from_dict(object_type)
         from . import list_
 
+        if columns is not None:
+            object_type = project_object_type(object_type, columns)
+
         if "_weave_awl_format" not in artifact.metadata:
             # v1 AWL format
             with artifact.open(f"{name}.ArrowWeaveList.parquet", binary=True) as f:
@@ -235,20 +256,34 @@ class ArrowWeaveListType(types.Type):
                 from . import convert
 
                 res = convert.from_parquet_friendly(l)
+            if columns is not None and isinstance(object_type, types.TypedDict):
+                res = self.instance_class(  # type: ignore
+                    project_struct_array(res._arrow_data, object_type),
+                    object_type=object_type,
+                    artifact=artifact,
+                )
         elif artifact.metadata["_weave_awl_format"] == 2:
             # v2 AWL format
-            with artifact.open(f"{name}.ArrowWeaveList.feather", binary=True) as f:
-                table = pf.read_table(f)
+            read_columns = None
+            if (
+                columns is not None
+                and isinstance(object_type, types.TypedDict)
+                and object_type.property_types
+            ):
+                read_columns = list(object_type.property_types)
+            table = _read_feather(
+                artifact, f"{name}.ArrowWeaveList.feather", read_columns
+            )
             if isinstance(object_type, types.TypedDict):
                 if not object_type.property_types:
                     arr = pa.repeat({}, len(table))
                 else:
                     arr = pa.StructArray.from_arrays(
-                        [table[i].combine_chunks() for i in range(len(table.schema))],
+                        [_column_array(table[i]) for i in range(len(table.schema))],
                         names=[f.name for f in table.schema],
                     )
             else:
-                arr = table["arr"].combine_chunks()
+                arr = _column_array(table["arr"])
             res = self.instance_class(arr, object_type=object_type, artifact=artifact)  # type: ignore
         else:
             raise ValueError(
@@ -259,6 +294,49 @@ class ArrowWeaveListType(types.Type):
         return res
 
 
+def project_object_type(object_type: types.Type, columns: list[str]) -> types.Type:
+    """The type of a saved list's objects, when only columns are loaded."""
+    if not isinstance(object_type, types.TypedDict):
+        return object_type
+    return types.TypedDict(
+        {k: v for k, v in object_type.property_types.items() if k in columns}
+    )
+
+
+def project_struct_array(
+    arr: pa.StructArray, object_type: types.TypedDict
+) -> pa.StructArray:
+    names = list(object_type.property_types)
+    return pa.StructArray.from_arrays(
+        [arr.field(k) for k in names],
+        names=names,
+        mask=arr.is_null() if arr.null_count else None,
+    )
+
+
+def _read_feather(
+    artifact: artifact_fs.FilesystemArtifact,
+    path: str,
+    columns: typing.Optional[list[str]],
+) -> pa.Table:
+    # Memory map when the file is on local disk. Columns we don't ask for are
+    # then never read. Files saved before compression was turned off are
+    # still decompressed on read.
+    try:
+        local_path = artifact.path(path)
+    except NotImplementedError:
+        with artifact.open(path, binary=True) as f:
+            return pf.read_table(f, columns=columns)
+    return pf.read_table(local_path, columns=columns, memory_map=True)
+
+
+def _column_array(column: pa.ChunkedArray) -> pa.Array:
+    # combine_chunks copies, even when there's only one chunk.
+    if column.num_chunks == 1:
+        return column.chunk(0)
+    return column.combine_chunks()
+
+
 def rewrite_weavelist_refs(arrow_data, object_type, source_artifact, target_artifact):
     if isinstance(object_type, partial_object.PartialObjectType):
         # PartialObject is a leaf type
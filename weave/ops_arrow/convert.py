@@ -1,3 +1,4 @@
+import numpy as np
 import pyarrow as pa
 import pyarrow.compute as pc
 import typing
@@ -348,6 +349,77 @@ def to_arrow_from_list_and_artifact(
     return ArrowWeaveList(arrow_obj, merged_object_type, artifact)
 
 
+# Mappers whose apply() is a no-op for values produced by json.load.
+_PLAIN_VALUE_MAPPERS = (
+    mappers_arrow.StringToArrow,
+    mappers_arrow.IntToArrowInt,
+    mappers_arrow.BoolToArrowBool,
+    mappers_arrow.FloatToArrowFloat,
+)
+
+
+def _build_pyarrow_array_from_column(
+    values: list[typing.Any],
+    pyarrow_type: pa.DataType,
+    mapper,
+) -> pa.Array:
+    nonnull_mapper = mapper
+    if isinstance(mapper.type, types.UnionType) and mapper.type.is_simple_nullable():
+        nonnull_mapper = [
+            m for m in mapper._member_mappers if m.type != types.NoneType()
+        ][0]
+    if not isinstance(nonnull_mapper, _PLAIN_VALUE_MAPPERS):
+        return recursively_build_pyarrow_array(values, pyarrow_type, mapper)
+
+    # Plain scalars: hand the whole column to pyarrow, skipping the per-value
+    # mapper pass. Same result as recursively_build_pyarrow_array.
+    if nonnull_mapper.type == types.Number():
+        res = pa.array(values)
+        if pa.types.is_null(res.type):
+            res = res.cast(pa.int64())
+        return res
+    return pa.array(values, type=pyarrow_type)
+
+
+def to_arrow_from_columns_and_artifact(
+    columns: dict[str, list[typing.Any]],
+    object_type: types.TypedDict,
+    artifact: artifact_base.Artifact,
+    num_rows: int,
+) -> ArrowWeaveList:
+    """Column-major version of to_arrow_from_list_and_artifact.
+
+    columns maps each property of object_type to its values. Columns of plain
+    JSON scalars are converted without visiting each value in Python.
+    """
+    merged_object_type = recursively_merge_union_types_if_they_are_unions_of_structs(
+        object_type
+    )
+    mapper = mappers_arrow.map_to_arrow(merged_object_type, artifact)
+    pyarrow_type = arrow_util.arrow_type(mapper.result_type())
+
+    # handle empty struct case - the case where the struct has no fields
+    if len(pyarrow_type) == 0:
+        arrow_obj = pa.array([{}] * num_rows, type=pyarrow_type)
+    else:
+        arrays = []
+        for field in pyarrow_type:
+            values = columns.get(field.name)
+            if values is None:
+                values = [None] * num_rows
+            arrays.append(
+                _build_pyarrow_array_from_column(
+                    values,
+                    field.type,
+                    mapper._property_serializers[field.name],
+                )
+            )
+        arrow_obj = pa.StructArray.from_arrays(
+            arrays, [field.name for field in pyarrow_type]
+        )
+    return ArrowWeaveList(arrow_obj, merged_object_type, artifact)
+
+
 def to_arrow(
     obj,
     wb_type=None,
@@ -629,6 +701,125 @@ def to_compare_safe(awl: ArrowWeaveList) -> ArrowWeaveList:
     return awl.map_column(_to_compare_safe)
 
 
+def _dense_codes(arr: pa.Array) -> tuple[pa.Array, int]:
+    encoded = pc.dictionary_encode(arr)
+    return encoded.indices.cast(pa.int64()), len(encoded.dictionary)
+
+
+def _struct_property_types(
+    object_type: types.Type,
+) -> typing.Optional[dict[str, types.Type]]:
+    if isinstance(object_type, types.TypedDict):
+        return object_type.property_types
+    elif isinstance(object_type, tagged_value_type.TaggedValueType):
+        return {"_tag": object_type.tag, "_value": object_type.value}
+    elif isinstance(object_type, types.ObjectType):
+        return object_type.property_types()
+    return None
+
+
+def _compare_codes(
+    arr: pa.Array, object_type: types.Type
+) -> typing.Optional[tuple[pa.Array, int]]:
+    # Returns int64 codes in [0, cardinality), and cardinality. Nulls stay null.
+    from ..ops_domain.wbmedia import ArtifactAssetType
+
+    if isinstance(object_type, types.Const):
+        object_type = object_type.val_type
+    object_type = types.non_none(object_type)
+    arr_type = arr.type
+    if pa.types.is_null(arr_type):
+        return pa.nulls(len(arr), pa.int64()), 0
+    elif pa.types.is_dictionary(arr_type):
+        dictionary_codes = _compare_codes(arr.dictionary, object_type)
+        if dictionary_codes is None:
+            return None
+        codes, cardinality = dictionary_codes
+        return codes.take(arr.indices), cardinality
+    elif pa.types.is_floating(arr_type):
+        # -0.0 == 0.0, as in to_compare_safe
+        return _dense_codes(pc.if_else(pc.equal(arr, 0), pa.scalar(0, arr_type), arr))
+    elif (
+        pa.types.is_string(arr_type)
+        or pa.types.is_large_string(arr_type)
+        or pa.types.is_binary(arr_type)
+        or pa.types.is_large_binary(arr_type)
+        or pa.types.is_integer(arr_type)
+        or pa.types.is_boolean(arr_type)
+        or pa.types.is_timestamp(arr_type)
+        or pa.types.is_date(arr_type)
+    ):
+        return _dense_codes(arr)
+    elif not pa.types.is_struct(arr_type):
+        return None
+    elif ArtifactAssetType.assign_type(object_type):
+        # Media compare by content, as in to_compare_safe
+        return _compare_codes(arr.field("sha256"), types.String())
+
+    property_types = _struct_property_types(object_type)
+    if property_types is None:
+        return None
+    if arr_type.num_fields == 0:
+        return pa.nulls(len(arr), pa.int64()), 0
+
+    # Combine the fields' codes into one code per row. Re-encoding after each
+    # field keeps codes dense, so the products can't overflow and distinct
+    # rows never share a code.
+    fields = dict(zip((f.name for f in arr_type), arr.flatten()))
+    combined: typing.Optional[np.ndarray] = None
+    cardinality = 1
+    for name in sorted(fields):
+        field_codes = _compare_codes(
+            fields[name], property_types.get(name, types.UnknownType())
+        )
+        if field_codes is None:
+            return None
+        codes, field_cardinality = field_codes
+        # Nulls get their own code
+        codes_np = codes.fill_null(field_cardinality).to_numpy(zero_copy_only=False)
+        if combined is None:
+            combined = codes_np
+        else:
+            combined = combined * (field_cardinality + 1) + codes_np
+        dense, cardinality = _dense_codes(pa.array(combined))
+        combined = dense.to_numpy()
+    return (
+        pa.array(
+            combined, type=pa.int64(), mask=arr.is_null().to_numpy(zero_copy_only=False)
+        ),
+        cardinality,
+    )
+
+
+def to_compare_codes(
+    awls: typing.Sequence[ArrowWeaveList],
+) -> typing.Optional[list[pa.Array]]:
+    """Int64 group/join keys for the rows of awls.
+
+    Rows of any of the lists get the same code when their values are equal,
+    null rows get null. This hashes keys with arrow's hash kernel instead of
+    building the strings to_compare_safe makes, which is much cheaper for
+    struct keys. Returns None for types it doesn't handle (lists, unions,
+    ...), callers should fall back to to_compare_safe.
+    """
+    if not awls:
+        return []
+    arrow_type = awls[0]._arrow_data.type
+    if any(awl._arrow_data.type != arrow_type for awl in awls):
+        return None
+    arr = pa.concat_arrays([awl._arrow_data for awl in awls])
+    compare_codes = _compare_codes(arr, awls[0].object_type)
+    if compare_codes is None:
+        return None
+    codes, _ = compare_codes
+    result = []
+    offset = 0
+    for awl in awls:
+        result.append(codes.slice(offset, len(awl)))
+        offset += len(awl)
+    return result
+
+
 def unify_types(*arrs: ArrowWeaveList):
     """Ensures each arr has the same type using merge_types/concat."""
     # We make use of concat, which converts its inputs to the same type.
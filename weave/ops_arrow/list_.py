@@ -523,6 +523,8 @@ class ArrowWeaveList(typing.Generic[ArrowWeaveListObjectTypeVar]):
         if self.object_type is None:
             self.object_type = types.TypeRegistry.type_of(self._arrow_data).object_type
         self._artifact = artifact
+        # Content digest for run keys, see value_fingerprint.py
+        self._digest: typing.Optional[str] = None
         if invalid_reason is None:
             invalid_reason = _awl_invalid_reason.get()
         self._invalid_reason = invalid_reason
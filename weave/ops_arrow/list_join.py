@@ -9,6 +9,7 @@ from ..language_features.tagging import tagged_value_type
 from ..api import op
 from .. import graph
 from .. import engine_trace
+from .. import parallelism
 
 from . import convert
 from .arrow import (
@@ -65,6 +66,134 @@ def join_all_zip_impl_vec(
     )
 
 
+def _join_codes(join_key_cols: list[ArrowWeaveList]) -> list[np.ndarray]:
+    # Equal keys get equal codes across all the lists, null keys get -1.
+    safe_join_keys = convert.to_compare_codes(join_key_cols)
+    if safe_join_keys is None:
+        safe_keys = [convert.to_compare_safe(a)._arrow_data for a in join_key_cols]
+        non_null_types = [k.type for k in safe_keys if not pa.types.is_null(k.type)]
+        if non_null_types:
+            # Nulls can be represented in any type
+            safe_keys = [k.cast(non_null_types[0]) for k in safe_keys]
+        encoded = pc.dictionary_encode(pa.concat_arrays(safe_keys)).indices
+        safe_join_keys = []
+        offset = 0
+        for k in safe_keys:
+            safe_join_keys.append(encoded.slice(offset, len(k)))
+            offset += len(k)
+    return [
+        k.cast(pa.int64()).fill_null(-1).to_numpy(zero_copy_only=False)
+        for k in safe_join_keys
+    ]
+
+
+# Joining many rows per list is worth doing on threads
+PARALLEL_JOIN_MIN_ROWS = 100000
+
+
+def _group_rows(
+    codes: np.ndarray, cardinality: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # A hash table from code to rows, as (count, start) per code into order.
+    # Rows are in descending order within a code, like arrow's hash join
+    # emits them.
+    rows = np.flatnonzero(codes >= 0)[::-1]
+    row_codes = codes[rows]
+    counts = np.bincount(row_codes, minlength=cardinality)
+    starts = np.cumsum(counts) - counts
+    if len(counts) and counts.max() <= 1:
+        # Unique keys, the usual case when joining runs. Skip the sort.
+        order = np.empty(len(rows), dtype=np.int64)
+        order[starts[row_codes]] = rows
+    else:
+        order = rows[np.argsort(row_codes, kind="stable")]
+    return counts, starts, order
+
+
+def _take_or_missing(values: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    # values[positions], with -1 where positions is -1
+    missing = positions < 0
+    if not missing.any():
+        return values[positions]
+    if len(values) == 0:
+        return np.full(len(positions), -1, dtype=np.int64)
+    return np.where(missing, -1, values[np.where(missing, 0, positions)])
+
+
+def _join_indices(codes: list[np.ndarray], join_type: str) -> list[np.ndarray]:
+    """Joins the lists' key codes, returning index columns (-1 for no row).
+
+    The result matches chaining arrow's Table.join pairwise, left to right:
+    matched rows in left order, then unmatched left rows, then unmatched
+    right rows. (Arrow works in 1024 row batches, so for bigger lists only
+    the rows are the same, the order of unmatched rows differs.) But instead
+    of materializing a table at every step, each list's rows are grouped by
+    code once, and all the joins probe those.
+    """
+    keep_left = join_type in ("full outer", "left outer")
+    keep_right = join_type in ("full outer", "right outer")
+    cardinality = max((int(c.max()) + 1 for c in codes if len(c)), default=0)
+
+    def group_rows(c: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return _group_rows(c, cardinality)
+
+    if sum(len(c) for c in codes[1:]) >= PARALLEL_JOIN_MIN_ROWS:
+        grouped = list(parallelism.do_in_parallel(group_rows, codes[1:]))
+    else:
+        grouped = [group_rows(c) for c in codes[1:]]
+
+    first_rows = np.flatnonzero(codes[0] >= 0)
+    keys = codes[0][first_rows]
+    # Each join's result rows, as positions in the previous result (or -1)
+    # and rows of the right list (or -1). Composed into index columns at the
+    # end, so every join only touches its own two columns.
+    steps: list[tuple[np.ndarray, np.ndarray]] = []
+    for right_codes, (counts, starts, order) in zip(codes[1:], grouped):
+        matches = counts[keys]
+        matched = matches > 0
+        left_rows = np.arange(len(keys))
+        # Repeat matched left rows once per match
+        left_pos = np.repeat(left_rows[matched], matches[matched])
+        nth_match = np.arange(len(left_pos)) - np.repeat(
+            np.cumsum(matches[matched]) - matches[matched], matches[matched]
+        )
+        right_index = order[starts[keys[left_pos]] + nth_match]
+        if keep_left:
+            unmatched = left_rows[~matched]
+            left_pos = np.concatenate([left_pos, unmatched])
+            right_index = np.concatenate(
+                [right_index, np.full(len(unmatched), -1, dtype=np.int64)]
+            )
+        left_keys = keys
+        keys = keys[left_pos]
+        if keep_right:
+            seen = np.zeros(cardinality, dtype=bool)
+            seen[left_keys] = True
+            right_rows = np.flatnonzero(right_codes >= 0)
+            right_rows = right_rows[~seen[right_codes[right_rows]]]
+            # Arrow emits these by walking its hash table: keys in order of
+            # first appearance, rows descending within a key.
+            right_keys = right_codes[right_rows]
+            unique_keys, first_index = np.unique(right_keys, return_index=True)
+            first_seen = np.zeros(cardinality, dtype=np.int64)
+            first_seen[unique_keys] = first_index
+            right_rows = right_rows[np.lexsort((-right_rows, first_seen[right_keys]))]
+            keys = np.concatenate([keys, right_codes[right_rows]])
+            left_pos = np.concatenate(
+                [left_pos, np.full(len(right_rows), -1, dtype=np.int64)]
+            )
+            right_index = np.concatenate([right_index, right_rows])
+        steps.append((left_pos, right_index))
+
+    index_cols: list[np.ndarray] = []
+    pos = np.arange(len(keys))
+    for left_pos, right_index in reversed(steps):
+        index_cols.append(_take_or_missing(right_index, pos))
+        pos = _take_or_missing(left_pos, pos)
+    index_cols.append(_take_or_missing(first_rows, pos))
+    return index_cols[::-1]
+
+
 def join_all_impl(
     arrs: list[ArrowWeaveList],
     join_key_cols: list[ArrowWeaveList],
@@ -76,35 +205,11 @@ def join_all_impl(
 
     join_key_cols = unified_join_key_cols
 
-    # Get the safe join keys
-    safe_join_key_cols = [convert.to_compare_safe(a) for a in join_key_cols]
-
-    tables: list[pa.Table] = []
-    for i, (arr, safe_join_key_col) in enumerate(zip(arrs, safe_join_key_cols)):
-        if pa.types.is_null(safe_join_key_col._arrow_data.type):
-            # Special case the type of a null column. Arrow's won't join on it.
-            # But nulls can be represented in any type, so we cast to int64. The
-            # safe join column is not included in the final output, so we don't
-            # need to worry about fixing the type later.
-            safe_join_key_col._arrow_data = safe_join_key_col._arrow_data.cast("int64")
-        tables.append(
-            pa.Table.from_arrays(
-                [safe_join_key_col._arrow_data, np.arange(len(arr), dtype="int64")],
-                names=["join", f"index_t{i}"],
-            ).filter(pc.invert(pc.is_null(safe_join_key_col._arrow_data)))
-        )
-
-    joined = tables[0]
-    for other in tables[1:]:
-        joined = joined.join(
-            other,
-            ["join"],
-            join_type=join_type,
-            use_threads=False,
-            coalesce_keys=True,
-        )
-
-    index_cols = [joined[f"index_t{i}"].combine_chunks() for i in range(len(arrs))]
+    with tracer.trace("join_all_impl.indices"):
+        index_cols = [
+            pa.array(index_col, mask=index_col < 0)
+            for index_col in _join_indices(_join_codes(join_key_cols), join_type)
+        ]
 
     final_join_key_col: ArrowWeaveList = ArrowWeaveList(
         safe_coalesce(
@@ -318,6 +318,16 @@ def _arrow_sort_values_to_indices(
     output_type=lambda input_types: input_types["self"],
 )
 def sort(self, comp_fn, col_dirs):
+    sort_values = _sort_values_table(self, comp_fn, col_dirs)
+    indices = _arrow_sort_values_to_indices(sort_values, col_dirs)
+    return ArrowWeaveList(
+        pc.take(self._arrow_data, indices), self.object_type, self._artifact
+    )
+
+
+def _sort_values_table(
+    self: ArrowWeaveList, comp_fn: typing.Any, col_dirs: list[str]
+) -> pa.Table:
     sort_values = _apply_fn_node_with_tag_pushdown(self, comp_fn)
     sort_values = _sort_values_list_array_to_table(sort_values, col_dirs)
 
@@ -350,9 +360,76 @@ def sort(self, comp_fn, col_dirs):
         column = convert.to_compare_safe(column)
         sort_values = sort_values.set_column(i, column_name, column._arrow_data)
 
-    indices = _arrow_sort_values_to_indices(sort_values, col_dirs)
+    return sort_values
+
+
+def _select_k_safe(sort_values: pa.Table) -> bool:
+    # select_k drops nulls and NaNs instead of placing them at the end like
+    # sort_indices does.
+    for column in sort_values.columns:
+        if column.null_count > 0:
+            return False
+        if pa.types.is_floating(column.type) and pc.any(pc.is_nan(column)).as_py():
+            return False
+    return True
+
+
+def _arrow_top_k_indices(
+    sort_values: pa.Table, col_dirs: list[str], k: int
+) -> pa.Array:
+    """The first k of _arrow_sort_values_to_indices(sort_values, col_dirs)."""
+    # Neither select_k nor table sort_indices support dictionary columns,
+    # which tag strings are.
+    for i, column in enumerate(sort_values.columns):
+        if pa.types.is_dictionary(column.type):
+            sort_values = sort_values.set_column(
+                i, sort_values.field(i).name, column.cast(column.type.value_type)
+            )
+    if k >= len(sort_values) or not _select_k_safe(sort_values):
+        return _arrow_sort_values_to_indices(sort_values, col_dirs)[:k]
+
+    # select_k isn't stable. Breaking ties on the row index makes the order
+    # total, so the rows it picks are the ones the stable sort puts first.
+    col_names = sort_values.column_names
+    index_col_name = str(len(col_names))
+    sort_keys = [
+        (col_name, "ascending" if dir_name == "asc" else "descending")
+        for col_name, dir_name in zip(col_names, col_dirs)
+    ] + [(index_col_name, "ascending")]
+    sort_values = sort_values.append_column(
+        index_col_name, pa.array(np.arange(len(sort_values), dtype=np.int64))
+    )
+    indices = pc.select_k_unstable(sort_values, k=k, sort_keys=sort_keys)
+    top_k = sort_values.take(indices)
+    return pc.take(indices, pc.sort_indices(top_k, sort_keys))
+
+
+@op(
+    name="ArrowWeaveList-sortTopK",
+    input_type={
+        "self": ArrowWeaveListType(),
+        "comp_fn": lambda input_types: types.Function(
+            {"row": input_types["self"].object_type, "index": types.Int()},
+            types.Any(),
+        ),
+        "col_dirs": types.List(types.String()),
+        "offset": types.Int(),
+        "limit": types.Int(),
+    },
+    output_type=lambda input_types: input_types["self"],
+    hidden=True,
+)
+def sort_top_k(self, comp_fn, col_dirs, offset, limit):
+    # sort followed by offset and limit, see compile_apply_sort_limit_pushdown.
+    # Only the rows that survive the limit are taken from self.
+    if limit == 0 or offset >= len(self):
+        return ArrowWeaveList(
+            self._arrow_data.slice(0, 0), self.object_type, self._artifact
+        )
+    sort_values = _sort_values_table(self, comp_fn, col_dirs)
+    indices = _arrow_top_k_indices(sort_values, col_dirs, offset + limit)
     return ArrowWeaveList(
-        pc.take(self._arrow_data, indices), self.object_type, self._artifact
+        pc.take(self._arrow_data, indices[offset:]), self.object_type, self._artifact
     )
 
 
@@ -412,8 +489,13 @@ def awl_group_by_result_type(
 def groupby(self, group_by_fn):
     table = self._arrow_data
     unsafe_group_table_awl = _apply_fn_node_with_tag_pushdown(self, group_by_fn)
-    group_table_awl = to_compare_safe(unsafe_group_table_awl.without_tags())
-    group_table_as_array_awl_stripped = group_table_awl._arrow_data
+    untagged_group_table_awl = unsafe_group_table_awl.without_tags()
+    group_codes = convert.to_compare_codes([untagged_group_table_awl])
+    if group_codes is not None:
+        group_table_as_array_awl_stripped = group_codes[0]
+    else:
+        group_table_awl = to_compare_safe(untagged_group_table_awl)
+        group_table_as_array_awl_stripped = group_table_awl._arrow_data
     group_table_chunked = pa.chunked_array(
         pa.StructArray.from_arrays(
             [
@@ -1,5 +1,6 @@
 import typing
 
+import numpy as np
 import pyarrow as pa
 import pyarrow.compute as pc
 
@@ -64,6 +65,158 @@ def _concatenate_strings(
     )
 
 
+# Pairwise (element-wise) string predicates. Arrow only has kernels that
+# take a scalar pattern, so:
+# - startsWith/endsWith compare the pattern bytes against the matching bytes
+#   of each string with numpy. A byte prefix of valid UTF-8 that is itself
+#   valid UTF-8 is a character prefix, so this matches str.startswith.
+# - contains/in run the scalar kernel once per distinct pattern, on the rows
+#   that have it. With too many distinct patterns that's slower than python,
+#   so we fall back to a python loop.
+# Both work over chunks of rows, to bound the size of the intermediates.
+# A null on either side gives null.
+PAIRWISE_CHUNK_SIZE = 65536
+# Run the scalar kernel per pattern when there are at most this many rows
+# per distinct pattern, on average.
+PAIRWISE_MIN_ROWS_PER_PATTERN = 32
+
+
+def _plain_strings(arr: typing.Union[pa.Array, pa.ChunkedArray]) -> pa.Array:
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    if pa.types.is_dictionary(arr.type):
+        arr = arr.dictionary_decode()
+    if pa.types.is_null(arr.type):
+        arr = arr.cast(pa.string())
+    return arr
+
+
+def _string_bytes(arr: pa.Array) -> typing.Tuple[np.ndarray, np.ndarray]:
+    # Start offsets (len + 1) into a byte array, for a string array
+    offset_type = np.int64 if pa.types.is_large_string(arr.type) else np.int32
+    _, offsets_buf, data_buf = arr.buffers()
+    offsets = np.frombuffer(offsets_buf, dtype=offset_type)[
+        arr.offset : arr.offset + len(arr) + 1
+    ].astype(np.int64)
+    data = (
+        np.frombuffer(data_buf, dtype=np.uint8)
+        if data_buf is not None
+        else np.zeros(0, dtype=np.uint8)
+    )
+    return offsets, data
+
+
+def _affix_match_chunk(strs: pa.Array, affixes: pa.Array, at_end: bool) -> np.ndarray:
+    s_offsets, s_data = _string_bytes(strs)
+    a_offsets, a_data = _string_bytes(affixes)
+    s_lens = np.diff(s_offsets)
+    a_lens = np.diff(a_offsets)
+    fits = a_lens <= s_lens
+
+    rows = np.flatnonzero(fits & (a_lens > 0))
+    lens = a_lens[rows]
+    total = int(lens.sum())
+    row_of_byte = np.repeat(rows, lens)
+    byte_pos = np.arange(total, dtype=np.int64) - np.repeat(
+        np.cumsum(lens) - lens, lens
+    )
+    s_starts = s_offsets[:-1] + (s_lens - a_lens if at_end else 0)
+    mismatched = (
+        s_data[s_starts[row_of_byte] + byte_pos]
+        != a_data[a_offsets[row_of_byte] + byte_pos]
+    )
+    fits[row_of_byte[mismatched]] = False
+    return fits
+
+
+def _affix_match(strs: pa.Array, affixes: pa.Array, at_end: bool) -> pa.Array:
+    strs = _plain_strings(strs)
+    affixes = _plain_strings(affixes)
+    result = np.empty(len(strs), dtype=bool)
+    for start in range(0, len(strs), PAIRWISE_CHUNK_SIZE):
+        result[start : start + PAIRWISE_CHUNK_SIZE] = _affix_match_chunk(
+            strs.slice(start, PAIRWISE_CHUNK_SIZE),
+            affixes.slice(start, PAIRWISE_CHUNK_SIZE),
+            at_end,
+        )
+    nulls = pc.or_(pc.is_null(strs), pc.is_null(affixes))
+    return pa.array(result, mask=nulls.to_numpy(zero_copy_only=False))
+
+
+def _encode_if_few_distinct(needles: pa.Array) -> typing.Optional[pa.Array]:
+    if pa.types.is_null(needles.type):
+        return None
+    if not pa.types.is_dictionary(needles.type):
+        # Don't pay for encoding everything if a sample says it won't help
+        sample = needles.slice(0, PAIRWISE_CHUNK_SIZE)
+        sample_distinct = pc.count_distinct(sample, mode="all").as_py()
+        if sample_distinct * PAIRWISE_MIN_ROWS_PER_PATTERN > len(sample):
+            return None
+        needles = pc.dictionary_encode(needles)
+    if len(needles.dictionary) * PAIRWISE_MIN_ROWS_PER_PATTERN > len(needles):
+        return None
+    return needles
+
+
+def _substring_match(haystacks: pa.Array, needles: pa.Array) -> pa.Array:
+    """Element-wise `needle in haystack`."""
+    haystacks = _plain_strings(haystacks)
+    if isinstance(needles, pa.ChunkedArray):
+        needles = needles.combine_chunks()
+    nulls = pc.or_(pc.is_null(haystacks), pc.is_null(needles))
+    result = np.zeros(len(haystacks), dtype=bool)
+
+    encoded = _encode_if_few_distinct(needles)
+    if encoded is not None:
+        codes = encoded.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(encoded.dictionary) + 1))
+        for code, needle in enumerate(encoded.dictionary.to_pylist()):
+            rows = order[bounds[code] : bounds[code + 1]]
+            if len(rows) == 0 or needle is None:
+                continue
+            matched = pc.match_substring(haystacks.take(pa.array(rows)), needle)
+            result[rows] = matched.fill_null(False).to_numpy(zero_copy_only=False)
+    else:
+        needles = _plain_strings(needles)
+        for start in range(0, len(haystacks), PAIRWISE_CHUNK_SIZE):
+            chunk_haystacks = haystacks.slice(start, PAIRWISE_CHUNK_SIZE)
+            chunk_needles = needles.slice(start, PAIRWISE_CHUNK_SIZE)
+            result[start : start + PAIRWISE_CHUNK_SIZE] = np.fromiter(
+                (
+                    h is not None and n is not None and n in h
+                    for h, n in zip(
+                        chunk_haystacks.to_numpy(zero_copy_only=False),
+                        chunk_needles.to_numpy(zero_copy_only=False),
+                    )
+                ),
+                dtype=bool,
+                count=len(chunk_haystacks),
+            )
+    return pa.array(result, mask=nulls.to_numpy(zero_copy_only=False))
+
+
+def _in_scalar(needles: pa.Array, haystack: str) -> pa.Array:
+    """`needle in haystack` for each needle."""
+    if isinstance(needles, pa.ChunkedArray):
+        needles = needles.combine_chunks()
+    if pa.types.is_null(needles.type):
+        return pa.nulls(len(needles), type=pa.bool_())
+    encoded = (
+        needles
+        if pa.types.is_dictionary(needles.type)
+        else pc.dictionary_encode(needles)
+    )
+    matches = pa.array(
+        [
+            None if n is None else n in haystack
+            for n in encoded.dictionary.to_numpy(zero_copy_only=False)
+        ],
+        type=pa.bool_(),
+    )
+    return matches.take(encoded.indices)
+
+
 @arrow_op(
     name="ArrowWeaveListString-equal",
     input_type=null_consuming_binary_input_type,
@@ -96,11 +249,8 @@ def __ne__(self, other):
 def __contains__(self, other):
     if isinstance(other, ArrowWeaveList):
         return ArrowWeaveList(
-            pa.array(
-                other_item.as_py() in my_item.as_py()
-                for my_item, other_item in zip(self._arrow_data, other._arrow_data)
-            ),
-            None,
+            _substring_match(self._arrow_data, other._arrow_data),
+            types.Boolean(),
             self._artifact,
         )
     return ArrowWeaveList(
@@ -108,7 +258,6 @@ def __contains__(self, other):
     )
 
 
-# TODO: fix
 @arrow_op(
     name="ArrowWeaveListString-in",
     input_type=binary_input_type,
@@ -116,31 +265,13 @@ def __contains__(self, other):
 )
 def in_(self, other):
     if isinstance(other, ArrowWeaveList):
-
-        def new_val_iterator():
-            for my_item, other_item in zip(self._arrow_data, other._arrow_data):
-                if (
-                    pa.compute.is_null(my_item).as_py()
-                    or pa.compute.is_null(other_item).as_py()
-                ):
-                    yield None
-                else:
-                    yield my_item.as_py() in other_item.as_py()
-
         return ArrowWeaveList(
-            pa.array(new_val_iterator()),
+            _substring_match(other._arrow_data, self._arrow_data),
             types.Boolean(),
             self._artifact,
         )
-
     return ArrowWeaveList(
-        # this has to be a python loop because the second argument to match_substring has to be a scalar string
-        pa.array(
-            item.as_py() in other if not pa.compute.is_null(item).as_py() else None
-            for item in self._arrow_data
-        ),
-        types.Boolean(),
-        self._artifact,
+        _in_scalar(self._arrow_data, other), types.Boolean(), self._artifact
     )
 
 
@@ -268,10 +399,7 @@ def startswith(self, prefix):
             pc.starts_with(self._arrow_data, prefix), types.Boolean(), self._artifact
         )
     return ArrowWeaveList(
-        pa.array(
-            s.as_py().startswith(p.as_py())
-            for s, p in zip(self._arrow_data, prefix._arrow_data)
-        ),
+        _affix_match(self._arrow_data, prefix._arrow_data, at_end=False),
         types.Boolean(),
         self._artifact,
     )
@@ -291,10 +419,7 @@ def endswith(self, suffix):
             pc.ends_with(self._arrow_data, suffix), types.Boolean(), self._artifact
         )
     return ArrowWeaveList(
-        pa.array(
-            s.as_py().endswith(p.as_py())
-            for s, p in zip(self._arrow_data, suffix._arrow_data)
-        ),
+        _affix_match(self._arrow_data, suffix._arrow_data, at_end=True),
         types.Boolean(),
         self._artifact,
     )
@@ -22,7 +22,9 @@ from ...language_features.tagging.tagged_value_type import TaggedValueType
 
 from ...api import use
 
+import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
 from pyarrow import parquet as pq
 
 
@@ -34,6 +36,7 @@ from ...wandb_interface import wandb_stream_table
 from ...compile_table import KeyTree
 from ...ops_primitives import _dict_utils
 from ... import gql_json_cache
+from ... import parallelism
 
 tracer = engine_trace.tracer()
 
@@ -352,20 +355,182 @@ def history_keys(run: wdt.Run) -> list[str]:
     return list(object_type.property_types.keys())
 
 
+# Server side downsampling modes for history pushdown ops.
+# - nth: keep evenly spaced rows, always including the first and last.
+# - minmax: split the rows into equal buckets, and keep the rows holding the
+#   min and max of every numeric column in each bucket, so spikes survive.
+HISTORY_SAMPLE_MODE_NTH = "nth"
+HISTORY_SAMPLE_MODE_MINMAX = "minmax"
+HISTORY_SAMPLE_MODES = (HISTORY_SAMPLE_MODE_NTH, HISTORY_SAMPLE_MODE_MINMAX)
+
+
+def step_in_range(
+    step: typing.Any,
+    min_step: typing.Optional[float],
+    max_step: typing.Optional[float],
+) -> bool:
+    if step is None:
+        return True
+    if min_step is not None and step < min_step:
+        return False
+    if max_step is not None and step > max_step:
+        return False
+    return True
+
+
+def _row_groups_in_step_range(
+    parquet_file: pq.ParquetFile,
+    min_step: typing.Optional[float],
+    max_step: typing.Optional[float],
+) -> list[int]:
+    all_row_groups = list(range(parquet_file.num_row_groups))
+    if min_step is None and max_step is None:
+        return all_row_groups
+    meta = parquet_file.metadata
+    step_col_ndx = None
+    for i in range(meta.num_columns):
+        if meta.schema.column(i).path == "_step":
+            step_col_ndx = i
+            break
+    if step_col_ndx is None:
+        return all_row_groups
+    row_groups = []
+    for i in all_row_groups:
+        stats = meta.row_group(i).column(step_col_ndx).statistics
+        if (
+            stats is not None
+            and stats.has_min_max
+            and (
+                (min_step is not None and stats.max < min_step)
+                or (max_step is not None and stats.min > max_step)
+            )
+        ):
+            continue
+        row_groups.append(i)
+    return row_groups
+
+
+def filter_history_pa_table_by_step(
+    table: pa.Table,
+    min_step: typing.Optional[float],
+    max_step: typing.Optional[float],
+) -> pa.Table:
+    if (min_step is None and max_step is None) or "_step" not in table.column_names:
+        return table
+    steps = table["_step"]
+    mask = None
+    if min_step is not None:
+        mask = pc.greater_equal(steps, min_step)
+    if max_step is not None:
+        upper = pc.less_equal(steps, max_step)
+        mask = upper if mask is None else pc.and_(mask, upper)
+    return table.filter(mask)
+
+
+def downsample_history_pa_table(
+    table: pa.Table, max_points: int, sample_mode: str
+) -> pa.Table:
+    """Returns at most max_points rows of a step sorted history table."""
+    if sample_mode not in HISTORY_SAMPLE_MODES:
+        raise errors.WeaveBadRequest(
+            f"Unknown history sample mode {sample_mode}, expected one of {HISTORY_SAMPLE_MODES}"
+        )
+    num_rows = len(table)
+    if max_points <= 0:
+        return table.slice(0, 0)
+    if num_rows <= max_points:
+        return table
+
+    numeric_columns = [
+        table[name]
+        for name in table.column_names
+        if name != "_step"
+        and (
+            pa.types.is_integer(table.schema.field(name).type)
+            or pa.types.is_floating(table.schema.field(name).type)
+        )
+    ]
+    # Each bucket contributes a min and max row per numeric column. Pick the
+    # bucket count so the total stays within max_points. With too many
+    # columns for even one bucket, sample every nth row instead.
+    num_buckets = max_points // (2 * len(numeric_columns)) if numeric_columns else 0
+    if sample_mode == HISTORY_SAMPLE_MODE_NTH or num_buckets == 0:
+        indices = np.unique(np.linspace(0, num_rows - 1, max_points).round())
+        return table.take(indices.astype(np.int64))
+
+    bucket_ids = np.arange(num_rows) * num_buckets // num_rows
+    bucket_starts = np.searchsorted(bucket_ids, np.arange(num_buckets))
+    keep = []
+    for column in numeric_columns:
+        values = column.to_numpy().astype(np.float64)
+        for sign in (1, -1):
+            # nan (null) sorts last, so it is only picked for empty buckets
+            order = np.lexsort((sign * values, bucket_ids))
+            keep.append(order[bucket_starts])
+    indices = np.unique(np.concatenate(keep))
+    return table.take(indices.astype(np.int64))
+
+
+def read_history_parquet_shard(
+    path: str,
+    columns: list[str] = [],
+    min_step: typing.Optional[float] = None,
+    max_step: typing.Optional[float] = None,
+) -> pa.Table:
+    """Reads the requested columns of one history parquet file.
+
+    Columns the file doesn't have are skipped. When a step range is given,
+    row groups whose _step statistics fall outside of it are not read at all.
+    Row groups are decoded in parallel by pyarrow.
+    """
+    with tracer.trace("history.read_parquet_shard") as span:
+        span.set_tag("path", path)
+        parquet_file = pq.ParquetFile(path)
+        file_columns = set(parquet_file.schema_arrow.names)
+        columns_to_read = [c for c in columns if c in file_columns]
+        row_groups = _row_groups_in_step_range(parquet_file, min_step, max_step)
+        table = parquet_file.read_row_groups(
+            row_groups,
+            columns=columns_to_read,
+            use_threads=True,
+        )
+        table = filter_history_pa_table_by_step(table, min_step, max_step)
+        span.set_tag("num_row_groups", parquet_file.num_row_groups)
+        span.set_tag("num_row_groups_read", len(row_groups))
+        span.set_tag("bytes_read_to_arrow", table.nbytes)
+    return table
+
+
+def read_history_parquet_shards(
+    run: wdt.Run,
+    columns: list[str] = [],
+    min_step: typing.Optional[float] = None,
+    max_step: typing.Optional[float] = None,
+) -> list[pa.Table]:
+    """Downloads and reads all of a run's history parquet files concurrently."""
+    io = io_service.get_sync_client()
+    local_paths = [
+        io.fs.path(local_path)
+        for local_path in ensure_history_parquet_files(io, run)
+        if local_path is not None
+    ]
+    return list(
+        parallelism.do_in_parallel(
+            lambda path: read_history_parquet_shard(
+                path, columns, min_step=min_step, max_step=max_step
+            ),
+            local_paths,
+        )
+    )
+
+
 def awl_from_local_parquet_path(
     path: str,
     object_type: typing.Optional[types.TypedDict],
     columns: list[str] = [],
     artifact: typing.Optional[artifact_base.Artifact] = None,
 ) -> ArrowWeaveList:
-    with tracer.trace("pq.read_metadata") as span:
-        span.set_tag("path", path)
-        meta = pq.read_metadata(path)
-    file_schema = meta.schema
-    columns_to_read = [c for c in columns if c in file_schema.to_arrow_schema().names]
-    with tracer.trace("pq.read_table") as span:
-        span.set_tag("path", path)
-        table = pq.read_table(path, columns=columns_to_read)
+    table = read_history_parquet_shard(path, columns)
 
     # convert table to ArrowWeaveList
     with tracer.trace("make_awl") as span:
@@ -376,7 +541,7 @@ def awl_from_local_parquet_path(
 
 
 def process_history_awl_tables(tables: list[ArrowWeaveList]):
-    concatted = concat_awls(tables)
+    concatted = concat_awls(order_history_awls(tables))
     if isinstance(concatted, ArrowWeaveList):
         parquet_history = awl_to_pa_table(concatted)
     else:
@@ -399,26 +564,75 @@ def awl_to_pa_table(awl: ArrowWeaveList):
     return pa.Table.from_batches([rb])
 
 
+def _history_min_step(awl: ArrowWeaveList) -> typing.Optional[float]:
+    arrow_data = awl._arrow_data
+    if (
+        len(arrow_data) == 0
+        or not isinstance(arrow_data, pa.StructArray)
+        or arrow_data.type.get_field_index("_step") == -1
+    ):
+        return None
+    return pc.min(arrow_data.field("_step")).as_py()
+
+
+def order_history_awls(awls: list[ArrowWeaveList]) -> list[ArrowWeaveList]:
+    """Orders history shards by their first step.
+
+    Each shard covers a contiguous range of steps, so concatenating them in
+    this order usually produces an already sorted table, and
+    sort_history_pa_table doesn't have to do any work.
+    """
+    with_min_step = [(_history_min_step(awl), awl) for awl in awls]
+    with_min_step.sort(key=lambda item: (item[0] is not None, item[0] or 0))
+    return [awl for _, awl in with_min_step]
+
+
+def _is_sorted(array: typing.Union[pa.Array, pa.ChunkedArray]) -> bool:
+    if len(array) <= 1:
+        return True
+    # The comparisons skip nulls, and sorting puts them last.
+    if array.null_count > 0:
+        return False
+    return pc.all(pc.less_equal(array[:-1], array[1:])).as_py() is not False
+
+
 def sort_history_pa_table(table: pa.Table):
-    with tracer.trace("pq.sort"):
-        table_sorted_indices = pa.compute.bottom_k_unstable(
-            table, sort_keys=["_step"], k=len(table)
-        )
+    steps = table["_step"]
+    with tracer.trace("pq.sort") as span:
+        if _is_sorted(steps):
+            span.set_tag("already_sorted", True)
+            return table
+        # The table is a concatenation of shards that are each sorted by
+        # step, so it consists of a few sorted runs. numpy's stable sort is
+        # timsort for these dtypes, which merges existing runs (a k-way merge)
+        # instead of sorting from scratch.
+        table_sorted_indices = np.argsort(steps.to_numpy(), kind="stable")
 
     with tracer.trace("pq.take"):
         return table.take(table_sorted_indices)
 
 
+def ensure_history_parquet_files(
+    io: typing.Union[io_service.SyncClient, io_service.ServerlessClient],
+    run: wdt.Run,
+) -> list[typing.Optional[str]]:
+    # Download all of the run's history shards in one batch, rather than one
+    # IO service round trip per shard.
+    local_paths = io.ensure_files_downloaded(
+        run["sampledParquetHistory"]["parquetUrls"]
+    )
+    for local_path in local_paths:
+        if isinstance(local_path, Exception):
+            raise local_path
+    return typing.cast(list[typing.Optional[str]], local_paths)
+
+
 def read_history_parquet(run: wdt.Run, columns=None):
-    io = io_service.get_sync_client()
     object_type = refine_history_type(run, columns=columns)
     tables = []
-    for url in run["sampledParquetHistory"]["parquetUrls"]:
-        local_path = io.ensure_file_downloaded(url)
-        if local_path is not None:
-            path = io.fs.path(local_path)
-            awl = awl_from_local_parquet_path(path, object_type, columns=columns)
-            tables.append(awl)
+    for table in read_history_parquet_shards(run, columns=columns):
+        with tracer.trace("make_awl"):
+            tables.append(ArrowWeaveList(table, object_type=object_type))
     if len(tables) == 0:
         return None
     return process_history_awl_tables(tables)
@@ -19,7 +19,7 @@ from ... import engine_trace
 from ... import errors
 from ...wandb_interface import wandb_stream_table
 from . import history_op_common
-from ... import artifact_base, io_service
+from ... import artifact_base
 from .. import wbmedia
 from ...ops_domain.table import _patch_legacy_image_file_types
 from ...ops_arrow.list_ import weave_arrow_type_check, PathType, PathItemType
@@ -73,6 +73,84 @@ def history3_with_columns(run: wdt.Run, history_cols: list[str]):
     )
 
 
+@op(
+    render_info={"type": "function"},
+    plugins=wb_gql_op_plugin(lambda inputs, inner: "historyKeys"),
+    hidden=True,
+)
+def refine_history3_sampled_type(
+    run: wdt.Run, max_points: int, sample_mode: str
+) -> types.Type:
+    return ArrowWeaveListType(
+        _unflatten_history_object_type(history_op_common.refine_history_type(run))
+    )
+
+
+@op(
+    render_info={"type": "function"},
+    plugins=wb_gql_op_plugin(lambda inputs, inner: "historyKeys"),
+    hidden=True,
+)
+def refine_history3_pushdown_type(
+    run: wdt.Run,
+    history_cols: list[str],
+    min_step: typing.Optional[float],
+    max_step: typing.Optional[float],
+    max_points: typing.Optional[int],
+    sample_mode: typing.Optional[str],
+) -> types.Type:
+    return ArrowWeaveListType(
+        _unflatten_history_object_type(
+            history_op_common.refine_history_type(
+                run,
+                columns=history_op_common.get_full_columns_prefixed(run, history_cols),
+            )
+        )
+    )
+
+
+# Produced by compile:column_pushdown and compile:history_step_pushdown, never
+# called directly. Only reads rows with min_step <= _step <= max_step, and
+# optionally downsamples the result to max_points rows.
+@op(
+    name="run-history3_pushdown",
+    refine_output_type=refine_history3_pushdown_type,
+    plugins=wb_gql_op_plugin(history_op_common.make_run_history_gql_field),
+    output_type=ArrowWeaveListType(types.TypedDict({})),
+    hidden=True,
+)
+def history3_pushdown(
+    run: wdt.Run,
+    history_cols: list[str],
+    min_step: typing.Optional[float],
+    max_step: typing.Optional[float],
+    max_points: typing.Optional[int],
+    sample_mode: typing.Optional[str],
+):
+    return _get_history3(
+        run,
+        history_op_common.get_full_columns_prefixed(run, history_cols),
+        min_step=min_step,
+        max_step=max_step,
+        max_points=max_points,
+        sample_mode=sample_mode,
+    )
+
+
+@op(
+    name="run-history3_sampled",
+    refine_output_type=refine_history3_sampled_type,
+    plugins=wb_gql_op_plugin(history_op_common.make_run_history_gql_field),
+    output_type=ArrowWeaveListType(types.TypedDict({})),
+    hidden=True,
+)
+def history3_sampled(run: wdt.Run, max_points: int, sample_mode: str):
+    # Like history3, but returns at most max_points rows, sampled with
+    # sample_mode (see history_op_common.HISTORY_SAMPLE_MODES). Column pushdown
+    # replaces this with run-history3_pushdown.
+    return history_op_common.mock_history_rows(run)
+
+
 @op(
     name="run-history3",
     refine_output_type=refine_history3_type,
@@ -93,7 +171,14 @@ class PathTree:
     data: typing.Optional[typing.Any] = None
 
 
-def _get_history3(run: wdt.Run, columns=None):
+def _get_history3(
+    run: wdt.Run,
+    columns=None,
+    min_step: typing.Optional[float] = None,
+    max_step: typing.Optional[float] = None,
+    max_points: typing.Optional[int] = None,
+    sample_mode: typing.Optional[str] = None,
+):
     # 1. Get the flattened Weave-Type given HistoryKeys
     # 2. Read in the live set
     # 3. Raw-load each parquet file
@@ -119,10 +204,16 @@ def _get_history3(run: wdt.Run, columns=None):
 
     # 2. Read in the live set
     raw_live_data = _get_live_data_from_run(run, columns=columns)
+    if min_step is not None or max_step is not None:
+        raw_live_data = [
+            row
+            for row in raw_live_data
+            if history_op_common.step_in_range(row.get("_step"), min_step, max_step)
+        ]
 
     # 3.a: Raw-load each parquet file
     raw_history_awl_tables = _read_raw_history_awl_tables(
-        run, columns=columns, artifact=artifact
+        run, columns=columns, artifact=artifact, min_step=min_step, max_step=max_step
     )
 
     # 3.b: Collapse unions
@@ -158,15 +249,17 @@ def _get_history3(run: wdt.Run, columns=None):
 
     # 5.a Now we concat the converted liveset and parquet files
     concatted_awl = history_op_common.concat_awls(
-        [
-            live_data_awl,
-            *{
-                ArrowWeaveList(
-                    table, object_type=flattened_object_type, artifact=artifact
-                )
-                for table in processed_history_pa_tables
-            },
-        ]
+        history_op_common.order_history_awls(
+            [
+                live_data_awl,
+                *[
+                    ArrowWeaveList(
+                        table, object_type=flattened_object_type, artifact=artifact
+                    )
+                    for table in processed_history_pa_tables
+                ],
+            ]
+        )
     )
 
     if len(concatted_awl) == 0:
@@ -175,6 +268,12 @@ def _get_history3(run: wdt.Run, columns=None):
     sorted_table = history_op_common.sort_history_pa_table(
         history_op_common.awl_to_pa_table(concatted_awl)
     )
+    if max_points is not None:
+        sorted_table = history_op_common.downsample_history_pa_table(
+            sorted_table,
+            max_points,
+            sample_mode or history_op_common.HISTORY_SAMPLE_MODE_NTH,
+        )
 
     # 6. Finally, unflatten the columns
     final_array = _unflatten_pa_table(sorted_table)
@@ -575,18 +674,16 @@ def _read_raw_history_awl_tables(
     run: wdt.Run,
     columns=None,
     artifact: typing.Optional[artifact_base.Artifact] = None,
+    min_step: typing.Optional[float] = None,
+    max_step: typing.Optional[float] = None,
 ) -> list[ArrowWeaveList]:
-    io = io_service.get_sync_client()
     tables = []
-    for url in run["sampledParquetHistory"]["parquetUrls"]:
-        local_path = io.ensure_file_downloaded(url)
-        if local_path is not None:
-            path = io.fs.path(local_path)
-            awl = history_op_common.awl_from_local_parquet_path(
-                path, None, columns=columns, artifact=artifact
-            )
-            awl = awl.map_column(_parse_bytes_mapper)
-            tables.append(awl)
+    for table in history_op_common.read_history_parquet_shards(
+        run, columns=columns, min_step=min_step, max_step=max_step
+    ):
+        awl = ArrowWeaveList(table, object_type=None, artifact=artifact)
+        awl = awl.map_column(_parse_bytes_mapper)
+        tables.append(awl)
     return tables
 
     # return history_op_common.process_history_awl_tables(tables)
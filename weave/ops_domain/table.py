@@ -1,4 +1,5 @@
 import dataclasses
+import itertools
 import json
 import datetime
 import logging
@@ -20,6 +21,7 @@ from .. import timestamp as weave_timestamp
 from .. import io_service
 from .. import util
 from ..ops_domain import trace_tree
+from . import table_cache
 
 
 @dataclasses.dataclass(frozen=True)
@@ -193,6 +195,40 @@ def _infer_type_from_row_dicts(rows: list[dict]) -> types.TypedDict:
     return running_type
 
 
+@dataclasses.dataclass
+class _TableColumns:
+    """
+    Column-major table data: column name -> cell values, in column order.
+
+    Table files store rows. We transpose once up front so that columns of plain
+    JSON scalars can go straight to Arrow, and only media and object columns
+    are processed cell by cell in Python.
+    """
+
+    columns: dict[str, list]
+    num_rows: int
+
+    @classmethod
+    def from_table_data(
+        cls, column_names: list[str], row_data: list[list]
+    ) -> "_TableColumns":
+        # zip_longest reads missing trailing cells of short rows as None
+        columns = {
+            name: list(values)
+            for name, values in zip(column_names, itertools.zip_longest(*row_data))
+        }
+        for name in column_names:
+            if name not in columns:
+                columns[name] = [None] * len(row_data)
+        return cls(columns, len(row_data))
+
+    def rows(self) -> list[dict]:
+        if not self.columns:
+            return [{} for _ in range(self.num_rows)]
+        names = list(self.columns.keys())
+        return [dict(zip(names, values)) for values in zip(*self.columns.values())]
+
+
 @dataclasses.dataclass
 class PeerTableReader:
     """
@@ -239,12 +275,21 @@ class PeerTableReader:
         return None
 
 
+def _has_linked_tables(column_types: wandb_util.Weave0TypeJson) -> bool:
+    type_map = column_types["params"]["type_map"]
+    return any(
+        column_type["wb_type"] in wandb_util.foreign_key_type_names
+        or column_type["wb_type"] in wandb_util.foreign_index_type_names
+        for column_type in type_map.values()
+    )
+
+
 def _in_place_join_in_linked_tables(
-    rows: list[dict],
+    table_columns: _TableColumns,
     object_type: types.TypedDict,
     column_types: wandb_util.Weave0TypeJson,
     file: artifact_fs.FilesystemArtifactFile,
-) -> typing.Tuple[list[dict], types.TypedDict]:
+) -> typing.Tuple[_TableColumns, types.TypedDict]:
     """
     This function will join in any peer linked tables. This is done by replacing
     the column with the source table's index (or key) with the peer table's row.
@@ -256,6 +301,7 @@ def _in_place_join_in_linked_tables(
     calculate in the form of a ref.
     """
     type_map = column_types["params"]["type_map"]
+    columns = table_columns.columns
     for column_name, column_type in type_map.items():
         col_wb_type = column_type["wb_type"]
         if (
@@ -269,8 +315,7 @@ def _in_place_join_in_linked_tables(
                 # over failing.
                 peer_object_type = types.TypedDict({})
                 # Update the row values
-                for row in rows:
-                    row[column_name] = {}
+                columns[column_name] = [{} for _ in range(table_columns.num_rows)]
             elif isinstance(peer_file, artifact_fs.FilesystemArtifactDir):
                 raise errors.WeaveInternalError("Peer file is a directory")
             else:
@@ -285,18 +330,21 @@ def _in_place_join_in_linked_tables(
                 peer_reader = PeerTableReader(peer_rows, peer_object_type)
 
                 # Update the row values
-                for row in rows:
-                    if col_wb_type in wandb_util.foreign_index_type_names:
-                        row[column_name] = peer_reader.row_at_index(row[column_name])
-                    else:
-                        row[column_name] = peer_reader.row_at_key(
-                            column_type["params"]["col_name"], row[column_name]
-                        )
+                if col_wb_type in wandb_util.foreign_index_type_names:
+                    columns[column_name] = [
+                        peer_reader.row_at_index(value)
+                        for value in columns[column_name]
+                    ]
+                else:
+                    columns[column_name] = [
+                        peer_reader.row_at_key(column_type["params"]["col_name"], value)
+                        for value in columns[column_name]
+                    ]
 
             # update the object type
             object_type.property_types[column_name] = peer_object_type
 
-    return rows, object_type
+    return table_columns, object_type
 
 
 def _make_type_non_none(t: types.Type) -> types.Type:
@@ -323,93 +371,105 @@ possible_media_type_classes = (
 )
 
 
-def _table_data_to_weave1_objects(
-    row_data: list[dict],
-    file: artifact_fs.FilesystemArtifactFile,
-    row_type: types.TypedDict,
-) -> list[dict]:
-    def _create_media_type_for_cell(cell: dict) -> typing.Any:
-        file_type = cell["_type"]
-        file_path = cell["path"]
-        if file_type == "image-file":
-            return wbmedia.ImageArtifactFileRef(
-                artifact=file.artifact,
-                path=file_path,
-                format=cell["format"],
-                height=cell.get("height", 0),
-                width=cell.get("width", 0),
-                sha256=cell.get("sha256", file_path),
-                boxes=cell.get("boxes", {}),  # type: ignore
-                masks=cell.get("masks", {}),  # type: ignore
-                classes=cell.get("classes"),  # type: ignore
+def _create_media_type_for_cell(
+    cell: dict, file: artifact_fs.FilesystemArtifactFile
+) -> typing.Any:
+    file_type = cell["_type"]
+    file_path = cell["path"]
+    if file_type == "image-file":
+        return wbmedia.ImageArtifactFileRef(
+            artifact=file.artifact,
+            path=file_path,
+            format=cell["format"],
+            height=cell.get("height", 0),
+            width=cell.get("width", 0),
+            sha256=cell.get("sha256", file_path),
+            boxes=cell.get("boxes", {}),  # type: ignore
+            masks=cell.get("masks", {}),  # type: ignore
+            classes=cell.get("classes"),  # type: ignore
+        )
+    elif file_type in [
+        "audio-file",
+        "bokeh-file",
+        "video-file",
+        "object3D-file",
+        "molecule-file",
+        "html-file",
+    ]:
+        type_cls = types.type_name_to_type(file_type)
+        if type_cls is not None and type_cls.instance_class is not None:
+            return type_cls.instance_class(
+                file.artifact, file_path, cell.get("sha256", file_path)
             )
-        elif file_type in [
-            "audio-file",
-            "bokeh-file",
-            "video-file",
-            "object3D-file",
-            "molecule-file",
-            "html-file",
-        ]:
-            type_cls = types.type_name_to_type(file_type)
-            if type_cls is not None and type_cls.instance_class is not None:
-                return type_cls.instance_class(
-                    file.artifact, file_path, cell.get("sha256", file_path)
-                )
-        else:
-            raise errors.WeaveTableDeserializationError(
-                f"Unsupported media type {file_type}"
+    else:
+        raise errors.WeaveTableDeserializationError(
+            f"Unsupported media type {file_type}"
+        )
+
+
+def _process_cell_value(
+    cell: typing.Any,
+    cell_type: types.Type,
+    file: artifact_fs.FilesystemArtifactFile,
+) -> typing.Any:
+    if (
+        isinstance(cell, list)
+        and isinstance(cell_type, types.List)
+        # We want to avoid recursing into the list if the list element type is basic,
+        # since it will be a relatively expensive `O(n)` no-op.
+        and not isinstance(cell_type.object_type, types.BasicType)
+    ):
+        cell = [_process_cell_value(c, cell_type.object_type, file) for c in cell]
+
+    elif isinstance(cell, dict) and isinstance(cell_type, types.TypedDict):
+        cell = {
+            k: _process_cell_value(v, cell_type.property_types[str(k)], file)
+            for k, v in cell.items()
+        }
+    # this is needed because tables store timestamps as unix epochs in ms, but the deserialized
+    # representation in weave1 is a datetime object. we do the conversion here to ensure deserialized
+    # timestamps all expose a common interface to weave1 callers.
+    elif isinstance(cell_type, types.Timestamp):
+        if cell is not None:
+            cell = weave_timestamp.ms_to_python_datetime(
+                weave_timestamp.unitless_int_to_inferred_ms(cell)
             )
+    elif isinstance(cell, dict):
+        if isinstance(cell_type, possible_media_type_classes):
+            cell = _create_media_type_for_cell(cell, file)
+        elif isinstance(cell_type, trace_tree.WBTraceTree.WeaveType):  # type: ignore
+            copy = {**cell}
+            copy.pop("_type")
+            cell = trace_tree.WBTraceTree(**copy)
 
-    def _process_cell_value(cell: typing.Any, cell_type: types.Type) -> typing.Any:
-        if (
-            isinstance(cell, list)
-            and isinstance(cell_type, types.List)
-            # We want to avoid recursing into the list if the list element type is basic,
-            # since it will be a relatively expensive `O(n)` no-op.
-            and not isinstance(cell_type.object_type, types.BasicType)
-        ):
-            cell = [_process_cell_value(c, cell_type.object_type) for c in cell]
-
-        elif isinstance(cell, dict) and isinstance(cell_type, types.TypedDict):
-            cell = {
-                k: _process_cell_value(v, cell_type.property_types[str(k)])
-                for k, v in cell.items()
-            }
-        # this is needed because tables store timestamps as unix epochs in ms, but the deserialized
-        # representation in weave1 is a datetime object. we do the conversion here to ensure deserialized
-        # timestamps all expose a common interface to weave1 callers.
-        elif isinstance(cell_type, types.Timestamp):
-            if cell is not None:
-                cell = weave_timestamp.ms_to_python_datetime(
-                    weave_timestamp.unitless_int_to_inferred_ms(cell)
-                )
-        elif isinstance(cell, dict):
-            if isinstance(cell_type, possible_media_type_classes):
-                cell = _create_media_type_for_cell(cell)
-            elif isinstance(cell_type, trace_tree.WBTraceTree.WeaveType):  # type: ignore
-                copy = {**cell}
-                copy.pop("_type")
-                cell = trace_tree.WBTraceTree(**copy)
+    return cell
 
-        return cell
 
-    non_null_prop_types = _make_type_non_none(row_type)
-    non_null_prop_types = typing.cast(types.TypedDict, non_null_prop_types)
+# Cells of these types come out of json.load already in their weave1
+# representation.
+_PLAIN_CELL_TYPES = (types.String, types.Number, types.Boolean, types.NoneType)
 
-    rows: list[dict] = []
-    for data_row in row_data:
-        new_row = {
-            k: _process_cell_value(v, non_null_prop_types.property_types[str(k)])
-            for k, v in data_row.items()
-        }
-        rows.append(new_row)
 
-    return rows
+def _table_columns_to_weave1_objects(
+    table_columns: _TableColumns,
+    file: artifact_fs.FilesystemArtifactFile,
+    object_type: types.TypedDict,
+) -> None:
+    """Converts media, timestamp and object cells in place."""
+    non_null_prop_types = _make_type_non_none(object_type)
+    non_null_prop_types = typing.cast(types.TypedDict, non_null_prop_types)
+
+    for col_name, values in table_columns.columns.items():
+        col_type = non_null_prop_types.property_types[col_name]
+        if isinstance(col_type, _PLAIN_CELL_TYPES):
+            continue
+        table_columns.columns[col_name] = [
+            _process_cell_value(v, col_type, file) for v in values
+        ]
 
 
 def _patch_legacy_image_file_types(
-    rows: list[dict],
+    table_columns: _TableColumns,
     object_type: types.TypedDict,
     file: artifact_fs.FilesystemArtifactFile,
     assume_legacy: bool = False,
@@ -454,8 +514,7 @@ def _patch_legacy_image_file_types(
         box_keys_set: dict[str, bool] = {}
         box_score_key_set: dict[str, bool] = {}
         class_map: dict[int, str] = {}
-        for row in rows:
-            image_example = row[col_name]
+        for image_example in table_columns.columns[col_name]:
             if image_example is None:
                 continue
             image_example = typing.cast(wbmedia.ImageArtifactFileRef, image_example)
@@ -536,12 +595,11 @@ def should_infer_type_from_data(col_type: types.Type) -> bool:
     return status["found_unknown"]
 
 
-def _get_rows_and_object_type_from_weave_format(
+def _get_columns_and_object_type_from_weave_format(
     data: typing.Any,
     file: artifact_fs.FilesystemArtifactFile,
     sample_max_rows: int = 1000,
-) -> tuple[list, types.TypedDict]:
-    rows = []
+) -> tuple[_TableColumns, types.TypedDict]:
     artifact = file.artifact
     if not isinstance(artifact, artifact_wandb.WandbArtifact):
         raise errors.WeaveInternalError(
@@ -559,12 +617,13 @@ def _get_rows_and_object_type_from_weave_format(
     converted_object_type = types.TypedDict(
         {str(k): v for k, v in converted_object_type.property_types.items()}
     )
+    table_columns = _TableColumns.from_table_data(column_names, row_data)
     # Fix two things:
     # 1. incoming table column names may not match the order of column_types
     # 2. if we had an unknown (happens when old type is "PythonObjectType")
     #    we need to manually detect the type.
     obj_prop_types = {}
-    for i, key in enumerate(column_names):
+    for key in column_names:
         if key not in converted_object_type.property_types:
             raise errors.WeaveTableDeserializationError(
                 f"Column name {key} not found in column_types"
@@ -575,9 +634,9 @@ def _get_rows_and_object_type_from_weave_format(
             # can be very expensive. This could cause down-stream crashes,
             # for example if we don't realize that a column is union of string
             # and int, saving to arrow will crash.
-            unknown_col_example_data = [
-                row[i] for row in util.sample_rows(row_data, sample_max_rows)
-            ]
+            unknown_col_example_data = util.sample_rows(
+                table_columns.columns[key], sample_max_rows
+            )
             obj_prop_types[key] = _infer_type_from_col_list(unknown_col_example_data)
             logging.warning(
                 f"Column {key} had type {col_type} requiring data-inferred type. Inferred type as {obj_prop_types[key]}. This may be incorrect due to data sampling"
@@ -586,37 +645,51 @@ def _get_rows_and_object_type_from_weave_format(
             obj_prop_types[key] = col_type
     object_type = types.TypedDict(obj_prop_types)
 
-    raw_rows = [dict(zip(column_names, row)) for row in row_data]
-    rows = _table_data_to_weave1_objects(raw_rows, file, object_type)
-    object_type = _patch_legacy_image_file_types(rows, object_type, file)
+    _table_columns_to_weave1_objects(table_columns, file, object_type)
+    object_type = _patch_legacy_image_file_types(table_columns, object_type, file)
 
-    rows, object_type = _in_place_join_in_linked_tables(
-        rows, object_type, column_types, file
+    table_columns, object_type = _in_place_join_in_linked_tables(
+        table_columns, object_type, column_types, file
     )
 
-    return rows, object_type
+    return table_columns, object_type
 
 
-def _get_rows_and_object_type_from_legacy_format(
-    data: dict, file: artifact_fs.FilesystemArtifactFile, sample_max_rows: int = 1000
+def _get_rows_and_object_type_from_weave_format(
+    data: typing.Any,
+    file: artifact_fs.FilesystemArtifactFile,
+    sample_max_rows: int = 1000,
 ) -> tuple[list, types.TypedDict]:
+    table_columns, object_type = _get_columns_and_object_type_from_weave_format(
+        data, file, sample_max_rows
+    )
+    return table_columns.rows(), object_type
+
+
+def _get_columns_and_object_type_from_legacy_format(
+    data: dict, file: artifact_fs.FilesystemArtifactFile, sample_max_rows: int = 1000
+) -> tuple[_TableColumns, types.TypedDict]:
     # W&B dataframe columns are ints, we always want strings
     data["columns"] = [str(c) for c in data["columns"]]
-    raw_rows = [dict(zip(data["columns"], row)) for row in data["data"]]
     object_type = _infer_type_from_row_dicts(
-        util.sample_rows(raw_rows, sample_max_rows)
+        [
+            dict(zip(data["columns"], row))
+            for row in util.sample_rows(data["data"], sample_max_rows)
+        ]
     )
 
-    rows = _table_data_to_weave1_objects(raw_rows, file, object_type)
-    object_type = _patch_legacy_image_file_types(rows, object_type, file, True)
+    table_columns = _TableColumns.from_table_data(data["columns"], data["data"])
+    _table_columns_to_weave1_objects(table_columns, file, object_type)
+    object_type = _patch_legacy_image_file_types(table_columns, object_type, file, True)
 
-    return rows, object_type
+    return table_columns, object_type
 
 
 @dataclasses.dataclass
 class _TableLikeAWLFromFileResult:
     awl: ops_arrow.ArrowWeaveList
-    data: dict
+    # None when the table was loaded from the converted table cache
+    data: typing.Optional[dict]
 
 
 def _get_table_data_from_file(file: artifact_fs.FilesystemArtifactFile) -> dict:
@@ -637,13 +710,13 @@ def _get_table_like_awl_from_file(
 ) -> _TableLikeAWLFromFileResult:
     if file is None or isinstance(file, artifact_fs.FilesystemArtifactDir):
         raise errors.WeaveInternalError("File is None or a directory")
+    if file.path.endswith(".table.json"):
+        return _get_table_like_awl_from_table_file(file, num_parts)
     data = _get_table_data_from_file(file)
     if file.path.endswith(".joined-table.json"):
         awl = _get_joined_table_awl_from_file(data, file)
     elif file.path.endswith(".partitioned-table.json"):
         awl = _get_partitioned_table_awl_from_file(data, file)
-    elif file.path.endswith(".table.json"):
-        awl = _get_table_awl_from_file(data, file, num_parts)
     else:
         raise errors.WeaveInternalError(
             f"Unknown table file format for path: {file.path}"
@@ -651,45 +724,67 @@ def _get_table_like_awl_from_file(
     return _TableLikeAWLFromFileResult(awl, data)
 
 
-def _get_rows_and_object_type_awl_from_file(
+def _get_table_like_awl_from_table_file(
+    file: artifact_fs.FilesystemArtifactFile, num_parts: int
+) -> _TableLikeAWLFromFileResult:
+    sample_max_rows = _sample_max_rows(num_parts)
+    awl = table_cache.load(file, sample_max_rows)
+    if awl is not None:
+        return _TableLikeAWLFromFileResult(awl, None)
+    data = _get_table_data_from_file(file)
+    awl = _get_table_awl_from_file(data, file, num_parts)
+    # Linked tables are joined in from other files, so the result doesn't only
+    # depend on this file's contents.
+    if not (
+        _data_is_weave_file_format(data) and _has_linked_tables(data["column_types"])
+    ):
+        table_cache.save(file, sample_max_rows, awl)
+    return _TableLikeAWLFromFileResult(awl, data)
+
+
+def _sample_max_rows(num_parts: int) -> int:
+    return max(1000 // num_parts, 1)
+
+
+def _get_columns_and_object_type_from_file(
     data: dict,
     file: artifact_fs.FilesystemArtifactFile,
     num_parts: int = 1,
-) -> typing.Tuple[list, types.Type]:
+) -> typing.Tuple[_TableColumns, types.TypedDict]:
     tracer = engine_trace.tracer()
-    rows: list = []
-    object_type = None
     with tracer.trace("get_table:get_rows_and_object_type"):
-        sample_max_rows = max(1000 // num_parts, 1)
+        sample_max_rows = _sample_max_rows(num_parts)
         if _data_is_weave_file_format(data):
-            rows, object_type = _get_rows_and_object_type_from_weave_format(
+            return _get_columns_and_object_type_from_weave_format(
                 data, file, sample_max_rows
             )
         elif _data_is_legacy_run_file_format(data):
-            rows, object_type = _get_rows_and_object_type_from_legacy_format(
+            return _get_columns_and_object_type_from_legacy_format(
                 data, file, sample_max_rows
             )
         else:
             raise errors.WeaveInternalError("Unknown table file format for data")
 
-    return rows, object_type
 
-
-def _get_table_awl_from_rows_object_type(
-    rows: list, object_type: types.Type, file: artifact_fs.FilesystemArtifactFile
+def _get_table_awl_from_columns_object_type(
+    table_columns: _TableColumns,
+    object_type: types.TypedDict,
+    file: artifact_fs.FilesystemArtifactFile,
 ) -> "ops_arrow.ArrowWeaveList":
     tracer = engine_trace.tracer()
     with tracer.trace("get_table:to_arrow"):
-        return ops_arrow.to_arrow_from_list_and_artifact(
-            rows, object_type, file.artifact
+        return ops_arrow.to_arrow_from_columns_and_artifact(
+            table_columns.columns, object_type, file.artifact, table_columns.num_rows
         )
 
 
 def _get_table_awl_from_file(
     data: dict, file: artifact_fs.FilesystemArtifactFile, num_parts: int = 1
 ) -> "ops_arrow.ArrowWeaveList":
-    rows, object_type = _get_rows_and_object_type_awl_from_file(data, file, num_parts)
-    return _get_table_awl_from_rows_object_type(rows, object_type, file)
+    table_columns, object_type = _get_columns_and_object_type_from_file(
+        data, file, num_parts
+    )
+    return _get_table_awl_from_columns_object_type(table_columns, object_type, file)
 
 
 def _get_partitioned_table_awl_from_file(
@@ -707,20 +802,22 @@ def _get_partitioned_table_awl_from_file(
         asyncio.run(ensure_files(part_dir.files))
 
         num_parts = len(part_dir.files)
-        rrows: list[list] = []
+        part_columns: list[_TableColumns] = []
         object_types: list[types.Type] = []
         for file in part_dir.files.values():
             data = _get_table_data_from_file(file)
-            rows, object_type = _get_rows_and_object_type_awl_from_file(
+            table_columns, object_type = _get_columns_and_object_type_from_file(
                 data, file, num_parts
             )
-            rrows.append(rows)
+            part_columns.append(table_columns)
             object_types.append(object_type)
         object_type = types.union(*object_types)
 
-        for rows, file in zip(rrows, part_dir.files.values()):
+        for table_columns, file in zip(part_columns, part_dir.files.values()):
             all_aws.append(
-                _get_table_awl_from_rows_object_type(rows, object_type, file)
+                _get_table_awl_from_columns_object_type(
+                    table_columns, object_type, file
+                )
             )
     arrow_weave_list = ops_arrow.ops.concat.raw_resolve_fn(all_aws)
     return arrow_weave_list
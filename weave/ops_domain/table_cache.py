@@ -0,0 +1,121 @@
+# A local cache of W&B tables converted to Arrow.
+#
+# Converting a *.table.json file to an ArrowWeaveList means decoding the whole
+# json document, processing media cells and converting to Arrow. The result
+# only depends on the file contents, so we keep it on local disk as a feather
+# file keyed by the file's manifest digest. The same table version is never
+# json decoded twice, even across server restarts.
+#
+# Files live under <filesystem dir>/[<user>/]table_cache/ and are evicted along
+# with downloaded files when WEAVE_FILE_CACHE_MAX_BYTES is set (see
+# disk_cache.py).
+
+import hashlib
+import json
+import logging
+import typing
+
+import pyarrow as pa
+import pyarrow.feather as pf
+
+from .. import artifact_fs
+from .. import artifact_wandb
+from .. import disk_cache
+from .. import engine_trace
+from .. import environment
+from .. import filesystem
+from .. import ops_arrow
+from .. import weave_types as types
+
+statsd = engine_trace.statsd()  # type: ignore
+
+CACHE_DIR_NAME = "table_cache"
+
+# Bump when the conversion in table.py changes what it produces.
+CACHE_FORMAT_VERSION = 1
+
+_TYPE_METADATA_KEY = b"weave_object_type"
+
+
+def _cache_path(
+    file: artifact_fs.FilesystemArtifactFile, sample_max_rows: int
+) -> typing.Optional[str]:
+    if not environment.table_cache_enabled():
+        return None
+    if not isinstance(file.artifact, artifact_wandb.WandbArtifact):
+        return None
+    if file.artifact._read_artifact_uri is None:
+        return None
+    digest = file.artifact.digest(file.path)
+    if digest is None:
+        return None
+    key = hashlib.sha256(
+        json.dumps([CACHE_FORMAT_VERSION, digest, file.path, sample_max_rows]).encode()
+    ).hexdigest()
+    return f"{CACHE_DIR_NAME}/{key[:2]}/{key}.feather"
+
+
+def load(
+    file: artifact_fs.FilesystemArtifactFile, sample_max_rows: int
+) -> typing.Optional[ops_arrow.ArrowWeaveList]:
+    path = _cache_path(file, sample_max_rows)
+    if path is None:
+        return None
+    fs = filesystem.get_filesystem()
+    tracer = engine_trace.tracer()
+    with tracer.trace("table_cache.load") as span:
+        try:
+            with fs.open_read(path) as f:
+                table = pf.read_table(f)
+        except FileNotFoundError:
+            span.set_tag("hit", False)
+            statsd.increment("weave.table_cache.miss")
+            return None
+        span.set_tag("hit", True)
+        statsd.increment("weave.table_cache.hit")
+        if disk_cache.enabled():
+            # Keep recently used tables from being evicted
+            fs.touch(path)
+
+    object_type = types.TypeRegistry.type_from_dict(
+        json.loads(table.schema.metadata[_TYPE_METADATA_KEY])
+    )
+    arr = pa.StructArray.from_arrays(
+        [table[i].combine_chunks() for i in range(len(table.schema))],
+        names=[f.name for f in table.schema],
+    )
+    return ops_arrow.ArrowWeaveList(arr, object_type, file.artifact)
+
+
+def save(
+    file: artifact_fs.FilesystemArtifactFile,
+    sample_max_rows: int,
+    awl: ops_arrow.ArrowWeaveList,
+) -> None:
+    path = _cache_path(file, sample_max_rows)
+    if path is None:
+        return
+    object_type = awl.object_type
+    if not isinstance(object_type, types.TypedDict) or not object_type.property_types:
+        return
+    type_json = json.dumps(object_type.to_dict())
+    if types.TypeRegistry.type_from_dict(json.loads(type_json)) != object_type:
+        # Don't cache what we can't faithfully load.
+        return
+
+    arrow_data = awl._arrow_data
+    table = pa.Table.from_arrays(
+        [arrow_data.field(i) for i in range(len(arrow_data.type))],
+        names=[f.name for f in arrow_data.type],
+    ).replace_schema_metadata({_TYPE_METADATA_KEY: type_json})
+
+    fs = filesystem.get_filesystem()
+    tracer = engine_trace.tracer()
+    with tracer.trace("table_cache.save"):
+        try:
+            with fs.open_write(path) as f:
+                pf.write_feather(table, f)
+        except (OSError, pa.ArrowException):
+            # The cache is an optimization, failing to write it is not an error.
+            logging.warning("Failed to write table cache for %s", file, exc_info=True)
+            statsd.increment("weave.table_cache.write_error")
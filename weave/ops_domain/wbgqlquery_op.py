@@ -8,6 +8,7 @@ from ..wandb_client_api import wandb_gql_query
 from ..language_features.tagging import tagged_value_type
 from .. import engine_trace
 from .. import errors
+from .. import gql_response_cache
 from .. import environment
 from .. import mappers_gql
 from .. import partial_object
@@ -38,8 +39,10 @@ def wbgqlquery(query_str, alias_list, output_type):
     num_timeout_retries = environment.num_gql_timeout_retries()
     with tracer.trace("wbgqlquery:public_api"):
         logging.info("Executing GQL query: %s", query_str)
-        gql_payload = wandb_gql_query(
-            query_str, num_timeout_retries=num_timeout_retries
+        gql_payload = gql_response_cache.cached_query(
+            query_str,
+            {},
+            lambda: wandb_gql_query(query_str, num_timeout_retries=num_timeout_retries),
         )
     for alias in alias_list:
         if alias not in gql_payload:
@@ -19,6 +19,8 @@ from .. import runs
 from .. import artifact_fs
 from .. import artifact_wandb
 from .. import object_context
+from .. import value_fingerprint
+from ..language_features.tagging import tag_store
 
 
 @weave_class(weave_type=types.RefType)
@@ -372,6 +374,67 @@ def get(uri):
     return res
 
 
+@op(
+    name="getWithColumnsReturnType",
+    input_type={"uri": types.String(), "columns": types.List(types.String())},
+    output_type=types.TypeType(),
+    hidden=True,
+    pure=False,
+)
+def get_with_columns_returntype(uri, columns):
+    from ..ops_arrow import arrow
+
+    ref_type = op_get_return_type(uri)
+    if not isinstance(ref_type, arrow.ArrowWeaveListType):
+        return ref_type
+    return arrow.ArrowWeaveListType(
+        arrow.project_object_type(ref_type.object_type, columns)
+    )
+
+
+# Produced by compile:column_pushdown for gets of ArrowWeaveLists of
+# TypedDicts, never called directly. Only loads the given keys.
+@op(
+    pure=False,
+    name="get_with_columns",
+    input_type={"uri": types.String(), "columns": types.List(types.String())},
+    output_type=types.Any(),
+    refine_output_type=get_with_columns_returntype,
+    hidden=True,
+)
+def get_with_columns(uri, columns):
+    from ..ops_arrow import arrow
+    from ..ops_arrow import list_ as arrow_list
+
+    ref = ref_base.Ref.from_str(uri)
+    if (
+        isinstance(ref, artifact_fs.FilesystemArtifactRef)
+        and ref.path is not None
+        and ref.extra is None
+        and ref._obj is None
+        and object_context.get_object_context() is None
+    ):
+        ref_type = ref.type
+        if isinstance(ref_type, arrow.ArrowWeaveListType):
+            with tag_store.isolated_tagging_context():
+                res = ref_type.load_instance(ref.artifact, ref.path, columns=columns)
+            value_fingerprint.set_projection_digest(ref, columns, res)
+            return res
+
+    res = ref.get()
+    if isinstance(res, arrow_list.ArrowWeaveList) and isinstance(
+        res.object_type, types.TypedDict
+    ):
+        object_type = arrow.project_object_type(res.object_type, columns)
+        res = arrow_list.ArrowWeaveList(
+            arrow.project_struct_array(res._arrow_data, object_type),
+            object_type,
+            res._artifact,
+        )
+        value_fingerprint.set_projection_digest(ref, columns, res)
+    return res
+
+
 @op(
     pure=False,
     name="ref",
@@ -5,6 +5,7 @@ from typing import Optional, Callable, TypeVar, Iterator, Generator
 
 from . import context
 from . import execute
+from . import op_policy
 from . import forward_graph
 from . import memo
 from . import wandb_api
@@ -83,3 +84,10 @@ def get_remaining_budget_per_thread(item_count: int) -> int:
     if item_count <= 0:
         return parallel_budget
     return max(parallel_budget // item_count, 1)
+
+
+def get_concurrency_limit(concurrency_class: op_policy.ConcurrencyClass) -> int:
+    parallel_budget = get_parallel_budget()
+    if concurrency_class == op_policy.ConcurrencyClass.IO_BOUND:
+        return parallel_budget
+    return max(parallel_budget // 4, 1)
@@ -109,6 +109,10 @@ def get_ref(obj: typing.Any) -> typing.Optional[Ref]:
 # breaks some behaviors (like automatic cross-artifact references
 # for tagged objects)
 def _put_ref(obj: typing.Any, ref: Ref) -> None:
+    if isinstance(obj, types.Type):
+        # Types are values, equal types share instances (see the type caches
+        # in weave_types), so they can't carry a ref to one artifact.
+        return
     try:
         obj._ref = ref
     except (AttributeError, ValueError):
@@ -0,0 +1,129 @@
+# Capture of /__weave/execute requests for later replay.
+#
+# Captured requests are written as json lines to a rotating local file:
+#
+#   {"timestamp": <unix seconds>, "request": <the request body>}
+#
+# Capture is off by default. Set WEAVE_REQUEST_CAPTURE_SAMPLE_RATE to a value in
+# (0, 1] to capture that fraction of requests. Requests larger than
+# WEAVE_REQUEST_CAPTURE_MAX_REQUEST_BYTES are skipped.
+#
+# The request thread only does the sampling decision and a queue put. Encoding
+# and file IO happen on a background writer thread. If the writer falls behind,
+# captures are dropped rather than slowing requests down.
+#
+# Use `python -m weave.request_replay <file>` to replay a capture file.
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+import typing
+
+from . import engine_trace
+from . import environment
+
+statsd = engine_trace.statsd()  # type: ignore
+
+# Captures waiting for the writer thread
+QUEUE_MAX_SIZE = 256
+
+# Rotated files kept in addition to the current one
+FILE_BACKUP_COUNT = 5
+
+_CapturedRequest = typing.Tuple[float, bytes]
+
+
+class RequestCapture:
+    def __init__(
+        self, path: str, max_file_bytes: int, backup_count: int = FILE_BACKUP_COUNT
+    ) -> None:
+        self.path = path
+        self._handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_file_bytes, backupCount=backup_count, delay=True
+        )
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+        self._queue: queue.Queue[typing.Optional[_CapturedRequest]] = queue.Queue(
+            QUEUE_MAX_SIZE
+        )
+        self._thread = threading.Thread(
+            target=self._write_loop, name="weave-request-capture", daemon=True
+        )
+        self._thread.start()
+
+    def capture(self, request_bytes: bytes) -> bool:
+        try:
+            self._queue.put_nowait((time.time(), request_bytes))
+        except queue.Full:
+            statsd.increment("weave.request_capture.dropped")
+            return False
+        statsd.increment("weave.request_capture.captured")
+        return True
+
+    def flush(self) -> None:
+        """Blocks until everything captured so far has been written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        self._handler.close()
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except Exception:
+                logging.warning("Failed to write captured request", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, timestamp: float, request_bytes: bytes) -> None:
+        # The body is already json, splice it in rather than re-encoding it.
+        # Valid json can't contain raw newlines inside strings, so collapsing
+        # them keeps one request per line.
+        body = request_bytes.decode("utf-8").replace("\r", " ").replace("\n", " ")
+        line = '{"timestamp": %s, "request": %s}' % (json.dumps(timestamp), body)
+        self._handler.emit(logging.makeLogRecord({"msg": line}))
+
+
+_request_capture: typing.Optional[RequestCapture] = None
+_request_capture_lock = threading.Lock()
+
+
+def get_request_capture() -> typing.Optional[RequestCapture]:
+    global _request_capture
+    if environment.request_capture_sample_rate() <= 0:
+        return None
+    with _request_capture_lock:
+        path = environment.request_capture_path()
+        if _request_capture is None or _request_capture.path != path:
+            if _request_capture is not None:
+                _request_capture.close()
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            _request_capture = RequestCapture(
+                path, environment.request_capture_max_file_bytes()
+            )
+    return _request_capture
+
+
+def maybe_capture(request_bytes: bytes) -> bool:
+    """Called on the request thread. Returns True if the request was captured."""
+    sample_rate = environment.request_capture_sample_rate()
+    if sample_rate <= 0 or random.random() >= sample_rate:
+        return False
+    max_request_bytes = environment.request_capture_max_request_bytes()
+    if max_request_bytes is not None and len(request_bytes) > max_request_bytes:
+        statsd.increment("weave.request_capture.skipped_size")
+        return False
+    capture = get_request_capture()
+    if capture is None:
+        return False
+    return capture.capture(request_bytes)
@@ -0,0 +1,130 @@
+# Replays captured execute requests and reports their latency.
+#
+#   python -m weave.request_replay /tmp/weave/log/execute_requests.jsonl
+#
+# Reads files written by request_capture.py. Older server logs with
+# "Execute request (zlib): <base64>" lines are also accepted. Requests run
+# in-process through server.handle_request, one at a time, with the wandb
+# credentials from the environment (see weave_server_replay.sh for running
+# against a local server instead).
+
+import argparse
+import base64
+import dataclasses
+import json
+import logging
+import sys
+import time
+import typing
+import zlib
+
+from . import server
+from . import wandb_api
+
+_LEGACY_LOG_MARKER = "Execute request (zlib): "
+
+
+@dataclasses.dataclass
+class ReplayResult:
+    index: int
+    elapsed: float
+    node_count: int
+    error_count: int
+    # Set if the request as a whole failed
+    exception: typing.Optional[str] = None
+
+
+def parse_captured_line(line: str) -> typing.Optional[dict]:
+    line = line.strip()
+    if not line:
+        return None
+    marker_pos = line.find(_LEGACY_LOG_MARKER)
+    if marker_pos != -1:
+        b64 = line[marker_pos + len(_LEGACY_LOG_MARKER) :].split()[0]
+        return json.loads(zlib.decompress(base64.b64decode(b64)))
+    if not line.startswith("{"):
+        return None
+    return json.loads(line)["request"]
+
+
+def iter_captured_requests(paths: typing.Iterable[str]) -> typing.Iterator[dict]:
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                request = parse_captured_line(line)
+                if request is not None:
+                    yield request
+
+
+def replay_request(index: int, request: dict) -> ReplayResult:
+    start_time = time.time()
+    try:
+        response = server.handle_request(request, deref=True)
+    except Exception as e:
+        return ReplayResult(index, time.time() - start_time, 0, 0, repr(e))
+    elapsed = time.time() - start_time
+    error_count = sum(1 for _, error in response.results.iter_items() if error)
+    return ReplayResult(index, elapsed, len(response.results), error_count)
+
+
+def replay(
+    requests: typing.Iterable[dict], repeat: int = 1
+) -> typing.Iterator[ReplayResult]:
+    with wandb_api.from_environment():
+        for i, request in enumerate(requests):
+            for _ in range(repeat):
+                yield replay_request(i, request)
+
+
+def _percentile(sorted_values: list[float], p: float) -> float:
+    return sorted_values[min(int(len(sorted_values) * p), len(sorted_values) - 1)]
+
+
+def summarize(results: list[ReplayResult]) -> str:
+    if not results:
+        return "No requests replayed"
+    latencies = sorted(r.elapsed * 1000 for r in results)
+    failed = sum(1 for r in results if r.exception is not None)
+    return (
+        f"{len(results)} requests, {failed} failed. Latency ms: "
+        f"p50={_percentile(latencies, 0.5):.1f} "
+        f"p90={_percentile(latencies, 0.9):.1f} "
+        f"p99={_percentile(latencies, 0.99):.1f} "
+        f"max={latencies[-1]:.1f} "
+        f"total={sum(latencies):.1f}"
+    )
+
+
+def main(argv: typing.Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Replay captured weave execute requests"
+    )
+    parser.add_argument("files", nargs="+", help="capture files to replay")
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="times to replay each request"
+    )
+    parser.add_argument(
+        "--limit", type=int, default=None, help="replay at most this many requests"
+    )
+    args = parser.parse_args(argv)
+
+    requests: typing.Iterable[dict] = iter_captured_requests(args.files)
+    if args.limit is not None:
+        requests = (r for i, r in zip(range(args.limit), requests))
+
+    results = []
+    for result in replay(requests, args.repeat):
+        results.append(result)
+        line = (
+            f"{result.index}\t{result.elapsed * 1000:.1f}ms\t"
+            f"nodes={result.node_count}\terrors={result.error_count}"
+        )
+        if result.exception is not None:
+            line += f"\tfailed={result.exception}"
+        print(line)
+    print(summarize(results))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+    main()
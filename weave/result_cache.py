@@ -0,0 +1,233 @@
+# An in-memory tier in front of the artifact-backed run cache.
+#
+# When an op is cacheable, execute_forward_node looks its run up by executing
+# a get node against local artifacts, and on a miss writes a Run object to
+# disk. For hot ops that disk round trip costs more than the hit saves.
+#
+# ResultCache holds the output refs of recent runs, keyed by RunKey, with the
+# output value already loaded. Sizes are measured with nbytes for
+# ArrowWeaveLists. Entries are per user, like local artifacts. The output's
+# tags are snapshotted and re-added to the tag store on every hit, the way
+# loading from disk restores them.
+#
+# Hits hand every request the same object, where a disk hit loads a fresh
+# one, so the tier is off unless WEAVE_RESULT_CACHE_MAX_BYTES is set.
+#
+# RunWriter moves writing Run objects off the request thread. The output
+# itself is still saved synchronously: its ref's content addressed version is
+# what downstream ops hash into their own run keys.
+
+import contextvars
+import dataclasses
+import datetime
+import logging
+import queue
+import sys
+import threading
+import typing
+
+from . import cache
+from . import engine_trace
+from . import environment
+from . import errors
+from . import ref_base
+from . import weave_types as types
+from .language_features.tagging import tag_store
+
+statsd = engine_trace.statsd()  # type: ignore
+
+if typing.TYPE_CHECKING:
+    from .trace_local import RunKey
+
+# Results are for pure ops or for impure ops under a client cache key, so
+# they don't go stale. The age bound just lets cold entries go.
+MAX_AGE = datetime.timedelta(hours=1)
+
+ResultCacheKey = typing.Tuple[str, str]
+
+
+# A tagged value's tags, and theirs, recursively.
+TagSnapshot = dict[str, typing.Tuple[typing.Any, "TagSnapshot"]]
+
+
+def _snapshot_tags(obj: typing.Any) -> TagSnapshot:
+    if not tag_store.is_tagged(obj):
+        return {}
+    return {k: (v, _snapshot_tags(v)) for k, v in tag_store.get_tags(obj).items()}
+
+
+def _restore_tags(obj: typing.Any, snapshot: TagSnapshot) -> None:
+    if not snapshot:
+        return
+    for v, v_snapshot in snapshot.values():
+        _restore_tags(v, v_snapshot)
+    tag_store.add_tags(obj, {k: v for k, (v, _) in snapshot.items()})
+
+
+# Objects bigger than this aren't checked for nested tags, and aren't cached
+# in memory.
+MAX_TAG_SCAN_VALUES = 10000
+
+
+def _children(obj: typing.Any) -> typing.Iterable[typing.Any]:
+    from .ops_arrow import list_ as arrow_list
+
+    if isinstance(obj, (str, bytes, int, float, types.Type)):
+        return ()
+    if isinstance(obj, arrow_list.ArrowWeaveList):
+        # Arrow data carries its own tags
+        return ()
+    if isinstance(obj, dict):
+        return obj.values()
+    if isinstance(obj, (list, tuple, set)):
+        return obj
+    return getattr(obj, "__dict__", {}).values()
+
+
+def _untagged_inside(obj: typing.Any) -> bool:
+    seen: set[int] = set()
+    stack = list(_children(obj))
+    while stack:
+        v = stack.pop()
+        if id(v) in seen:
+            continue
+        seen.add(id(v))
+        if len(seen) > MAX_TAG_SCAN_VALUES or tag_store.is_tagged(v):
+            return False
+        stack.extend(_children(v))
+    return True
+
+
+def _shareable(ref: ref_base.Ref) -> bool:
+    # Tags live in the request's tag store, keyed by object. We carry the
+    # output's own tags over to other requests, but not tags on values
+    # nested inside it. Those outputs are only cached on disk.
+    return ref._obj is not None and _untagged_inside(ref._obj)
+
+
+@dataclasses.dataclass
+class _CachedResult:
+    output_ref: ref_base.Ref
+    # Tags can be on the ref (when an op returns a ref, see execute.py) or on
+    # the value.
+    ref_tags: TagSnapshot
+    obj_tags: TagSnapshot
+
+
+def _result_size(result: _CachedResult) -> int:
+    from .ops_arrow import list_ as arrow_list
+
+    obj = result.output_ref._obj
+    if isinstance(obj, arrow_list.ArrowWeaveList):
+        return obj._arrow_data.nbytes
+    return sys.getsizeof(obj)
+
+
+class ResultCache:
+    def __init__(self, max_bytes: int) -> None:
+        self._cache: cache.LruTimeWindowCache[
+            ResultCacheKey, _CachedResult
+        ] = cache.LruTimeWindowCache(
+            MAX_AGE, max_bytes=max_bytes, size_fn=_result_size, name="result"
+        )
+
+    @property
+    def max_bytes(self) -> typing.Optional[int]:
+        return self._cache.max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int) -> None:
+        self._cache.max_bytes = max_bytes
+
+    def get(self, run_key: "RunKey") -> typing.Optional[ref_base.Ref]:
+        """Returns the run's output ref, with the output's tags restored."""
+        try:
+            result = self._cache.get((run_key.op_simple_name, run_key.id))
+        except errors.WeaveAccessDeniedError:
+            return None
+        if isinstance(result, cache.LruTimeWindowCache.NotFound):
+            return None
+        _restore_tags(result.output_ref, result.ref_tags)
+        _restore_tags(result.output_ref._obj, result.obj_tags)
+        return result.output_ref
+
+    def set(self, run_key: "RunKey", output_ref: ref_base.Ref) -> None:
+        if not _shareable(output_ref):
+            return
+        result = _CachedResult(
+            output_ref, _snapshot_tags(output_ref), _snapshot_tags(output_ref._obj)
+        )
+        try:
+            self._cache.set((run_key.op_simple_name, run_key.id), result)
+        except errors.WeaveAccessDeniedError:
+            pass
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+_result_cache: typing.Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> typing.Optional[ResultCache]:
+    global _result_cache
+    max_bytes = environment.result_cache_max_bytes()
+    if max_bytes <= 0:
+        return None
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache(max_bytes)
+        _result_cache.max_bytes = max_bytes
+    return _result_cache
+
+
+def clear_result_cache() -> None:
+    if _result_cache is not None:
+        _result_cache.clear()
+
+
+class RunWriter:
+    """Runs cache writes on a background thread, in submission order."""
+
+    def __init__(
+        self, guard: typing.Callable[[], typing.ContextManager[typing.Any]]
+    ) -> None:
+        # Entered while writing, so writes don't race the request threads'
+        # cache reads and writes when those are serialized.
+        self._guard = guard
+        self._queue: queue.Queue[
+            typing.Tuple[contextvars.Context, typing.Callable[[], typing.Any]]
+        ] = queue.Queue()
+        self._thread: typing.Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    def submit(self, fn: typing.Callable[[], typing.Any]) -> None:
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._write_loop, name="weave-run-writer", daemon=True
+                )
+                self._thread.start()
+        # The write needs the request's context (user, filesystem).
+        self._queue.put((contextvars.copy_context(), fn))
+        statsd.gauge("weave.result_cache.write_queue_size", self._queue.qsize())
+
+    def flush(self) -> None:
+        """Blocks until every submitted write is done."""
+        self._queue.join()
+
+    def _write_loop(self) -> None:
+        while True:
+            ctx, fn = self._queue.get()
+            try:
+                with self._guard():
+                    ctx.run(fn)
+            except Exception:
+                logging.warning("Failed to write run to cache", exc_info=True)
+                statsd.increment("weave.result_cache.write_error")
+            finally:
+                self._queue.task_done()
@@ -3,8 +3,6 @@
 # nodes and inline the ops in their respective output nodes.
 
 import typing
-import hashlib
-import json
 import random
 
 from . import value_or_error
@@ -14,8 +12,6 @@ from . import graph
 from . import weave_types as types
 from . import errors
 from . import weave_internal
-from . import storage
-from . import memo
 
 
 NodeOrOp = typing.Union[graph.Node, graph.Op]
@@ -92,33 +88,8 @@ def _is_lambda(node: graph.Node):
     )
 
 
-@memo.memo
-def node_id(node: graph.Node):
-    hashable: dict[str, typing.Any] = {}
-    if isinstance(node, graph.OutputNode):
-        hashable["op_name"] = node.from_op.name
-        hashable["inputs"] = {
-            arg_name: node_id(arg_node)
-            for arg_name, arg_node in node.from_op.inputs.items()
-        }
-    elif isinstance(node, graph.VarNode):
-        # Must include type here, Const and OutputNode types can
-        # be inferred from the graph, but VarNode types cannot.
-        hashable["type"] = node.type.to_dict()
-        hashable["name"] = node.name
-    elif isinstance(node, graph.ConstNode):
-        if isinstance(node.val, graph.OutputNode) or isinstance(
-            node.val, graph.VarNode
-        ):
-            hashable["val"] = {"lambda": True, "body": node_id(node.val)}
-        else:
-            hashable["val"] = storage.to_python(node.val)
-        hashable["type"] = storage.to_python(node.type)
-    else:
-        raise errors.WeaveInternalError("invalid node encountered: %s" % node)
-    hash = hashlib.md5()
-    hash.update(json.dumps(hashable).encode())
-    return hash.hexdigest()
+def node_id(node: graph.Node) -> str:
+    return node.digest()
 
 
 def _deserialize_node(
@@ -191,7 +162,7 @@ def _deserialize_node(
         )
     elif node["nodeType"] == "var":
         parsed_node = graph.VarNode.from_json(node)
-    id_ = node_id(parsed_node)
+    id_ = parsed_node.digest()
     if id_ in hashed_nodes:
         parsed_node = hashed_nodes[id_]
     else:
@@ -219,7 +190,6 @@ def deserialize(
 
     target_node_values = value_or_error.ValueOrErrors.from_values(target_nodes)
 
-    with memo.memo_storage():
-        return target_node_values.safe_map(
-            lambda i: _deserialize_node(i, nodes, parsed_nodes, hashed_nodes)
-        )
+    return target_node_values.safe_map(
+        lambda i: _deserialize_node(i, nodes, parsed_nodes, hashed_nodes)
+    )
@@ -6,7 +6,9 @@ import logging
 
 from flask import current_app
 from werkzeug.serving import make_server
+import contextvars
 import multiprocessing
+import queue
 import threading
 import time
 import requests
@@ -48,6 +50,8 @@ from . import gql_json_cache
 
 # patch_request_post()
 
+statsd = engine_trace.statsd()  # type: ignore
+
 PROFILE = False
 
 OptionalAuthType = typing.Optional[
@@ -63,8 +67,23 @@ class HandleRequestResponse:
     nodes: value_or_error.ValueOrErrors[graph.Node]
 
 
+def _report_type_cache_stats(stats: weave_types.TypeCacheStats) -> None:
+    logging.info("TYPE CACHE STATS %s" % stats)
+    for name, count in dataclasses.asdict(stats).items():
+        statsd.increment(f"weave.type_cache.{name}", count)
+
+
 def handle_request(
     request, deref=False, serialize_fn=storage.to_python
+) -> HandleRequestResponse:
+    with weave_types.type_cache_stats() as type_stats:
+        response = _handle_request(request, deref, serialize_fn)
+    _report_type_cache_stats(type_stats)
+    return response
+
+
+def _handle_request(
+    request, deref=False, serialize_fn=storage.to_python
 ) -> HandleRequestResponse:
     start_time = time.time()
     tracer = engine_trace.tracer()
@@ -102,6 +121,118 @@ def handle_request(
     return HandleRequestResponse(result, nodes)
 
 
+@dataclasses.dataclass
+class StreamedNodeResult:
+    index: int
+    node: typing.Optional[graph.Node]
+    result: value_or_error.ValueOrError[typing.Any]
+    # Seconds from the start of the request until the result was ready
+    elapsed: float
+
+
+_STREAM_DONE = object()
+
+
+def handle_request_streaming(
+    request, deref=False, serialize_fn=storage.to_python
+) -> typing.Iterator[StreamedNodeResult]:
+    """Like handle_request, but yields each node's serialized result as soon
+    as it is ready, in completion order.
+
+    The request is deserialized before this returns, so malformed requests
+    raise here rather than from the iterator.
+    """
+    start_time = time.time()
+    tracer = engine_trace.tracer()
+    with tracer.trace("request:deserialize"):
+        nodes = serialize.deserialize(request["graphs"])
+    return _stream_results(nodes, start_time, deref, serialize_fn)
+
+
+def _stream_results(
+    nodes: value_or_error.ValueOrErrors[graph.Node],
+    start_time: float,
+    deref: bool,
+    serialize_fn: typing.Callable[[typing.Any], typing.Any],
+) -> typing.Iterator[StreamedNodeResult]:
+    results: queue.Queue = queue.Queue()
+    valid_indexes: list[int] = []
+    valid_nodes: list[graph.Node] = []
+    for i, (node, error) in enumerate(nodes.iter_items()):
+        if error is not None:
+            results.put((i, value_or_error.Error(error), time.time() - start_time))
+        else:
+            valid_indexes.append(i)
+            valid_nodes.append(node)
+
+    def on_result(
+        valid_index: int, result: value_or_error.ValueOrError[typing.Any]
+    ) -> None:
+        results.put((valid_indexes[valid_index], result, time.time() - start_time))
+
+    execute_error: list[Exception] = []
+
+    def run() -> None:
+        try:
+            with execute.top_level_stats() as stats:
+                with weave_types.type_cache_stats() as type_stats:
+                    with context.execution_client():
+                        with gql_json_cache.gql_json_cache_context():
+                            execute.execute_nodes(valid_nodes, on_result=on_result)
+            logging.info("FINAL STATS\n%s" % pprint.pformat(stats.op_summary()))
+            _report_type_cache_stats(type_stats)
+        except Exception as e:
+            execute_error.append(e)
+        finally:
+            results.put(_STREAM_DONE)
+
+    # Execute on another thread so that results can be serialized and sent
+    # while the remaining nodes run.
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(run,))
+    thread.start()
+
+    def finish(
+        node: graph.Node, result: value_or_error.ValueOrError[typing.Any]
+    ) -> value_or_error.ValueOrError[typing.Any]:
+        def _deref_and_serialize(val: typing.Any) -> typing.Any:
+            if deref and not isinstance(node.type, weave_types.RefType):
+                val = storage.deref(val)
+            # Forces output to be untagged
+            with isolated_tagging_context():
+                with wandb_api.from_environment():
+                    return serialize_fn(val)
+
+        return result.transform_and_catch(_deref_and_serialize)
+
+    valid_nodes_by_index = dict(zip(valid_indexes, valid_nodes))
+    sent: set[int] = set()
+    try:
+        while True:
+            item = results.get()
+            if item is _STREAM_DONE:
+                break
+            index, result, elapsed = item
+            node = valid_nodes_by_index.get(index)
+            if node is not None:
+                result = finish(node, result)
+            sent.add(index)
+            yield StreamedNodeResult(index, node, result, elapsed)
+        if execute_error:
+            # execute_nodes failed as a whole, fail whatever wasn't sent yet.
+            for i in range(len(nodes)):
+                if i not in sent:
+                    yield StreamedNodeResult(
+                        i,
+                        None,
+                        value_or_error.Error(execute_error[0]),
+                        time.time() - start_time,
+                    )
+    finally:
+        thread.join()
+        logger.info("Server request done in: %ss" % (time.time() - start_time))
+        tag_store.clear_tag_store()
+
+
 class SubprocessServer(multiprocessing.Process):
     def __init__(self, req_queue, resp_queue):
         multiprocessing.Process.__init__(self)
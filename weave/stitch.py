@@ -190,6 +190,7 @@ def is_root_op(op: op_def.OpDef) -> bool:
     return (
         op.name == "root-project"
         or op.name == "get"
+        or op.name == "get_with_columns"
         or op.name == "getReturnType"
         or op.name == "render_table_runs2"
         or op.name == "project-runs2"
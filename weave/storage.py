@@ -259,7 +259,7 @@ def local_artifacts() -> typing.List[artifact_local.LocalArtifact]:
         key=os.path.getctime,
     )
     for art_path in obj_paths:
-        if os.path.basename(art_path) != "tmp":
+        if art_path.name != "tmp" and art_path.name != artifact_local.BLOB_DIR_NAME:
             result.append(artifact_local.LocalArtifact(art_path.name, None))
     return result
 
@@ -370,9 +370,21 @@ def from_python(obj: dict, wb_type: typing.Optional[types.Type] = None) -> typin
     return res
 
 
-def make_js_serializer():
+def make_js_serializer(arrow_results: bool = False):
     artifact = artifact_mem.MemArtifact()
-    return functools.partial(to_weavejs, artifact=artifact)
+    js_serializer = functools.partial(to_weavejs, artifact=artifact)
+    if not arrow_results:
+        return js_serializer
+    from . import weavejs_arrow
+
+    def serialize(obj):
+        # Top-level ArrowWeaveLists are sent as Arrow, see weavejs_arrow.py
+        arrow_result = weavejs_arrow.to_arrow_result(box.unbox(obj))
+        if arrow_result is not None:
+            return arrow_result
+        return js_serializer(obj)
+
+    return serialize
 
 
 def convert_timestamps_to_epoch_ms(obj: typing.Any) -> typing.Any:
@@ -313,6 +313,15 @@ class FakeIoServiceClient:
         _, netloc, path, _, _, _ = parse.urlparse(download_url)
         return os.path.join("wandb_file_manager", netloc, path.lstrip("/"))
 
+    def manifests(self, artifact_uris):
+        return [self.manifest(uri) for uri in artifact_uris]
+
+    def ensure_files(self, artifact_uris):
+        return [self.ensure_file(uri) for uri in artifact_uris]
+
+    def ensure_files_downloaded(self, download_urls):
+        return [self.ensure_file_downloaded(url) for url in download_urls]
+
 
 @dataclass
 class SetupResponse:
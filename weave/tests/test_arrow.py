@@ -21,6 +21,7 @@ from .. import weave_types as types
 from .. import weave_internal
 from .. import context_state
 from .. import graph
+from .. import compile
 from ..ops_primitives import list_
 from .. import mappers_arrow
 from ..op_def import map_type
@@ -34,6 +35,8 @@ from ..tests import test_wb
 # If you're thinking of import vectorize here, don't! Put your
 # tests in test_arrow_vectorizer.py instead
 from .. import ops_arrow as arrow
+from ..ops_arrow import list_ops
+from ..ops_arrow import string as arrow_string
 from ..ops_arrow.arrow_tags import (
     recursively_encode_pyarrow_strings_as_dictionaries,
 )
@@ -783,6 +786,129 @@ def test_arrow_sort_tagged():
     assert weave.use(tag_node) == "c"
 
 
+@pytest.mark.parametrize(
+    "offset, limit",
+    [(None, 3), (0, 5), (4, 10), (18, 10), (30, 5), (2, 0)],
+)
+def test_arrow_sort_limit_top_k(offset, limit):
+    # Lots of ties, so the stable order of the sort matters
+    data = [{"a": (i * 7) % 5, "b": i % 3, "i": i} for i in range(20)]
+    awl = weave.save(arrow.to_weave_arrow(data))
+    fn = weave_internal.define_fn(
+        {"row": awl.type.object_type},
+        lambda row: list_.make_list(a=row["a"], b=row["b"]),
+    )
+    node = awl.sort(fn, ["desc", "asc"])
+    if offset is not None:
+        node = node.offset(offset)
+    node = node.limit(limit)
+
+    assert "ArrowWeaveList-sortTopK" in test_wb._compiled_op_names(node)
+    expected = sorted(data, key=lambda row: (-row["a"], row["b"]))
+    expected = expected[offset or 0 :][:limit]
+    assert weave.use(node).to_pylist_notags() == expected
+
+
+def test_arrow_sort_top_k_nulls_and_nans():
+    awl = arrow.to_weave_arrow([3.0, None, float("nan"), 1.0, 2.0, None])
+    fn = weave_internal.define_fn(
+        {"row": awl.type.object_type}, lambda row: list_.make_list(a=row)
+    )
+    # str, since nan != nan
+    expected = [str(v) for v in weave.use(awl.sort(fn, ["asc"])).to_pylist_notags()]
+    for offset, limit in [(0, 2), (1, 3), (2, 4)]:
+        top_k = weave.use(awl.sortTopK(fn, ["asc"], offset, limit))
+        assert [str(v) for v in top_k.to_pylist_notags()] == expected[
+            offset : offset + limit
+        ]
+
+
+def test_arrow_sort_top_k_tag_strings():
+    # Tag values are dictionary encoded
+    tagged = [
+        tag_store.add_tags(box.box(i), {"mytag": name})
+        for i, name in enumerate(["d", "b", "e", "a", "c"])
+    ]
+    awl = weave.save(arrow.to_weave_arrow(tagged))
+    tag_getter_op = make_tag_getter_op.make_tag_getter_op("mytag", types.String())
+    fn = weave_internal.define_fn(
+        {"row": awl.type.object_type},
+        lambda row: list_.make_list(a=tag_getter_op(row)),
+    )
+    top_k = weave.use(awl.sortTopK(fn, ["desc"], 1, 2))
+    assert top_k.to_pylist_notags() == [0, 4]
+
+    sort_values = pa.table(
+        {"0": pa.array(["d", "b", "e", "a", "c"]).dictionary_encode()}
+    )
+    assert list_ops._arrow_top_k_indices(sort_values, ["desc"], 3).to_pylist() == [
+        2,
+        0,
+        4,
+    ]
+
+
+@pytest.mark.parametrize(
+    "op, expected_output",
+    [
+        (arrow_string.__contains__, [True, None, None, True, False]),
+        (lambda x, y: arrow_string.in_(y, x), [True, None, None, True, False]),
+        (arrow_string.startswith, [True, None, None, False, False]),
+        (arrow_string.endswith, [False, None, None, True, False]),
+    ],
+)
+def test_arrow_string_pairwise_predicates(op, expected_output):
+    l = weave.save(arrow.to_arrow(["bc", None, "df", "日本", "日"]))
+    l2 = weave.save(arrow.to_arrow(["b", "c", None, "本", "日本"]))
+    assert weave.use(op(l, l2)).to_pylist_notags() == expected_output
+
+
+def test_arrow_get_column_pushdown():
+    data = [{"a": i, "b": str(i), "c": {"x": i, "y": 1.0}} for i in range(10)]
+    ref = storage.save(arrow.to_arrow(data))
+    get_node = ops.get(str(ref))
+    fn = weave_internal.define_fn(
+        {"row": get_node.type.object_type}, lambda row: row["a"] > 6
+    )
+
+    node = get_node.filter(fn)["c"]["x"]
+    assert "get_with_columns" in test_wb._compiled_op_names(node)
+    assert weave.use(node).to_pylist_notags() == [7, 8, 9]
+
+    loaded = weave.use(ops.get_with_columns(str(ref), ["a", "c"]))
+    assert loaded.object_type == types.TypedDict(
+        {"a": types.Int(), "c": types.TypedDict({"x": types.Int(), "y": types.Float()})}
+    )
+    assert [f.name for f in loaded._arrow_data.type] == ["a", "c"]
+
+    # Fingerprinted by the ref and columns, like a plain get by its ref
+    projected = ops.get_with_columns.resolve_fn(str(ref), ["a", "c"])
+    assert projected._digest is not None
+    assert projected._digest == (
+        ops.get_with_columns.resolve_fn(str(ref), ["a", "c"])._digest
+    )
+    assert projected._digest != ops.get_with_columns.resolve_fn(str(ref), ["a"])._digest
+
+    # stitch doesn't record what sortTopK's function reads
+    top_k_fn = weave_internal.define_fn(
+        {"row": get_node.type.object_type},
+        lambda row: list_.make_list(a=row["b"]),
+    )
+    top_k_node = get_node.sortTopK(top_k_fn, ["desc"], 0, 2)["a"]
+    assert "get_with_columns" not in test_wb._compiled_op_names(top_k_node)
+    assert weave.use(top_k_node).to_pylist_notags() == [9, 8]
+
+    # Whole rows are needed
+    assert "get_with_columns" not in test_wb._compiled_op_names(get_node[0])
+    both = [get_node[0], get_node["a"]]
+    assert "get_with_columns" not in [
+        n.from_op.name
+        for n in graph.all_nodes_full(compile.compile(both))
+        if isinstance(n, graph.OutputNode)
+    ]
+    assert weave.use(both[0]) == data[0]
+
+
 def test_arrow_filter_nulls():
     awl = weave.save(arrow.to_weave_arrow([-1, 0, 1, None]))
     weave_func = lambda row: row < 1
@@ -1336,6 +1462,39 @@ def test_join_all_on_list():
     ]
 
 
+def test_to_compare_codes():
+    l1 = arrow.to_arrow(
+        [
+            {"a": 1, "b": {"c": "x", "d": -0.0}},
+            {"a": 1, "b": {"c": "y", "d": 0.0}},
+            None,
+            {"a": None, "b": {"c": "x", "d": 0.0}},
+        ]
+    )
+    l2 = arrow.to_arrow(
+        [{"a": 1, "b": {"c": "x", "d": 0.0}}, {"a": 2, "b": {"c": "x", "d": 0.0}}]
+    )
+    codes1, codes2 = (c.to_pylist() for c in arrow.convert.to_compare_codes([l1, l2]))
+    assert codes1[2] is None
+    assert len(set(codes1[:2] + codes1[3:] + codes2[1:])) == 4
+    assert codes1[0] == codes2[0]
+
+    # Lists aren't handled, callers use to_compare_safe
+    assert arrow.convert.to_compare_codes([arrow.to_arrow([[1], [2]])]) is None
+
+
+def test_groupby_struct_key_matches_compare_safe():
+    rows = [{"k": {"a": i % 3, "b": str(i % 2)}, "v": i} for i in range(12)]
+    node = weave.save(arrow.to_arrow(rows)).groupby(lambda row: row["k"])
+    groups = weave.use(node.map(lambda group: group["v"]))
+    keys = weave.use(node.map(lambda group: group.groupkey()))
+    expected: dict = {}
+    for row in rows:
+        expected.setdefault((row["k"]["a"], row["k"]["b"]), []).append(row["v"])
+    assert [(k["a"], k["b"]) for k in keys.to_pylist_notags()] == list(expected)
+    assert groups.to_pylist_notags() == list(expected.values())
+
+
 def test_to_arrow_union_list():
     val = [{"a": 5.0}, {"a": [1.0]}]
     arrow_val = arrow.to_arrow([{"a": 5.0}, {"a": [1.0]}])
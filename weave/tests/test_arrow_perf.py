@@ -3,6 +3,7 @@
 import pytest
 import weave
 import time
+import pyarrow as pa
 from weave import ops_arrow
 from weave import ops_primitives
 
@@ -19,3 +20,98 @@ def test_listmap():
     elapsed = time.time() - start_time
     # Runs in 0.9s on my m1 macbook pro
     assert elapsed < 2.5
+
+
+def _struct_key_awl(n, key_cardinality):
+    return ops_arrow.ArrowWeaveList(
+        pa.array(
+            [
+                {
+                    "k": {
+                        "a": i % key_cardinality,
+                        "b": f"s{i % key_cardinality}",
+                        "c": float(i % 11),
+                    },
+                    "v": i,
+                }
+                for i in range(n)
+            ]
+        )
+    )
+
+
+def _time(fn):
+    start_time = time.time()
+    fn()
+    return time.time() - start_time
+
+
+# Compares hashed (to_compare_codes) keys with the to_compare_safe strings
+# they replace.
+@pytest.mark.skip(reason="Performance test")
+@pytest.mark.parametrize("n", [100000, 1000000])
+def test_struct_key_groupby_join(monkeypatch, n):
+    from ..ops_arrow import convert
+    from ..ops_arrow import list_ops
+    from ..ops_arrow import list_join
+
+    group_awl = _struct_key_awl(n, 1000)
+    group_fn = weave.define_fn({"row": group_awl.object_type}, lambda row: row["k"]).val
+    join_awl = _struct_key_awl(n, n)
+    join_keys = join_awl.column("k")
+
+    def run_all():
+        return (
+            _time(lambda: list_ops.groupby.resolve_fn(group_awl, group_fn)),
+            _time(
+                lambda: list_join.join_all_impl(
+                    [join_awl, join_awl], [join_keys, join_keys], ["a", "b"], "inner"
+                )
+            ),
+        )
+
+    groupby_codes, join_codes = run_all()
+    monkeypatch.setattr(convert, "to_compare_codes", lambda awls: None)
+    groupby_strings, join_strings = run_all()
+    print(
+        f"n={n} groupby: {groupby_codes:.3f}s (strings {groupby_strings:.3f}s) "
+        f"join: {join_codes:.3f}s (strings {join_strings:.3f}s)"
+    )
+
+
+def _log_lines(n, pattern_cardinality):
+    lines = pa.array([f"worker-{i % 97} step {i} loss {i % 13}" for i in range(n)])
+    patterns = pa.array([f"step {i % pattern_cardinality}" for i in range(n)])
+    return lines, patterns
+
+
+# Compares the pairwise string predicates with the per element python loops
+# they replace.
+@pytest.mark.skip(reason="Performance test")
+@pytest.mark.parametrize("n", [10000, 100000, 1000000])
+def test_string_pairwise_predicates(n):
+    from ..ops_arrow import string as arrow_string
+
+    for pattern_cardinality in [10, n]:
+        lines, patterns = _log_lines(n, pattern_cardinality)
+        prefixes = pa.array([f"worker-{i % 7}" for i in range(n)])
+        timings = {
+            "contains": _time(lambda: arrow_string._substring_match(lines, patterns)),
+            "contains (old)": _time(
+                lambda: pa.array(
+                    p.as_py() in s.as_py() for s, p in zip(lines, patterns)
+                )
+            ),
+            "startsWith": _time(
+                lambda: arrow_string._affix_match(lines, prefixes, at_end=False)
+            ),
+            "startsWith (old)": _time(
+                lambda: pa.array(
+                    s.as_py().startswith(p.as_py()) for s, p in zip(lines, prefixes)
+                )
+            ),
+        }
+        print(
+            f"n={n} patterns={pattern_cardinality} "
+            + " ".join(f"{k}: {v:.3f}s" for k, v in timings.items())
+        )
@@ -1,7 +1,10 @@
+import os
+import threading
 import pytest
 import weave
 from .. import artifact_local
 from .. import artifact_fs
+from .. import environment
 from .. import storage
 
 from .. import ops_arrow as arrow
@@ -78,3 +81,84 @@ def test_local_artifact_name():
         artifact_local.LocalArtifact("a:b")
     with pytest.raises(ValueError):
         artifact_local.LocalArtifact("a..b")
+
+
+def _write_files(art, files):
+    for path, contents in files.items():
+        with art.new_file(path) as f:
+            f.write(contents)
+
+
+def test_local_artifact_links_unchanged_files():
+    art = artifact_local.LocalArtifact("blobs-test")
+    _write_files(art, {"a.txt": "a", "sub/b.txt": "b"})
+    art.save()
+
+    art2 = artifact_local.LocalArtifact("blobs-test", art.version)
+    _write_files(art2, {"a.txt": "a2", "c.txt": "c"})
+    art2.save()
+
+    assert art2.version != art.version
+    for path, contents in [("a.txt", "a2"), ("sub/b.txt", "b"), ("c.txt", "c")]:
+        with art2.open(path) as f:
+            assert f.read() == contents
+    with art.open("a.txt") as f:
+        assert f.read() == "a"
+    # The kept file is a link to the same blob, not a copy
+    assert (
+        os.stat(art2.path("sub/b.txt")).st_ino == os.stat(art.path("sub/b.txt")).st_ino
+    )
+    assert sorted(art2.path_info("").files) == ["a.txt", "c.txt"]
+
+    # Version hashes are the same as for a fresh save of the same files
+    fresh = artifact_local.LocalArtifact("blobs-test-fresh")
+    _write_files(fresh, {"a.txt": "a2", "sub/b.txt": "b", "c.txt": "c"})
+    fresh.save()
+    assert fresh.version == art2.version
+
+
+def test_local_artifact_blob_gc():
+    art = artifact_local.LocalArtifact("blobs-gc-test")
+    _write_files(art, {"a.txt": "a" * 100})
+    art.save()
+    assert artifact_local.collect_garbage_blobs(min_age_sec=0) == 0
+
+    art.delete()
+    assert artifact_local.collect_garbage_blobs(min_age_sec=60) == 0
+    assert artifact_local.collect_garbage_blobs(min_age_sec=0) == 100
+
+
+def test_local_artifact_blob_gc_all_users():
+    art = artifact_local.LocalArtifact("blobs-gc-all-test")
+    _write_files(art, {"a.txt": "a" * 100})
+    art.save()
+    art.delete()
+
+    # Another user's blob store, see filesystem.get_filesystem_dir
+    root = environment.weave_filesystem_dir()
+    user_blob = os.path.join(
+        root, "user1", "local-artifacts", artifact_local.BLOB_DIR_NAME, "ab", "abc"
+    )
+    os.makedirs(os.path.dirname(user_blob))
+    with open(user_blob, "wb") as f:
+        f.write(b"x" * 50)
+
+    assert artifact_local.collect_all_garbage_blobs(min_age_sec=0) == 150
+    assert not os.path.exists(user_blob)
+
+
+def test_local_artifact_blob_gc_thread(monkeypatch):
+    monkeypatch.setenv("WEAVE_LOCAL_ARTIFACT_BLOB_GC_INTERVAL_SEC", "0")
+    assert artifact_local.start_blob_gc_thread() is None
+
+    collected = threading.Event()
+    monkeypatch.setattr(
+        artifact_local, "collect_all_garbage_blobs", lambda: collected.set()
+    )
+    monkeypatch.setenv("WEAVE_LOCAL_ARTIFACT_BLOB_GC_INTERVAL_SEC", "0.01")
+    thread = artifact_local.start_blob_gc_thread()
+    assert thread is not None
+    try:
+        assert collected.wait(timeout=10)
+    finally:
+        thread.stop()
@@ -3,6 +3,10 @@ import datetime
 from .. import cache
 
 
+def _items(c):
+    return [(k, e.set_at, e.value) for k, e in c._cache.items()]
+
+
 def test_lru_time_window_cache():
     curtime = {"t": datetime.datetime(2020, 1, 1)}
 
@@ -18,21 +22,57 @@ def test_lru_time_window_cache():
     c.set("foo", "b")
     c.set("bar", "d")
     c.set("baz", "e")
-    assert list(c._cache.items()) == [
-        ((None, "boink"), (datetime.datetime(2020, 1, 1, 0, 0, 1), "will_prune")),
-        ((None, "foo"), (datetime.datetime(2020, 1, 1, 0, 0, 2), "b")),
-        ((None, "bar"), (datetime.datetime(2020, 1, 1, 0, 0, 3), "d")),
-        ((None, "baz"), (datetime.datetime(2020, 1, 1, 0, 0, 4), "e")),
+    assert _items(c) == [
+        ((None, "boink"), datetime.datetime(2020, 1, 1, 0, 0, 1), "will_prune"),
+        ((None, "foo"), datetime.datetime(2020, 1, 1, 0, 0, 2), "b"),
+        ((None, "bar"), datetime.datetime(2020, 1, 1, 0, 0, 3), "d"),
+        ((None, "baz"), datetime.datetime(2020, 1, 1, 0, 0, 4), "e"),
     ]
 
-    c.get("foo")
+    # Reading foo makes it most recently used, but does not extend its
+    # lifetime, so it still expires 5s after it was set.
+    assert c.get("foo") == "b"
+    assert _items(c)[-1][0] == (None, "foo")
     c.set("bozo", "y")
     c.set("bar", "f")
     c.set("bar2", "h")
-    assert list(c._cache.items()) == [
-        ((None, "baz"), (datetime.datetime(2020, 1, 1, 0, 0, 4), "e")),
-        ((None, "foo"), (datetime.datetime(2020, 1, 1, 0, 0, 5), "b")),
-        ((None, "bozo"), (datetime.datetime(2020, 1, 1, 0, 0, 6), "y")),
-        ((None, "bar"), (datetime.datetime(2020, 1, 1, 0, 0, 7), "f")),
-        ((None, "bar2"), (datetime.datetime(2020, 1, 1, 0, 0, 8), "h")),
+    assert _items(c) == [
+        ((None, "baz"), datetime.datetime(2020, 1, 1, 0, 0, 4), "e"),
+        ((None, "bozo"), datetime.datetime(2020, 1, 1, 0, 0, 6), "y"),
+        ((None, "bar"), datetime.datetime(2020, 1, 1, 0, 0, 7), "f"),
+        ((None, "bar2"), datetime.datetime(2020, 1, 1, 0, 0, 8), "h"),
     ]
+    assert isinstance(c.get("foo"), cache.LruTimeWindowCache.NotFound)
+
+
+def test_lru_time_window_cache_max_entries():
+    c = cache.LruTimeWindowCache(datetime.timedelta(minutes=5), max_entries=2)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.get("a")
+    c.set("c", 3)
+    assert [k for _, k in c._cache.keys()] == ["a", "c"]
+    assert isinstance(c.get("b"), cache.LruTimeWindowCache.NotFound)
+
+
+def test_lru_time_window_cache_max_bytes():
+    c = cache.LruTimeWindowCache(
+        datetime.timedelta(minutes=5), max_bytes=10, size_fn=len
+    )
+    c.set("a", "xxxx")
+    c.set("b", "xxxx")
+    assert c.total_bytes == 8
+    c.get("a")
+    c.set("c", "xxxx")
+    assert [k for _, k in c._cache.keys()] == ["a", "c"]
+    assert c.total_bytes == 8
+
+    # Replacing a value updates the byte count
+    c.set("a", "x")
+    assert c.total_bytes == 5
+
+    # Values larger than the whole budget are not cached
+    c.set("big", "x" * 11)
+    assert isinstance(c.get("big"), cache.LruTimeWindowCache.NotFound)
+    assert len(c) == 2
+    assert c.total_bytes == 5
@@ -228,3 +228,70 @@ def test_compile_through_function_call(user_by_api_key_in_env):
     pick = called_node.pick("val")
     res = weave.use(pick)
     assert res.to_pylist_notags() == list(range(10))
+
+
+@pytest.fixture()
+def compile_plan_cache_enabled(monkeypatch):
+    from .. import compile_plan_cache
+
+    monkeypatch.setenv("WEAVE_COMPILE_PLAN_CACHE_SIZE", "2")
+    monkeypatch.setattr(compile_plan_cache, "_plan_cache", None)
+    yield compile_plan_cache.get_plan_cache()
+
+
+def _js_add_node(lhs, rhs):
+    return graph.OutputNode(
+        types.Number(),
+        "add",
+        {
+            "lhs": graph.ConstNode(types.Number(), lhs),
+            "rhs": graph.ConstNode(types.Number(), rhs),
+        },
+    )
+
+
+def test_compile_plan_cache_reuses_pure_plan(compile_plan_cache_enabled):
+    first = compile.compile([_js_add_node(1, 2)])
+    # A structurally identical graph from a later request gets the same plan.
+    second = compile.compile([_js_add_node(1, 2)])
+    assert second[0] is first[0]
+    assert use(second[0]) == 3
+
+    # Different consts are a different plan.
+    third = compile.compile([_js_add_node(1, 3)])
+    assert third[0] is not first[0]
+    assert use(third[0]) == 4
+
+
+def test_compile_plan_cache_evicts_lru(compile_plan_cache_enabled):
+    plan_cache = compile_plan_cache_enabled
+    a = compile.compile([_js_add_node(1, 1)])[0]
+    compile.compile([_js_add_node(2, 2)])
+    assert compile.compile([_js_add_node(1, 1)])[0] is a
+    compile.compile([_js_add_node(3, 3)])
+    assert len(plan_cache) == 2
+    # (2, 2) was least recently used, (1, 1) is still cached.
+    assert compile.compile([_js_add_node(1, 1)])[0] is a
+
+
+def test_compile_plan_cache_reruns_data_dependent_passes(compile_plan_cache_enabled):
+    from .. import compile_plan_cache
+
+    def json_parse_node():
+        return graph.OutputNode(
+            types.Any(),
+            "string-json_parse",
+            {"self": graph.ConstNode(types.String(), '{"a": 1}')},
+        )
+
+    first = compile.compile([json_parse_node()])
+    # Refine executes data, so only the passes before it are cached.
+    key = compile_plan_cache.plan_key([json_parse_node()])
+    plan = compile_plan_cache_enabled.get(key)
+    assert plan is not None
+    assert 0 < plan.pass_count < len(compile._COMPILE_PASSES)
+
+    second = compile.compile([json_parse_node()])
+    assert second[0] is not first[0]
+    assert second[0].type == first[0].type
+    assert use(second[0]) == {"a": 1}
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from .. import disk_cache
+from .. import environment
+from .. import filesystem
+
+
+def _write(root, rel_path, size, last_used):
+    path = os.path.join(root, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    os.utime(path, (last_used, last_used))
+    return path
+
+
+@pytest.fixture()
+def cache_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(environment, "weave_filesystem_dir", lambda: str(tmp_path))
+    return str(tmp_path)
+
+
+def test_evicts_least_recently_used_across_users(cache_root):
+    old = _write(cache_root, "wandb_file_manager/e/p/a/1.parquet", 100, 1000)
+    user_old = _write(cache_root, "user1/wandb_file_manager/e/p/a/2.json", 100, 1001)
+    newer = _write(cache_root, "user1/wandb_file_manager/e/p/a/3.json", 100, 1002)
+    newest = _write(cache_root, "wandb_file_manager/e/p/a/4.parquet", 100, 1003)
+    other = _write(cache_root, "local-artifacts/x/obj.json", 1000, 0)
+
+    evictor = disk_cache.DiskCacheEvictor(
+        cache_root, max_bytes=250, min_age_sec=60, now_fn=lambda: 2000
+    )
+    before = disk_cache.stats().bytes_evicted
+    # 400 bytes is over budget, evict down to 90% of 250
+    assert evictor.evict() == 200
+    assert disk_cache.stats().bytes_evicted - before == 200
+
+    assert not os.path.exists(old)
+    assert not os.path.exists(user_old)
+    assert os.path.exists(newer)
+    assert os.path.exists(newest)
+    # Only wandb_file_manager dirs are managed
+    assert os.path.exists(other)
+
+    # Under budget now, nothing to do
+    assert evictor.evict() == 0
+
+
+def test_skips_open_and_recently_used_files(cache_root):
+    in_use = _write(cache_root, "wandb_file_manager/a.json", 100, 1000)
+    old = _write(cache_root, "wandb_file_manager/b.json", 100, 1001)
+    recent = _write(cache_root, "wandb_file_manager/c.json", 100, 1990)
+    partial = _write(cache_root, "wandb_file_manager/d.json.tmp-abc", 100, 0)
+
+    evictor = disk_cache.DiskCacheEvictor(
+        cache_root, max_bytes=100, min_age_sec=60, now_fn=lambda: 2000
+    )
+    fs = filesystem.Filesystem()
+    with fs.open_read("wandb_file_manager/a.json"):
+        assert evictor.evict() == 100
+
+    assert os.path.exists(in_use)
+    assert not os.path.exists(old)
+    assert os.path.exists(recent)
+    assert os.path.exists(partial)
@@ -1,5 +1,6 @@
 import typing
 import os
+import threading
 import weave
 from .. import api
 from .. import weave_types as types
@@ -7,6 +8,7 @@ from .. import weave_internal
 from .. import ops
 from .. import execute
 from .. import environment
+from .. import storage
 from . import test_wb
 import pytest
 
@@ -54,6 +56,36 @@ def _test_execute_refining_op(x: int) -> typing.Any:
     return x + 1
 
 
+def test_result_cache_serves_hits_from_memory(monkeypatch):
+    global execute_test_count_op_run_count
+    monkeypatch.setenv("WEAVE_RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+    execute_test_count_op_run_count = 0
+    node = execute_test_count_op(
+        weave_internal.make_const_node(types.List(types.Int()), [1, 2, 3])
+    )
+    assert api.use(node) == 3
+
+    get_run_val_calls = []
+    orig_get_run_val = execute.TRACE_LOCAL.get_run_val
+
+    def get_run_val(run_key):
+        get_run_val_calls.append(run_key)
+        return orig_get_run_val(run_key)
+
+    monkeypatch.setattr(execute.TRACE_LOCAL, "get_run_val", get_run_val)
+    assert api.use(node) == 3
+    assert execute_test_count_op_run_count == 1
+    assert get_run_val_calls == []
+
+    # The run is persisted in the background, and hits from disk without
+    # the memory tier.
+    execute.flush_run_writes()
+    monkeypatch.setenv("WEAVE_RESULT_CACHE_MAX_BYTES", "0")
+    assert api.use(node) == 3
+    assert execute_test_count_op_run_count == 1
+    assert len(get_run_val_calls) == 1
+
+
 @pytest.fixture()
 def weave_cache_mode_minimal():
     orig_cache_mode = environment.cache_mode
@@ -196,3 +228,52 @@ def test_none_not_cached():
     )
     assert len(latest_obj) == 1  # not 2! None not cached!
     assert len(weave.versions(latest_obj)) == 1
+
+
+_test_execute_barrier: typing.Optional[threading.Barrier] = None
+
+
+@weave.op()
+def _test_execute_barrier_op(x: int) -> int:
+    # Only returns once the other branch is running too.
+    assert _test_execute_barrier is not None
+    _test_execute_barrier.wait()
+    return x
+
+
+def test_dependency_scheduler_runs_independent_branches_concurrently(monkeypatch):
+    global _test_execute_barrier
+    monkeypatch.setenv("WEAVE_EXECUTE_SCHEDULER", "dependency")
+    _test_execute_barrier = threading.Barrier(2, timeout=10)
+
+    def barrier_node(x: int) -> weave.graph.Node:
+        return _test_execute_barrier_op(weave_internal.make_const_node(types.Int(), x))
+
+    # Two independent branches feeding one node. If they ran one after the
+    # other, the barrier would time out.
+    node = barrier_node(1) + barrier_node(2)
+    with execute.top_level_stats() as stats:
+        res = api.use([node, node + 1])
+
+    assert res == [3, 4]
+    barrier_op_stats = [
+        op_stats
+        for op_name, op_stats in stats.op_stats.items()
+        if "_test_execute_barrier_op" in op_name
+    ]
+    assert [s["count"] for s in barrier_op_stats] == [2]
+
+
+@weave.op()
+def _test_execute_failing_op(x: int) -> int:
+    raise ValueError("failed")
+
+
+def test_dependency_scheduler_reports_errors(monkeypatch):
+    monkeypatch.setenv("WEAVE_EXECUTE_SCHEDULER", "dependency")
+    good = weave_internal.make_const_node(types.Int(), 1) + 1
+    bad = _test_execute_failing_op(weave_internal.make_const_node(types.Int(), 1))
+    res = execute.execute_nodes([good, bad + 1])
+    items = list(res.iter_items())
+    assert storage.deref(items[0][0]) == 2
+    assert isinstance(items[1][1], ValueError)
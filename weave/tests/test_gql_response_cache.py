@@ -0,0 +1,106 @@
+import datetime
+import threading
+
+from .. import context_state
+from .. import gql_response_cache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = datetime.datetime(2023, 1, 1)
+
+    def __call__(self) -> datetime.datetime:
+        return self.now
+
+
+def _counting_fetch(calls: list, result: dict):
+    def fetch():
+        calls.append(1)
+        return result
+
+    return fetch
+
+
+def test_gql_response_cache_reuses_responses_until_ttl():
+    clock = _Clock()
+    response_cache = gql_response_cache.GqlResponseCache(
+        datetime.timedelta(seconds=5), max_bytes=None, now_fn=clock
+    )
+    calls: list = []
+    fetch = _counting_fetch(calls, {"project": {"id": "1"}})
+
+    first = response_cache.get_or_fetch("query { project { id } }", {}, fetch)
+    second = response_cache.get_or_fetch("query {\n  project { id }\n}", {}, fetch)
+    assert first == second == {"project": {"id": "1"}}
+    assert len(calls) == 1
+
+    # Hits are copies
+    second["project"]["id"] = "2"
+    assert response_cache.get_or_fetch("query { project { id } }", {}, fetch) == {
+        "project": {"id": "1"}
+    }
+
+    response_cache.get_or_fetch("query { project { id } }", {"a": 1}, fetch)
+    assert len(calls) == 2
+
+    clock.now += datetime.timedelta(seconds=6)
+    response_cache.get_or_fetch("query { project { id } }", {}, fetch)
+    assert len(calls) == 3
+
+
+def test_gql_response_cache_keeps_whitespace_in_strings():
+    response_cache = gql_response_cache.GqlResponseCache(
+        datetime.timedelta(seconds=60), max_bytes=None
+    )
+    calls: list = []
+    fetch = _counting_fetch(calls, {"project": None})
+    response_cache.get_or_fetch('query { project(name: "a  b") { id } }', {}, fetch)
+    response_cache.get_or_fetch('query { project(name: "a b") { id } }', {}, fetch)
+    assert len(calls) == 2
+    response_cache.get_or_fetch('query {\n  project(name: "a  b") { id }\n}', {}, fetch)
+    assert len(calls) == 2
+
+
+def test_gql_response_cache_client_cache_key_bypasses():
+    response_cache = gql_response_cache.GqlResponseCache(
+        datetime.timedelta(seconds=60), max_bytes=None
+    )
+    calls: list = []
+    fetch = _counting_fetch(calls, {"viewer": None})
+    response_cache.get_or_fetch("query { viewer { id } }", {}, fetch)
+    with context_state.set_client_cache_key("refresh-1"):
+        response_cache.get_or_fetch("query { viewer { id } }", {}, fetch)
+        response_cache.get_or_fetch("query { viewer { id } }", {}, fetch)
+    assert len(calls) == 2
+
+
+def test_gql_response_cache_single_flight():
+    response_cache = gql_response_cache.GqlResponseCache(
+        datetime.timedelta(seconds=60), max_bytes=None
+    )
+    release = threading.Event()
+    calls: list = []
+
+    def slow_fetch():
+        calls.append(1)
+        release.wait()
+        return {"runs": [1, 2, 3]}
+
+    results: list = []
+
+    def request():
+        results.append(response_cache.get_or_fetch("query { runs }", {}, slow_fetch))
+
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for t in threads:
+        t.start()
+    while not calls:
+        release.wait(0.01)
+    # Give the other requests a chance to join the in-flight query
+    release.wait(0.1)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"runs": [1, 2, 3]}] * 4
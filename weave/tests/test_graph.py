@@ -102,3 +102,25 @@ def test_replace_node():
 
     x = graph.map_nodes_top_level([d], replace_c)[0]
     assert weave.use(x) == 6.75
+
+
+def test_node_digest_is_structural():
+    def make(lhs, var_type=types.Int()):
+        a = weave_internal.make_var_node(var_type, "a")
+        return weave_internal.make_const_node(types.Int(), lhs) + a
+
+    n = make(1)
+    assert n.digest() == make(1).digest()
+    assert n.digest() != make(2).digest()
+    assert n.digest() != make(1, types.Float()).digest()
+    # Consts are typed, so equal python values of different types differ.
+    assert (
+        weave_internal.make_const_node(types.Int(), 1).digest()
+        != weave_internal.make_const_node(types.Boolean(), True).digest()
+    )
+
+
+def test_node_digest_lambda():
+    l = weave.save([1, 2, 3])
+    assert l.map(lambda x: x + 1).digest() == l.map(lambda x: x + 1).digest()
+    assert l.map(lambda x: x + 1).digest() != l.map(lambda x: x + 2).digest()
@@ -0,0 +1,107 @@
+import pyarrow as pa
+from pyarrow import parquet as pq
+
+from ..ops_arrow import ArrowWeaveList
+from ..ops_domain.run_history import history_op_common
+
+
+def test_read_history_parquet_shard_projects_columns(tmp_path):
+    path = str(tmp_path / "0.parquet")
+    table = pa.table(
+        {"_step": [0, 1, 2, 3], "loss": [0.5, 0.4, 0.3, 0.2], "acc": [1] * 4}
+    )
+    pq.write_table(table, path, row_group_size=2)
+
+    shard = history_op_common.read_history_parquet_shard(
+        path, ["_step", "loss", "not_in_file"]
+    )
+    assert shard.column_names == ["_step", "loss"]
+    assert shard["_step"].to_pylist() == [0, 1, 2, 3]
+
+
+def test_order_history_awls_by_first_step():
+    shards = [
+        ArrowWeaveList(pa.array([{"_step": 4}, {"_step": 5}])),
+        ArrowWeaveList(pa.array([], type=pa.struct([("_step", pa.int64())]))),
+        ArrowWeaveList(pa.array([{"_step": 0}, {"_step": 3}])),
+    ]
+    ordered = history_op_common.order_history_awls(shards)
+    assert [len(a) for a in ordered] == [0, 2, 2]
+    assert ordered[1]._arrow_data.field("_step").to_pylist() == [0, 3]
+
+
+def test_sort_history_pa_table():
+    # Already sorted tables are returned as is
+    sorted_table = pa.table({"_step": [0, 1, 2], "x": ["a", "b", "c"]})
+    assert history_op_common.sort_history_pa_table(sorted_table) is sorted_table
+
+    # Overlapping sorted runs get merged, keeping order of equal steps
+    runs = pa.concat_tables(
+        [
+            pa.table({"_step": [0, 2, 4], "x": ["a0", "a2", "a4"]}),
+            pa.table({"_step": [1, 2, 3], "x": ["b1", "b2", "b3"]}),
+        ]
+    )
+    merged = history_op_common.sort_history_pa_table(runs)
+    assert merged["_step"].to_pylist() == [0, 1, 2, 2, 3, 4]
+    assert merged["x"].to_pylist() == ["a0", "b1", "a2", "b2", "b3", "a4"]
+
+    # Null steps aren't sorted, they go last
+    with_null = pa.table({"_step": [1, None, 0], "x": ["a", "b", "c"]})
+    assert history_op_common.sort_history_pa_table(with_null)["x"].to_pylist() == [
+        "c",
+        "a",
+        "b",
+    ]
+
+
+def test_read_history_parquet_shard_skips_row_groups(tmp_path):
+    path = str(tmp_path / "0.parquet")
+    table = pa.table({"_step": list(range(10)), "loss": [float(i) for i in range(10)]})
+    pq.write_table(table, path, row_group_size=2)
+
+    parquet_file = pq.ParquetFile(path)
+    assert history_op_common._row_groups_in_step_range(parquet_file, 3, 6) == [1, 2, 3]
+
+    shard = history_op_common.read_history_parquet_shard(
+        path, ["_step", "loss"], min_step=3, max_step=6
+    )
+    assert shard["_step"].to_pylist() == [3, 4, 5, 6]
+
+
+def test_downsample_history_pa_table():
+    table = pa.table(
+        {
+            "_step": list(range(100)),
+            "loss": [100.0 if i == 37 else 1.0 for i in range(100)],
+            "name": ["x"] * 100,
+        }
+    )
+    nth = history_op_common.downsample_history_pa_table(table, 10, "nth")
+    assert len(nth) == 10
+    assert nth["_step"][0].as_py() == 0
+    assert nth["_step"][-1].as_py() == 99
+
+    minmax = history_op_common.downsample_history_pa_table(table, 10, "minmax")
+    assert len(minmax) <= 10
+    # The spike survives
+    assert 37 in minmax["_step"].to_pylist()
+    assert minmax["_step"].to_pylist() == sorted(minmax["_step"].to_pylist())
+
+    assert history_op_common.downsample_history_pa_table(table, 1000, "nth") is table
+
+
+def test_downsample_history_pa_table_many_columns():
+    # More numeric columns than fit in one min/max bucket
+    table = pa.table(
+        {
+            "_step": list(range(100)),
+            **{
+                f"m{c}": [float((i * (c + 1)) % 17) for i in range(100)]
+                for c in range(8)
+            },
+        }
+    )
+    minmax = history_op_common.downsample_history_pa_table(table, 10, "minmax")
+    assert len(minmax) == 10
+    assert minmax["_step"].to_pylist() == sorted(minmax["_step"].to_pylist())
@@ -1,4 +1,5 @@
 import asyncio
+import time
 import pytest
 from .. import io_service
 from .. import filesystem
@@ -62,3 +63,37 @@ async def test_io_service_sync_client(io_server_factory, process):
         assert result == 0.1
 
     assert len(server.client_response_queues) == 0
+
+
+@pytest.mark.timeout(10)
+@pytest.mark.parametrize("process", [True, False])
+def test_io_service_sync_client_batch_runs_concurrently(io_server_factory, process):
+    server: io_service.Server = io_server_factory(process)
+    client = io_service.SyncClient(server=server, fs=filesystem.get_filesystem())
+
+    start = time.time()
+    results = client.request_batch("sleep", [(0.3,)] * 10)
+    assert results == [0.3] * 10
+    assert time.time() - start < 2
+    assert client.request_batch("sleep", []) == []
+
+
+@pytest.mark.timeout(10)
+def test_io_service_sync_client_batch_item_errors(io_server_factory):
+    server: io_service.Server = io_server_factory(False)
+    fs = filesystem.get_filesystem()
+    client = io_service.SyncClient(server=server, fs=fs)
+
+    # Already on disk, so no network access is needed
+    with fs.open_write("wandb_file_manager/example.com/history/0.parquet") as f:
+        f.write(b"data")
+
+    results = client.ensure_files_downloaded(
+        [
+            "ftp://example.com/history/1.parquet",
+            "https://example.com/history/0.parquet",
+        ]
+    )
+    assert isinstance(results[0], Exception)
+    assert "only supports http/https URIs" in str(results[0])
+    assert results[1] == "wandb_file_manager/example.com/history/0.parquet"
@@ -1,5 +1,11 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+
 import weave
 from weave import ops_arrow
+from weave.ops_arrow import list_join
 from weave.wandb_interface.wandb_stream_table import StreamTable
 
 
@@ -40,3 +46,44 @@ def test_join_awls_with_stitch(user_by_api_key_in_env):
     assert weave.use(joined["feedback.a"]).to_pylist_tagged() == [-3, -5]
     assert weave.use(joined["feedback.bb"]).to_pylist_tagged() == [-4, -6]
     assert weave.use(joined.joinObj()).to_pylist_tagged() == [1, 2]
+
+
+def _arrow_chained_join_indices(codes, join_type):
+    tables = []
+    for i, c in enumerate(codes):
+        key = pa.array(c, mask=c < 0)
+        tables.append(
+            pa.Table.from_arrays(
+                [key, np.arange(len(c))], names=["join", f"index_t{i}"]
+            ).filter(pc.invert(pc.is_null(key)))
+        )
+    joined = tables[0]
+    for other in tables[1:]:
+        joined = joined.join(
+            other, ["join"], join_type=join_type, use_threads=False, coalesce_keys=True
+        )
+    return [
+        joined[f"index_t{i}"].combine_chunks().fill_null(-1).to_numpy()
+        for i in range(len(codes))
+    ]
+
+
+@pytest.mark.parametrize("join_type", ["inner", "full outer"])
+def test_join_indices_match_chained_arrow_joins(join_type):
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        codes = [
+            rng.integers(-1, 8, size=rng.integers(0, 30)).astype(np.int64)
+            for _ in range(rng.integers(1, 5))
+        ]
+        expected = _arrow_chained_join_indices(codes, join_type)
+        result = list_join._join_indices(codes, join_type)
+        assert [r.tolist() for r in result] == [e.tolist() for e in expected]
+
+
+@pytest.mark.parametrize("join_type", ["left outer", "right outer"])
+def test_join2_indices_match_arrow_join(join_type):
+    codes = [np.array([3, 1, 2, 1, -1, 5]), np.array([1, 4, 3, 1, 6, 1])]
+    expected = _arrow_chained_join_indices(codes, join_type)
+    result = list_join._join_indices(codes, join_type)
+    assert [r.tolist() for r in result] == [e.tolist() for e in expected]
@@ -0,0 +1,58 @@
+import base64
+import json
+import zlib
+
+import pytest
+
+from .. import request_capture
+from .. import request_replay
+from .. import serialize
+from .. import weave_internal
+from .. import weave_types as types
+
+
+@pytest.fixture()
+def capture_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "requests.jsonl")
+    monkeypatch.setenv("WEAVE_REQUEST_CAPTURE_SAMPLE_RATE", "1")
+    monkeypatch.setenv("WEAVE_REQUEST_CAPTURE_FILE", path)
+    yield path
+    capture = request_capture._request_capture
+    request_capture._request_capture = None
+    if capture is not None:
+        capture.close()
+
+
+def test_capture_and_replay_execute_requests(app, capture_file):
+    number_node = weave_internal.make_const_node(types.Int(), 5)
+    graphs = serialize.serialize([number_node + 1, number_node * 2])
+
+    client = app.test_client()
+    resp = client.post("/__weave/execute", json={"graphs": graphs})
+    assert resp.json["data"] == [6, 10]
+    request_capture.get_request_capture().flush()
+
+    requests = list(request_replay.iter_captured_requests([capture_file]))
+    assert requests == [{"graphs": graphs}]
+
+    results = list(request_replay.replay(requests, repeat=2))
+    assert [(r.index, r.node_count, r.error_count) for r in results] == [
+        (0, 2, 0),
+        (0, 2, 0),
+    ]
+    assert all(r.exception is None for r in results)
+    assert request_replay.summarize(results).startswith("2 requests, 0 failed.")
+
+
+def test_capture_skips_large_requests(app, capture_file, monkeypatch):
+    monkeypatch.setenv("WEAVE_REQUEST_CAPTURE_MAX_REQUEST_BYTES", "10")
+    assert not request_capture.maybe_capture(b'{"graphs": []}')
+    monkeypatch.setenv("WEAVE_REQUEST_CAPTURE_SAMPLE_RATE", "0")
+    assert not request_capture.maybe_capture(b"{}")
+
+
+def test_parse_legacy_log_line():
+    req = {"graphs": {"nodes": [], "targetNodes": []}}
+    b64 = base64.b64encode(zlib.compress(json.dumps(req).encode())).decode()
+    line = f"[2023-06-01 12:00:00] INFO in weave_server: Execute request (zlib): {b64}"
+    assert request_replay.parse_captured_line(line) == req
@@ -0,0 +1,45 @@
+# Performance test for run key computation. Prints the cost of computing a
+# run key against input size, for the fingerprinted path and the
+# to_python path it replaces.
+import json
+import hashlib
+import time
+
+import pyarrow as pa
+import pytest
+
+from .. import registry_mem
+from .. import storage
+from .. import trace_local
+from ..ops_arrow import list_ as arrow_list
+
+
+def _to_python_value_id(val):
+    hash_val = json.dumps(storage.to_python(val)["_val"])
+    hash = hashlib.md5()
+    hash.update(json.dumps(hash_val).encode())
+    return hash.hexdigest()
+
+
+def _time(fn):
+    start_time = time.time()
+    fn()
+    return time.time() - start_time
+
+
+@pytest.mark.skip(reason="Performance test")
+def test_run_key_perf():
+    op_def = registry_mem.memory_registry.get_op("count")
+    for n in [1000, 10000, 100000, 1000000]:
+        rows = [{"a": i, "b": str(i), "c": float(i)} for i in range(n)]
+        awl = arrow_list.ArrowWeaveList(pa.array(rows))
+        awl_key = _time(lambda: trace_local.make_run_key(op_def, {"arr": awl}))
+        awl_memo_key = _time(lambda: trace_local.make_run_key(op_def, {"arr": awl}))
+        awl_old = _time(lambda: _to_python_value_id(awl))
+        list_key = _time(lambda: trace_local.make_run_key(op_def, {"arr": rows}))
+        list_old = _time(lambda: _to_python_value_id(rows))
+        print(
+            f"n={n} awl: {awl_key:.4f}s (memoized {awl_memo_key:.6f}s, "
+            f"to_python {awl_old:.4f}s) list: {list_key:.4f}s "
+            f"(to_python {list_old:.4f}s)"
+        )
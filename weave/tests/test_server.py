@@ -1,4 +1,5 @@
 import asyncio
+import json
 import numpy as np
 import contextlib
 import pytest
@@ -9,6 +10,7 @@ from .. import ops
 from .. import client as _client
 from .. import server as _server
 from .. import context_state
+from .. import serialize
 import time
 
 import requests
@@ -61,3 +63,28 @@ def test_500_does_raise_jsondecode_error_from_http_server():
         # should not raise json decoder error, but an HTTP error insteard
         with pytest.raises(requests.exceptions.HTTPError):
             weave.use(custom_op_that_should_return_500("abcd"), client=wc)
+
+
+@weave.op()
+def _test_execute_stream_failing_op(x: int) -> int:
+    raise ValueError("failed")
+
+
+def test_execute_stream_response(app):
+    number_node = make_const_node(types.Int(), 5)
+    graphs = serialize.serialize(
+        [number_node + 1, _test_execute_stream_failing_op(number_node)]
+    )
+
+    test_client = app.test_client()
+    resp = test_client.post("/__weave/execute/stream", json={"graphs": graphs})
+    assert resp.mimetype == "application/x-ndjson"
+
+    lines = [json.loads(l) for l in resp.data.decode().splitlines()]
+    by_index = {line["index"]: line for line in lines}
+    assert sorted(by_index) == [0, 1]
+    assert by_index[0]["data"] == [6]
+    assert by_index[0]["errors"] == []
+    assert by_index[1]["data"] == [None]
+    assert len(by_index[1]["errors"]) == 1
+    assert all(line["execution_time"] >= 0 for line in lines)
@@ -0,0 +1,69 @@
+import pyarrow as pa
+
+from .. import box
+from .. import registry_mem
+from .. import storage
+from .. import trace_local
+from .. import value_fingerprint
+from .. import weave_types as types
+from ..language_features.tagging import tag_store
+from ..ops_arrow import list_ as arrow_list
+
+
+def _awl(arr: pa.Array) -> arrow_list.ArrowWeaveList:
+    return arrow_list.ArrowWeaveList(arr)
+
+
+def test_awl_fingerprint_follows_content():
+    a = _awl(pa.array([{"a": 1, "b": "x"}, {"a": 2, "b": "y"}]))
+    same = _awl(pa.array([{"a": 1, "b": "x"}, {"a": 2, "b": "y"}]))
+    different = _awl(pa.array([{"a": 1, "b": "x"}, {"a": 2, "b": "z"}]))
+    assert value_fingerprint.fingerprint(a) == value_fingerprint.fingerprint(same)
+    assert value_fingerprint.fingerprint(a) != value_fingerprint.fingerprint(different)
+
+    # Slices share buffers with the original
+    nums = pa.array([1, 2, 3, 4])
+    assert value_fingerprint.fingerprint(
+        _awl(nums.slice(0, 2))
+    ) != value_fingerprint.fingerprint(_awl(nums.slice(2, 2)))
+
+    # Dictionaries aren't part of Array.buffers()
+    ab = pa.array(["a", "b"]).dictionary_encode()
+    cd = pa.array(["c", "d"]).dictionary_encode()
+    assert value_fingerprint.fingerprint(_awl(ab)) != value_fingerprint.fingerprint(
+        _awl(cd)
+    )
+
+
+def test_fingerprint_refs_and_consts():
+    ref = storage.save([1, 2, 3])
+    assert value_fingerprint.fingerprint(ref) == value_fingerprint.fingerprint(
+        storage.get(ref.uri)._ref
+    )
+    assert value_fingerprint.fingerprint(
+        {"a": [1, 2.5, None]}
+    ) == value_fingerprint.fingerprint({"a": [1, 2.5, None]})
+    assert value_fingerprint.fingerprint([1, 2]) != value_fingerprint.fingerprint(
+        [1, 3]
+    )
+
+    # Tags are part of a value's identity, those go through to_python
+    tagged = box.box(5)
+    tag_store.add_tags(tagged, {"a": 1})
+    assert value_fingerprint.fingerprint(tagged) is None
+    assert trace_local._value_id(tagged) != trace_local._value_id(5)
+
+
+def test_derived_digest():
+    op_def = registry_mem.memory_registry.get_op("ArrowWeaveList-count")
+    ref = storage.save(_awl(pa.array([1, 2, 3])))
+    result = _awl(pa.array([3]))
+    value_fingerprint.set_derived_digest(op_def, {"self": ref}, result)
+    assert result._digest is not None
+
+    # Inputs without a fingerprint at hand don't get one computed
+    untracked = _awl(pa.array([3]))
+    value_fingerprint.set_derived_digest(
+        op_def, {"self": _awl(pa.array([1, 2, 3]))}, untracked
+    )
+    assert untracked._digest is None
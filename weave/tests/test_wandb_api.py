@@ -0,0 +1,80 @@
+import asyncio
+import http.server
+import json
+import threading
+
+import pytest
+
+from .. import wandb_api
+
+
+class _GqlHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.connection_count += 1  # type: ignore
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append(  # type: ignore
+            (json.loads(body), self.headers.get("Authorization"))
+        )
+        payload = json.dumps(
+            {"data": {"serverInfo": {"frontendHost": "localhost"}}}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Set-Cookie", "session=someone-else")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture()
+def fake_gql_server(monkeypatch):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _GqlHandler)
+    server.connection_count = 0  # type: ignore
+    server.requests = []  # type: ignore
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("WANDB_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_sync_queries_reuse_connection(fake_gql_server):
+    api = wandb_api.get_wandb_api_sync()
+    with wandb_api.wandb_api_context(
+        wandb_api.WandbApiContext(None, "key-1", None, None)
+    ):
+        assert api.server_info() == {"serverInfo": {"frontendHost": "localhost"}}
+    with wandb_api.wandb_api_context(
+        wandb_api.WandbApiContext(None, "key-2", None, None)
+    ):
+        api.server_info()
+
+    assert fake_gql_server.connection_count == 1
+    auths = [auth for _, auth in fake_gql_server.requests]
+    assert auths[0] != auths[1]
+    session = wandb_api._sync_sessions[
+        f"{wandb_api.weave_env.wandb_base_url()}/graphql"
+    ]
+    assert len(session.transport.session.cookies) == 0
+
+
+def test_async_queries_reuse_client(fake_gql_server):
+    async def run() -> None:
+        api = await wandb_api.get_wandb_api()
+        await api.server_info()
+        session = await api._get_session()
+        await api.server_info()
+        assert await api._get_session() is session
+
+    asyncio.run(run())
+    assert fake_gql_server.connection_count == 1
+    assert len(fake_gql_server.requests) == 2
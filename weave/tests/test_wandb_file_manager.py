@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from .. import environment
+from .. import filesystem
+from .. import wandb_file_manager
+
+
+class CountingHttp:
+    def __init__(self, fs: filesystem.FilesystemAsync, fail: bool = False) -> None:
+        self.fs = fs
+        self.fail = fail
+        self.calls = 0
+
+    async def download_file(self, url, path, **kwargs):
+        self.calls += 1
+        async with self.fs.open_write(path, mode="wb") as f:
+            await f.write(b"part")
+            await asyncio.sleep(0.1)
+            if self.fail:
+                raise ValueError("connection reset")
+            await f.write(b"-done")
+
+
+@pytest.fixture()
+def tmp_weave_fs(tmp_path, monkeypatch):
+    monkeypatch.setattr(environment, "weave_filesystem_dir", lambda: str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_concurrent_downloads_are_single_flight(tmp_weave_fs):
+    fs = filesystem.FilesystemAsync()
+    http = CountingHttp(fs)
+    fm = wandb_file_manager.WandbFileManagerAsync(fs, http, None)  # type: ignore
+    url = "https://api.wandb.ai/files/history/0.parquet"
+
+    paths = await asyncio.gather(*[fm.ensure_file_downloaded(url) for _ in range(20)])
+
+    assert http.calls == 1
+    assert len(set(paths)) == 1
+    async with fs.open_read(paths[0]) as f:
+        assert await f.read() == b"part-done"
+    assert fm._in_flight == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_download_leaves_no_partial_file(tmp_weave_fs):
+    fs = filesystem.FilesystemAsync()
+    http = CountingHttp(fs, fail=True)
+    fm = wandb_file_manager.WandbFileManagerAsync(fs, http, None)  # type: ignore
+    url = "https://api.wandb.ai/files/history/0.parquet"
+
+    results = await asyncio.gather(
+        *[fm.ensure_file_downloaded(url) for _ in range(5)], return_exceptions=True
+    )
+
+    assert http.calls == 1
+    assert all(isinstance(r, ValueError) for r in results)
+    assert [p for p in tmp_weave_fs.rglob("*") if p.is_file()] == []
+
+    # A later request retries the download
+    http.fail = False
+    path = await fm.ensure_file_downloaded(url)
+    assert http.calls == 2
+    assert await fs.exists(path)
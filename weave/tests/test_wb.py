@@ -1857,3 +1857,41 @@ def test_non_const_input_node(fake_wandb):
     assert weave.use(cell_node.indexCheckpoint()) == 5
     assert weave.use(cell_node.run().name()) == "amber-glade-100"
     assert weave.use(cell_node.project().name()) == "mendeleev"
+
+
+def _compiled_op_names(node):
+    compiled = compile.compile([node])
+    op_names = set()
+    graph.map_nodes_full(
+        compiled,
+        lambda n: op_names.add(n.from_op.name)
+        if isinstance(n, graph.OutputNode)
+        else None,
+    )
+    return op_names
+
+
+def test_run_history3_step_pushdown(fake_wandb):
+    fake_wandb.fake_api.add_mock(run_history_mocker)
+    node = ops.project("stacey", "mendeleev").runs()[0].history3()
+    filtered = node.filter(
+        lambda row: ops.Boolean.bool_and(row["_step"] >= 3, row["_step"] < 7)
+    )
+
+    assert "run-history3_pushdown" in _compiled_op_names(filtered["epoch"])
+    assert weave.use(filtered["_step"]).to_pylist_notags() == [3, 4, 5, 6]
+    assert weave.use(filtered["epoch"]).to_pylist_notags() == [None, 2, None, 3]
+
+
+def test_run_history3_sampled(fake_wandb):
+    fake_wandb.fake_api.add_mock(run_history_mocker)
+    run = ops.project("stacey", "mendeleev").runs()[0]
+
+    sampled = run.history3_sampled(4, "nth")
+    assert "run-history3_pushdown" in _compiled_op_names(sampled["_step"])
+    assert weave.use(sampled["_step"]).to_pylist_notags() == [0, 3, 6, 9]
+
+    # Filters apply to the sampled rows, the step range isn't pushed into
+    # the sampling
+    sampled = run.history3_sampled(3, "nth").filter(lambda row: row["_step"] >= 4)
+    assert weave.use(sampled["_step"]).to_pylist_notags() == [4, 9]
@@ -1,7 +1,11 @@
+import datetime
 import time
 import pytest
 import weave
 from weave import weave_types
+from weave import environment
+from weave import storage
+from weave.wandb_interface import wandb_stream_table
 from weave.wandb_interface.wandb_stream_table import StreamTable
 import numpy as np
 from PIL import Image
@@ -212,3 +216,87 @@ def test_stream_templates(user_by_api_key_in_env):
 
     a = weave.use(st.rows().get_board_templates_for_node())
     assert len(a) > 0
+
+
+class _StandInFilePusher:
+    def __init__(self):
+        self.files = {}
+
+    def file_changed(self, save_name, path):
+        self.files[str(save_name)] = path
+
+
+class _StandInLiteRun:
+    def __init__(self, entity_name, project_name, run_name, **kwargs):
+        self._entity_name = entity_name
+        self._project_name = project_name
+        self._run_name = run_name
+        self.pusher = _StandInFilePusher()
+        self.batches = []
+
+    def ensure_run(self):
+        pass
+
+    def log_rows(self, rows):
+        self.batches.append(list(rows))
+
+    def finish(self):
+        pass
+
+
+@pytest.fixture()
+def stand_in_stream_table(monkeypatch):
+    monkeypatch.setattr(wandb_stream_table, "InMemoryLazyLiteRun", _StandInLiteRun)
+    monkeypatch.setattr(storage, "_direct_publish", lambda *args, **kwargs: None)
+
+    def make(**kwargs):
+        return StreamTable("entity/project/table", **kwargs)
+
+    return make
+
+
+def _logged_rows(st):
+    return [row for batch in st._lite_run.batches for row in batch]
+
+
+def test_stream_table_batches_rows(stand_in_stream_table):
+    st = stand_in_stream_table()
+    ts = datetime.datetime(2023, 1, 2)
+    st.log([{"index": i, "nested": {"at": ts}} for i in range(5)])
+    st.log({"index": 5, "nested": {"at": ts}})
+    st.finish()
+
+    assert len(st._lite_run.batches) == 1
+    rows = _logged_rows(st)
+    assert [row["index"] for row in rows] == list(range(6))
+    assert rows[0]["nested"]["at"] == wandb_stream_table.leaf_to_weave(ts, None)
+    assert rows[0]["_client_id"] == st._client_id
+    assert st.queue_stats() == wandb_stream_table.RowQueueStats(0, 0)
+
+
+def test_stream_table_overflow_policies(stand_in_stream_table):
+    Policy = environment.StreamTableOverflowPolicy
+
+    # Holding the lock stalls the writer thread
+    st = stand_in_stream_table(max_queue_rows=4, overflow_policy=Policy.DROP_OLDEST)
+    with st._lock:
+        st.log([{"index": i} for i in range(10)])
+        assert st.queue_stats() == wandb_stream_table.RowQueueStats(4, 6)
+    st.finish()
+    assert [row["index"] for row in _logged_rows(st)] == [6, 7, 8, 9]
+
+    st = stand_in_stream_table(max_queue_rows=10, overflow_policy=Policy.SAMPLE)
+    with st._lock:
+        st.log([{"index": i} for i in range(100)])
+        stats = st.queue_stats()
+    st.finish()
+    indexes = [row["index"] for row in _logged_rows(st)]
+    assert stats.queued_rows == len(indexes) <= 10
+    assert stats.dropped_rows == 100 - len(indexes)
+    assert indexes[:5] == [0, 1, 2, 3, 4]
+
+    st = stand_in_stream_table(max_queue_rows=4, overflow_policy=Policy.BLOCK)
+    st.log([{"index": i} for i in range(20)])
+    st.finish()
+    assert [row["index"] for row in _logged_rows(st)] == list(range(20))
+    assert st.queue_stats().dropped_rows == 0
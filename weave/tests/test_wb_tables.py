@@ -4,6 +4,7 @@ import weave
 from weave.language_features.tagging import make_tag_getter_op
 from weave.language_features.tagging.tagged_value_type import TaggedValueType
 from weave.ops_domain import wbmedia
+from weave.ops_domain import table as table_ops
 from weave.ops_domain.wandb_domain_gql import _make_alias
 import numpy as np
 from weave.ops_arrow.list_ops import filter
@@ -266,6 +267,31 @@ def test_empty_table(fake_wandb):
     assert res.to_pylist_raw() == []
 
 
+def test_table_loads_from_converted_table_cache(fake_wandb):
+    table = wandb.Table(
+        columns=["id", "label", "score", "image"],
+        data=[
+            [1, "cat", 0.5, _quick_image(1)],
+            [2, None, None, _quick_image(2)],
+            [3, "dog", 2, None],
+        ],
+    )
+    art = wandb.Artifact("test_name", "test_type")
+    art.add(table, "table")
+    art_node = fake_wandb.mock_artifact_as_node(art)
+    file = weave.use(art_node.file("table.table.json"))
+
+    res = table_ops._get_table_like_awl_from_file(file)
+    assert res.data is not None
+    assert res.awl.to_pylist_raw()[2]["score"] == 2.0
+
+    # The second load doesn't decode the json file at all
+    cached = table_ops._get_table_like_awl_from_file(file)
+    assert cached.data is None
+    assert cached.awl.object_type == res.awl.object_type
+    assert cached.awl.to_pylist_raw() == res.awl.to_pylist_raw()
+
+
 def test_join_group_combo(fake_wandb):
     table_1 = wandb.Table(
         columns=["id", "label", "score"],
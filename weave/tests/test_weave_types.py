@@ -724,3 +724,44 @@ def test_union_auto_execute():
     assert weave.types.optional(weave.types.Timestamp()).assign_type(
         weave.types.Function(output_type=weave.types.optional(weave.types.Timestamp()))
     )
+
+
+def test_type_caches():
+    assert types.Int() is types.Int()
+    assert types.List() is not types.List()
+
+    d = types.TypedDict(
+        {"a": types.optional(types.Int()), "b": types.List(types.String())}
+    ).to_dict()
+    with types.type_cache_stats() as stats:
+        t1 = types.TypeRegistry.type_from_dict(d)
+        t2 = types.TypeRegistry.type_from_dict(d)
+        assert t1 is t2
+        assert t1.assign_type(t2)
+        assert t1.assign_type(t2)
+        assert not types.List(types.Int()).assign_type(t2)
+    assert stats.type_from_dict_hits == 1
+    assert stats.type_from_dict_misses <= 1
+    assert stats.assign_type_hits >= 1
+
+    # Same JSON with a different key order is a different type
+    reordered = types.TypeRegistry.type_from_dict(
+        {**d, "propertyTypes": dict(reversed(d["propertyTypes"].items()))}
+    )
+    assert list(reordered.property_types) == ["b", "a"]
+
+
+def test_sampled_type_of(monkeypatch):
+    objs = [{"a": i} for i in range(100)] + [{"a": "x"}] + [{"a": 1}] * 99
+    full_type = types.TypeRegistry.type_of(objs)
+    monkeypatch.setenv("WEAVE_TYPE_OF_SAMPLE_ROWS", "10")
+    with types.type_cache_stats() as stats:
+        assert types.TypeRegistry.type_of([{"a": i} for i in range(100)]) == types.List(
+            types.TypedDict({"a": types.Int()})
+        )
+        # Sampling can miss items with another type
+        assert types.TypeRegistry.type_of(objs) != full_type
+        # A sample that doesn't agree falls back to checking every item
+        objs[-1] = {"a": "y"}
+        assert types.TypeRegistry.type_of(objs) == full_type
+    assert stats.sampled_type_of == 2
@@ -1,7 +1,15 @@
+import datetime
+import json
+import math
 import os
 
+import pyarrow as pa
+
 from .. import weave_types as types
 from .. import weavejs_fixes
+from .. import weavejs_arrow
+from .. import ops_arrow
+from .. import serialize
 
 from .. import ops
 from .. import api
@@ -61,3 +69,72 @@ def test_strip_union_encoding_from_weavejs_response(weave_test_client):
     serialized2 = weave_test_client.execute([node])[0]
 
     assert serialized2 == obj
+
+
+def test_fixup_arrow_data():
+    arr = pa.array(
+        [
+            {"a": 1.5, "t": datetime.datetime(2020, 1, 1), "l": [1.0, math.nan]},
+            None,
+            {"a": math.inf, "t": None, "l": None},
+        ],
+        type=pa.struct(
+            [
+                ("a", pa.float64()),
+                ("t", pa.timestamp("ms", tz="UTC")),
+                ("l", pa.list_(pa.float64())),
+            ]
+        ),
+    )
+    assert weavejs_fixes.fixup_arrow_data(arr).to_pylist() == [
+        {"a": 1.5, "t": 1577836800000, "l": [1.0, 0.0]},
+        None,
+        {"a": 0.0, "t": None, "l": None},
+    ]
+    assert weavejs_fixes.fixup_arrow_data(arr.slice(2)).to_pylist() == [
+        {"a": 0.0, "t": None, "l": None}
+    ]
+
+
+def _parse_multipart_response(
+    body: bytes, boundary: str
+) -> tuple[bytes, list[pa.Table]]:
+    # Splits a response made by weavejs_arrow.multipart_response_chunks.
+    delimiter = f"--{boundary}".encode()
+    parts = body.split(b"\r\n" + delimiter)
+    # The first part starts with the delimiter itself
+    parts[0] = parts[0][len(delimiter) :]
+    payloads = []
+    for part in parts:
+        if part.startswith(b"--"):
+            break
+        _, payload = part.split(b"\r\n\r\n", 1)
+        payloads.append(payload)
+    tables = [pa.ipc.open_stream(p).read_all() for p in payloads[1:]]
+    return payloads[0], tables
+
+
+def test_execute_arrow_response(app):
+    rows = [{"a": 1, "b": "x", "c": math.nan}, {"a": 2, "b": None, "c": 2.5}]
+    awl_node = api.save(ops_arrow.to_arrow(rows))
+    number_node = weave_internal.make_const_node(types.Number(), 5)
+    graphs = serialize.serialize([awl_node, number_node])
+
+    client = app.test_client()
+    json_resp = client.post("/__weave/execute", json={"graphs": graphs})
+    arrow_resp = client.post(
+        "/__weave/execute",
+        json={"graphs": graphs},
+        headers={"Accept": weavejs_arrow.ARROW_STREAM_MIMETYPE},
+    )
+    assert arrow_resp.mimetype == "multipart/mixed"
+
+    json_payload, tables = _parse_multipart_response(
+        arrow_resp.data, arrow_resp.mimetype_params["boundary"]
+    )
+    payload = json.loads(json_payload)
+    assert payload["arrow_parts"] == [0]
+    assert payload["data"] == [None, 5]
+    assert len(tables) == 1
+    assert tables[0]["value"].to_pylist() == json_resp.json["data"][0]
+
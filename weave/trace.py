@@ -17,6 +17,10 @@ def get_obj_creator(ref: ref_base.Ref) -> typing.Optional[runs.Run]:
     # backend = ref.backend.filter(type="Run", referenced=ref.artifact)
     # Extremely inefficient!
     # TODO
+    from . import execute
+
+    # Runs are written in the background, make sure they're all on disk.
+    execute.flush_run_writes()
     for art_name in os.listdir(artifact_local.local_artifact_dir()):
         if (
             art_name.startswith("run-")
@@ -14,6 +14,7 @@ from . import graph
 from . import artifact_local
 from . import weave_internal
 from . import op_policy
+from . import value_fingerprint
 
 
 @dataclasses.dataclass
@@ -28,6 +29,9 @@ def _value_id(val):
     # The list's object_type can change as items are appended to it.
     # We don't know the specific type of each item within the list without
     # further refinement.
+    fingerprint = value_fingerprint.fingerprint(val)
+    if fingerprint is not None:
+        return fingerprint
     hash_val = json.dumps(storage.to_python(val)["_val"])
     hash = hashlib.md5()
     hash.update(json.dumps(hash_val).encode())
@@ -0,0 +1,218 @@
+# Cheap fingerprints of op inputs, for run keys.
+#
+# trace_local._value_id hashes an input by serializing it with
+# storage.to_python. For a large ArrowWeaveList that means writing it to an
+# artifact, and for a big python list walking it through the mappers, so
+# computing a run key could cost as much as running the op.
+#
+# fingerprint() handles the common inputs without serializing them:
+# - refs to saved artifacts: their stable uri, which is what to_python
+#   produces for them anyway.
+# - ArrowWeaveLists: a digest carried on the list. Lists returned by pure ops
+#   get one derived from the op and its inputs' fingerprints (see
+#   set_derived_digest). Otherwise it's computed once from the arrow
+#   buffers.
+# - plain python values (consts): hashed from their json.
+#
+# It returns None for anything else, and for tagged values, whose tags are
+# part of their serialized form. Callers fall back to to_python for those.
+
+import hashlib
+import json
+import typing
+
+import pyarrow as pa
+
+from . import artifact_fs
+from . import graph
+from . import op_def as op_def_module
+from .language_features.tagging import tag_store
+
+if typing.TYPE_CHECKING:
+    from .ops_arrow import list_ as arrow_list
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+def _new_hash() -> typing.Any:
+    # Fingerprints only need to be stable, not secure. Processes without
+    # xxhash compute different keys, which only costs cache misses.
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def _hash_str(kind: str, s: str) -> str:
+    hash = _new_hash()
+    hash.update(kind.encode())
+    hash.update(b"\0")
+    hash.update(s.encode())
+    return hash.hexdigest()
+
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+# Tagging a scalar boxes it, so values of exactly these types have no tags.
+_UNBOXED_SCALAR_TYPES = frozenset(_SCALAR_TYPES)
+
+
+def _is_plain(val: typing.Any) -> bool:
+    is_tagged = tag_store.is_tagged_checker()
+    scalar_types = _UNBOXED_SCALAR_TYPES
+    stack = [val]
+    while stack:
+        v = stack.pop()
+        if is_tagged(v):
+            return False
+        if isinstance(v, dict):
+            for k, item in v.items():
+                if type(k) is not str:
+                    return False
+                if type(item) not in scalar_types:
+                    stack.append(item)
+        elif isinstance(v, list):
+            for item in v:
+                if type(item) not in scalar_types:
+                    stack.append(item)
+        elif not isinstance(v, _SCALAR_TYPES):
+            return False
+    return True
+
+
+def _child_arrays(arr: pa.Array) -> typing.Optional[list[pa.Array]]:
+    if isinstance(arr, pa.DictionaryArray):
+        return [arr.dictionary]
+    if isinstance(arr, pa.ExtensionArray):
+        return [arr.storage]
+    if isinstance(arr, (pa.ListArray, pa.LargeListArray, pa.FixedSizeListArray)):
+        return [arr.values]
+    if isinstance(arr, (pa.StructArray, pa.UnionArray)):
+        return [arr.field(i) for i in range(arr.type.num_fields)]
+    if arr.type.num_fields == 0:
+        return []
+    return None
+
+
+def _update_with_array(hash: typing.Any, arr: pa.Array) -> bool:
+    stack = [arr]
+    while stack:
+        a = stack.pop()
+        children = _child_arrays(a)
+        if children is None:
+            return False
+        hash.update(f"{a.type}|{a.offset}|{len(a)}|".encode())
+        # buffers() includes the children's buffers, but not dictionaries,
+        # so only take the array's own and walk the children ourselves.
+        own_buffers = a.buffers()[: a.type.num_buffers]
+        if isinstance(a, pa.ExtensionArray):
+            own_buffers = []
+        for buf in own_buffers:
+            if buf is None:
+                hash.update(b"-")
+            else:
+                hash.update(f"{buf.size}:".encode())
+                hash.update(buf)
+        stack.extend(reversed(children))
+    return True
+
+
+def _arrow_digest(awl: "arrow_list.ArrowWeaveList") -> typing.Optional[str]:
+    hash = _new_hash()
+    hash.update(b"awl\0")
+    hash.update(json.dumps(awl.object_type.to_dict()).encode())
+    if not _update_with_array(hash, awl._arrow_data):
+        return None
+    return hash.hexdigest()
+
+
+def _awl_fingerprint(awl: "arrow_list.ArrowWeaveList") -> typing.Optional[str]:
+    if awl._digest is None:
+        awl._digest = _arrow_digest(awl)
+    return awl._digest
+
+
+def _is_awl(val: typing.Any) -> bool:
+    from .ops_arrow import list_ as arrow_list
+
+    return isinstance(val, arrow_list.ArrowWeaveList)
+
+
+def _ref_fingerprint(val: typing.Any) -> typing.Optional[str]:
+    if isinstance(val, artifact_fs.FilesystemArtifactRef) and val.is_saved:
+        return _hash_str("ref", val.uri)
+    return None
+
+
+def fingerprint(val: typing.Any) -> typing.Optional[str]:
+    """A fingerprint of val's content, if one is cheap to get."""
+    if isinstance(val, graph.Node):
+        return val.digest()
+    if tag_store.is_tagged(val):
+        return None
+    ref_fingerprint = _ref_fingerprint(val)
+    if ref_fingerprint is not None:
+        return ref_fingerprint
+    if _is_awl(val):
+        return _awl_fingerprint(val)
+    if _is_plain(val):
+        return _hash_str("json", json.dumps(val))
+    return None
+
+
+def _known_fingerprint(val: typing.Any) -> typing.Optional[str]:
+    # Like fingerprint(), but never does work proportional to val's size.
+    if isinstance(val, graph.Node):
+        return val.digest()
+    if tag_store.is_tagged(val):
+        return None
+    if _is_awl(val):
+        return val._digest
+    if isinstance(val, _SCALAR_TYPES):
+        return _hash_str("json", json.dumps(val))
+    return _ref_fingerprint(val)
+
+
+def set_derived_digest(
+    op_def: op_def_module.OpDef,
+    inputs: typing.Mapping[str, typing.Any],
+    result: typing.Any,
+) -> None:
+    """Give a pure op's ArrowWeaveList result a digest derived from its inputs.
+
+    Downstream run keys then don't need to hash the list's buffers.
+    """
+    if not op_def.pure or not _is_awl(result) or result._digest is not None:
+        return
+    input_fingerprints = {}
+    for name, val in inputs.items():
+        input_fingerprint = _known_fingerprint(val)
+        if input_fingerprint is None:
+            return
+        input_fingerprints[name] = input_fingerprint
+    result._digest = _hash_str(
+        "derived",
+        json.dumps(
+            {
+                "op_name": op_def.name,
+                "op_version": op_def.version,
+                "inputs": input_fingerprints,
+            }
+        ),
+    )
+
+
+def set_projection_digest(
+    ref: typing.Any, columns: typing.List[str], result: typing.Any
+) -> None:
+    """Give an ArrowWeaveList loaded from some of ref's columns a digest of both.
+
+    A plain get is fingerprinted by its ref, this keeps projected gets as cheap.
+    """
+    ref_fingerprint = _ref_fingerprint(ref)
+    if ref_fingerprint is None or not _is_awl(result):
+        return
+    result._digest = _hash_str(
+        "projection", json.dumps({"ref": ref_fingerprint, "columns": columns})
+    )
@@ -6,11 +6,17 @@ import typing
 import graphql
 import gql
 import aiohttp
+import asyncio
 import contextlib
 import contextvars
+import http.cookiejar
+import threading
+import time
 
+from gql.client import AsyncClientSession, SyncClientSession
 from gql.transport.aiohttp import AIOHTTPTransport
 from gql.transport.requests import RequestsHTTPTransport
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 
 from . import engine_trace
@@ -22,6 +28,7 @@ from . import errors
 from .context_state import WandbApiContext, _wandb_api_context
 
 tracer = engine_trace.tracer()  # type: ignore
+statsd = engine_trace.statsd()  # type: ignore
 
 
 def set_wandb_api_context(
@@ -91,42 +98,133 @@ def from_environment() -> typing.Generator[None, None, None]:
             reset_wandb_api_context(token)
 
 
+def _context_credentials() -> typing.Tuple[
+    typing.Optional[dict], typing.Optional[dict], typing.Optional[str]
+]:
+    wandb_context = get_wandb_api_context()
+    if wandb_context is None:
+        return None, None, None
+    return wandb_context.headers, wandb_context.cookies, wandb_context.api_key
+
+
+def _record_query_latency(start_time: float, mode: str) -> None:
+    statsd.histogram(
+        "weave.wandb_api.gql_query.latency_ms",
+        (time.time() - start_time) * 1000,
+        tags=[f"mode:{mode}"],
+    )
+
+
+class _SharedHTTPAdapter(HTTPAdapter):
+    # Mounted on sessions we don't own (see wandb_client_api.py). Those may
+    # be closed, which must not close the shared pool.
+    def close(self) -> None:
+        pass
+
+
+_http_adapter: typing.Optional[_SharedHTTPAdapter] = None
+_sync_sessions: dict[str, SyncClientSession] = {}
+_sync_lock = threading.Lock()
+
+
+def shared_http_adapter() -> HTTPAdapter:
+    """A keep-alive connection pool shared by all synchronous W&B API requests."""
+    global _http_adapter
+    with _sync_lock:
+        if _http_adapter is None:
+            pool_size = weave_env.wandb_gql_pool_size()
+            _http_adapter = _SharedHTTPAdapter(
+                pool_connections=pool_size, pool_maxsize=pool_size
+            )
+    return _http_adapter
+
+
+def _get_sync_session() -> SyncClientSession:
+    url = weave_env.wandb_base_url() + "/graphql"
+    adapter = shared_http_adapter()
+    with _sync_lock:
+        session = _sync_sessions.get(url)
+        if session is None:
+            # Credentials are passed per request, the transport itself has none.
+            transport = RequestsHTTPTransport(url=url)
+            client = gql.Client(transport=transport, fetch_schema_from_transport=False)
+            session = client.connect_sync()  # type: ignore
+            http_session = transport.session
+            http_session.mount("http://", adapter)
+            http_session.mount("https://", adapter)
+            # Never keep cookies the server sets, they belong to one user.
+            http_session.cookies.set_policy(
+                http.cookiejar.DefaultCookiePolicy(allowed_domains=[])
+            )
+            _sync_sessions[url] = session
+    return session
+
+
+def _record_pool_stats() -> None:
+    if _http_adapter is None:
+        return
+    pools = _http_adapter.poolmanager.pools
+    connections = 0
+    idle = 0
+    for key in pools.keys():
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        connections += pool.num_connections
+        idle += pool.pool.qsize() if pool.pool is not None else 0
+    statsd.gauge("weave.wandb_api.http_pool.connections_opened", connections)
+    statsd.gauge("weave.wandb_api.http_pool.idle", idle)
+
+
 class WandbApiAsync:
     def __init__(self) -> None:
-        self.connector = aiohttp.TCPConnector(limit=50)
+        self.connector = aiohttp.TCPConnector(limit=weave_env.wandb_gql_pool_size())
+        self._sessions: dict[str, AsyncClientSession] = {}
+        self._sessions_lock = asyncio.Lock()
+
+    async def _get_session(self) -> AsyncClientSession:
+        url = weave_env.wandb_base_url() + "/graphql"
+        async with self._sessions_lock:
+            session = self._sessions.get(url)
+            if session is None:
+                transport = AIOHTTPTransport(
+                    url=url,
+                    client_session_args={
+                        "connector": self.connector,
+                        "connector_owner": False,
+                        # Credentials are per request, never keep cookies
+                        # the server sets.
+                        "cookie_jar": aiohttp.DummyCookieJar(),
+                    },
+                )
+                # Warning: we do not use the recommended context manager pattern, because we're
+                # using connector_owner to tell the session not to close our connection pool.
+                # There is a bug in aiohttp that causes session close to hang for the ssl_close_timeout
+                # which is 10 seconds by default. See issue: https://github.com/graphql-python/gql/issues/381
+                # Closing the session just closes the connector, which we don't want anyway, so we don't
+                # bother.
+                client = gql.Client(
+                    transport=transport, fetch_schema_from_transport=False
+                )
+                session = await client.connect_async(reconnecting=False)  # type: ignore
+                self._sessions[url] = session
+        return session
 
     async def query(
         self, query: graphql.DocumentNode, **kwargs: typing.Any
     ) -> typing.Any:
-        wandb_context = get_wandb_api_context()
-        headers = None
-        cookies = None
-        auth = None
-        if wandb_context is not None:
-            headers = wandb_context.headers
-            cookies = wandb_context.cookies
-            if wandb_context.api_key is not None:
-                auth = aiohttp.BasicAuth("api", wandb_context.api_key)
-        url_base = weave_env.wandb_base_url()
-        transport = AIOHTTPTransport(
-            url=url_base + "/graphql",
-            client_session_args={
-                "connector": self.connector,
-                "connector_owner": False,
-            },
-            headers=headers,
-            cookies=cookies,
-            auth=auth,
-        )
-        # Warning: we do not use the recommended context manager pattern, because we're
-        # using connector_owner to tell the session not to close our connection pool.
-        # There is a bug in aiohttp that causes session close to hang for the ssl_close_timeout
-        # which is 10 seconds by default. See issue: https://github.com/graphql-python/gql/issues/381
-        # Closing the session just closes the connector, which we don't want anyway, so we don't
-        # bother.
-        client = gql.Client(transport=transport, fetch_schema_from_transport=False)
-        session = await client.connect_async(reconnecting=False)  # type: ignore
-        return await session.execute(query, kwargs)
+        headers, cookies, api_key = _context_credentials()
+        auth = None if api_key is None else aiohttp.BasicAuth("api", api_key)
+        session = await self._get_session()
+        start_time = time.time()
+        try:
+            return await session.execute(
+                query,
+                kwargs,
+                extra_args={"headers": headers, "cookies": cookies, "auth": auth},
+            )
+        finally:
+            _record_query_latency(start_time, "async")
 
     SERVER_INFO_QUERY = gql.gql(
         """
@@ -191,28 +289,19 @@ class WandbApiAsync:
 
 class WandbApi:
     def query(self, query: graphql.DocumentNode, **kwargs: typing.Any) -> typing.Any:
-        wandb_context = get_wandb_api_context()
-        headers = None
-        cookies = None
-        auth = None
-        if wandb_context is not None:
-            headers = wandb_context.headers
-            cookies = wandb_context.cookies
-            if wandb_context.api_key is not None:
-                auth = HTTPBasicAuth("api", wandb_context.api_key)
-        url_base = weave_env.wandb_base_url()
-        transport = RequestsHTTPTransport(
-            url=url_base + "/graphql", headers=headers, cookies=cookies, auth=auth
-        )
-        # Warning: we do not use the recommended context manager pattern, because we're
-        # using connector_owner to tell the session not to close our connection pool.
-        # There is a bug in aiohttp that causes session close to hang for the ssl_close_timeout
-        # which is 10 seconds by default. See issue: https://github.com/graphql-python/gql/issues/381
-        # Closing the session just closes the connector, which we don't want anyway, so we don't
-        # bother.
-        client = gql.Client(transport=transport, fetch_schema_from_transport=False)
-        session = client.connect_sync()  # type: ignore
-        return session.execute(query, kwargs)
+        headers, cookies, api_key = _context_credentials()
+        auth = None if api_key is None else HTTPBasicAuth("api", api_key)
+        session = _get_sync_session()
+        start_time = time.time()
+        try:
+            return session.execute(
+                query,
+                kwargs,
+                extra_args={"headers": headers, "cookies": cookies, "auth": auth},
+            )
+        finally:
+            _record_query_latency(start_time, "sync")
+            _record_pool_stats()
 
     SERVER_INFO_QUERY = gql.gql(
         """
@@ -15,7 +15,17 @@ from requests import exceptions
 
 
 def wandb_public_api() -> public.Api:
-    return public.Api(timeout=30)
+    api = public.Api(timeout=30)
+    # Every Api gets a new requests session. Share the W&B API connection
+    # pool across them, so queries don't each pay for connection setup.
+    from . import wandb_api
+
+    http_session = getattr(api._base_client.transport, "session", None)
+    if http_session is not None:
+        adapter = wandb_api.shared_http_adapter()
+        http_session.mount("http://", adapter)
+        http_session.mount("https://", adapter)
+    return api
 
 
 def assert_wandb_authenticated() -> None:
@@ -2,6 +2,7 @@
 # as the core of a fast artifact downloader, or a safe multiplexed
 # file manager in the Weave server.
 
+import asyncio
 import datetime
 import json
 import typing
@@ -19,11 +20,15 @@ from . import weave_http
 from . import wandb_api
 from . import environment as weave_env
 from . import cache
+from . import disk_cache
 
 
 from urllib import parse
 
 tracer = engine_trace.tracer()  # type: ignore
+statsd = engine_trace.statsd()  # type: ignore
+
+SingleFlightResultType = typing.TypeVar("SingleFlightResultType")
 
 
 def _file_path(uri: artifact_wandb.WeaveWBArtifactURI, md5_hex: str) -> str:
@@ -70,6 +75,33 @@ def _local_path_and_download_url(
         )
 
 
+# Rough per-entry cost of a parsed manifest entry: the entry dict plus its
+# digest/size/birthArtifactID values. Only needs to be in the right ballpark
+# for the cache byte budget, and must be cheap for manifests with 1M+ entries.
+_MANIFEST_ENTRY_OVERHEAD_BYTES = 600
+
+
+def _manifest_size(
+    manifest: typing.Optional[artifact_wandb.WandbArtifactManifest],
+) -> int:
+    if manifest is None:
+        return 0
+    contents = manifest._manifest_json.get("contents", {})
+    return sum(_MANIFEST_ENTRY_OVERHEAD_BYTES + len(path) for path in contents.keys())
+
+
+def _manifest_cache() -> cache.LruTimeWindowCache[
+    str, typing.Optional[artifact_wandb.WandbArtifactManifest]
+]:
+    return cache.LruTimeWindowCache(
+        datetime.timedelta(minutes=5),
+        max_entries=weave_env.manifest_cache_max_entries(),
+        max_bytes=weave_env.manifest_cache_max_bytes(),
+        size_fn=_manifest_size,
+        name="manifest",
+    )
+
+
 class WandbFileManagerAsync:
     def __init__(
         self,
@@ -82,7 +114,71 @@ class WandbFileManagerAsync:
         self.wandb_api = wandb_api
         self._manifests: cache.LruTimeWindowCache[
             str, typing.Optional[artifact_wandb.WandbArtifactManifest]
-        ] = cache.LruTimeWindowCache(datetime.timedelta(minutes=5))
+        ] = _manifest_cache()
+        # Downloads in progress, keyed by absolute target path. Concurrent
+        # requests for the same file await the same download instead of
+        # racing to fetch it again.
+        self._in_flight: dict[str, asyncio.Future[typing.Any]] = {}
+
+    async def _single_flight(
+        self,
+        path: str,
+        fn: typing.Callable[[], typing.Awaitable[SingleFlightResultType]],
+    ) -> SingleFlightResultType:
+        # fs.path is user scoped, so different users never share a download.
+        key = self.fs.path(path)
+        fut = self._in_flight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(fn())
+            self._in_flight[key] = fut
+
+            def _done(f: asyncio.Future[typing.Any]) -> None:
+                if self._in_flight.get(key) is f:
+                    del self._in_flight[key]
+
+            fut.add_done_callback(_done)
+        else:
+            statsd.increment("weave.wandb_file_manager.single_flight_join")
+        # Shield so that one cancelled waiter doesn't cancel the download
+        # for everyone else.
+        return await asyncio.shield(fut)
+
+    async def _is_cached(self, file_path: str) -> bool:
+        exists = await self.fs.exists(file_path)
+        if exists and disk_cache.enabled():
+            # Mark as recently used for disk cache eviction, even when
+            # touch-on-read is off.
+            try:
+                await self.fs.touch(file_path)
+            except FileNotFoundError:
+                exists = False
+        if exists:
+            disk_cache.record_hit()
+        else:
+            disk_cache.record_miss()
+        return exists
+
+    async def _download_file(self, download_url: str, file_path: str) -> None:
+        # Another request may have finished downloading between our caller's
+        # exists check and the in-flight lookup.
+        if await self.fs.exists(file_path):
+            return
+        wandb_api_context = wandb_api.get_wandb_api_context()
+        headers = None
+        cookies = None
+        auth = None
+        if wandb_api_context is not None:
+            headers = wandb_api_context.headers
+            cookies = wandb_api_context.cookies
+            if wandb_api_context.api_key is not None:
+                auth = BasicAuth("api", wandb_api_context.api_key)
+        await self.http.download_file(
+            download_url,
+            file_path,
+            headers=headers,
+            cookies=cookies,
+            auth=auth,
+        )
 
     def manifest_path(self, uri: artifact_wandb.WeaveWBArtifactURI) -> str:
         assert uri.version is not None
@@ -125,7 +221,9 @@ class WandbFileManagerAsync:
             manifest = self._manifests.get(manifest_path)
             if not isinstance(manifest, cache.LruTimeWindowCache.NotFound):
                 return manifest
-            manifest = await self._manifest(art_uri, manifest_path)
+            manifest = await self._single_flight(
+                manifest_path, lambda: self._manifest(art_uri, manifest_path)
+            )
             self._manifests.set(manifest_path, manifest)
             return manifest
 
@@ -156,23 +254,10 @@ class WandbFileManagerAsync:
             if res is None:
                 return None
             file_path, download_url = res
-            if await self.fs.exists(file_path):
+            if await self._is_cached(file_path):
                 return file_path
-            wandb_api_context = wandb_api.get_wandb_api_context()
-            headers = None
-            cookies = None
-            auth = None
-            if wandb_api_context is not None:
-                headers = wandb_api_context.headers
-                cookies = wandb_api_context.cookies
-                if wandb_api_context.api_key is not None:
-                    auth = BasicAuth("api", wandb_api_context.api_key)
-            await self.http.download_file(
-                download_url,
-                file_path,
-                headers=headers,
-                cookies=cookies,
-                auth=auth,
+            await self._single_flight(
+                file_path, lambda: self._download_file(download_url, file_path)
             )
             return file_path
 
@@ -194,23 +279,10 @@ class WandbFileManagerAsync:
         with tracer.trace("wandb_file_manager.ensure_file_downloaded") as span:
             span.set_tag("download_url", str(download_url))
             file_path = f"wandb_file_manager/{path}"
-            if await self.fs.exists(file_path):
+            if await self._is_cached(file_path):
                 return file_path
-            wandb_api_context = wandb_api.get_wandb_api_context()
-            headers = None
-            cookies = None
-            auth = None
-            if wandb_api_context is not None:
-                headers = wandb_api_context.headers
-                cookies = wandb_api_context.cookies
-                if wandb_api_context.api_key is not None:
-                    auth = BasicAuth("api", wandb_api_context.api_key)
-            await self.http.download_file(
-                download_url,
-                file_path,
-                headers=headers,
-                cookies=cookies,
-                auth=auth,
+            await self._single_flight(
+                file_path, lambda: self._download_file(download_url, file_path)
             )
             return file_path
 
@@ -242,7 +314,21 @@ class WandbFileManager:
         self.wandb_api = wandb_api
         self._manifests: cache.LruTimeWindowCache[
             str, typing.Optional[artifact_wandb.WandbArtifactManifest]
-        ] = cache.LruTimeWindowCache(datetime.timedelta(minutes=5))
+        ] = _manifest_cache()
+
+    def _is_cached(self, file_path: str) -> bool:
+        exists = self.fs.exists(file_path)
+        if exists and disk_cache.enabled():
+            # See WandbFileManagerAsync._is_cached
+            try:
+                self.fs.touch(file_path)
+            except FileNotFoundError:
+                exists = False
+        if exists:
+            disk_cache.record_hit()
+        else:
+            disk_cache.record_miss()
+        return exists
 
     def manifest_path(self, uri: artifact_wandb.WeaveWBArtifactURI) -> str:
         assert uri.version is not None
@@ -320,7 +406,7 @@ class WandbFileManager:
         with tracer.trace("wandb_file_manager.ensure_file_downloaded") as span:
             span.set_tag("download_url", str(download_url))
             file_path = f"wandb_file_manager/{path}"
-            if self.fs.exists(file_path):
+            if self._is_cached(file_path):
                 return file_path
             wandb_api_context = wandb_api.get_wandb_api_context()
             headers = None
@@ -350,7 +436,7 @@ class WandbFileManager:
             if res is None:
                 return None
             file_path, download_url = res
-            if self.fs.exists(file_path):
+            if self._is_cached(file_path):
                 return file_path
             wandb_api_context = wandb_api.get_wandb_api_context()
             headers = None
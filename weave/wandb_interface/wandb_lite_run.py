@@ -157,15 +157,17 @@ class InMemoryLazyLiteRun:
         return self._pusher
 
     def log(self, row_dict: dict) -> None:
+        self.log_rows([row_dict])
+
+    def log_rows(self, row_dicts: typing.Iterable[dict]) -> None:
         stream = self.stream
-        row_dict = {
-            **row_dict,
-            "_timestamp": datetime.datetime.utcnow().timestamp(),
-        }
-        if not self._use_async_file_stream:
-            row_dict["_step"] = self._step
-        self._step += 1
-        stream.push("wandb-history.jsonl", json.dumps(row_dict))
+        timestamp = datetime.datetime.utcnow().timestamp()
+        for row_dict in row_dicts:
+            row_dict = {**row_dict, "_timestamp": timestamp}
+            if not self._use_async_file_stream:
+                row_dict["_step"] = self._step
+            self._step += 1
+            stream.push("wandb-history.jsonl", json.dumps(row_dict))
 
     def finish(self) -> None:
         if self._stream is not None:
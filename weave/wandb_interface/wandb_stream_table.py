@@ -1,5 +1,7 @@
 import atexit
+import collections
 import contextlib
+import dataclasses
 import datetime
 import json
 import logging
@@ -22,17 +24,21 @@ from .. import runfiles_wandb
 from .. import storage
 from .. import weave_types
 from .. import artifact_base
+from .. import engine_trace
 from .. import environment
 from .. import file_util
 from .. import graph
 from .. import errors
 from ..core_types.stream_table_type import StreamTableType
+from ..language_features.tagging import tag_store
 from ..ops_domain import stream_table_ops
 from ..ops_primitives import weave_api
 
 if typing.TYPE_CHECKING:
     from wandb.sdk.internal.file_pusher import FilePusher
 
+statsd = engine_trace.statsd()  # type: ignore
+
 
 # Shawn recommended we only encode leafs, but in my testing, nested structures
 # are not handled as well in in gorilla and we can do better using just weave.
@@ -189,11 +195,7 @@ class _StreamTableSync:
         return self._weave_stream_table
 
     def log(self, row_or_rows: ROW_TYPE) -> None:
-        if isinstance(row_or_rows, dict):
-            row_or_rows = [row_or_rows]
-
-        for row in row_or_rows:
-            self._log_row(row)
+        self._log_rows([self._prepare_row(row) for row in _iter_rows(row_or_rows)])
 
     def rows(self) -> graph.Node:
         if self._weave_stream_table_ref is None:
@@ -207,13 +209,16 @@ class _StreamTableSync:
 
         return show(self.rows())
 
-    def _log_row(self, row: typing.Mapping) -> None:
+    def _prepare_row(self, row: typing.Mapping) -> dict[str, typing.Any]:
         row_copy = {**row}
         row_copy["_client_id"] = self._client_id
         if "timestamp" not in row_copy:
             row_copy["timestamp"] = datetime.datetime.now()
-        payload = row_to_weave(row_copy, self._artifact)
-        self._lite_run.log(payload)
+        return row_copy
+
+    def _log_rows(self, rows: list[dict[str, typing.Any]]) -> None:
+        payloads = [row_to_weave(row, self._artifact) for row in rows]
+        self._lite_run.log_rows(payloads)
 
     def finish(self) -> None:
         if self._lite_run:
@@ -228,7 +233,101 @@ class _StreamTableSync:
         self.finish()
 
 
+def _iter_rows(row_or_rows: ROW_TYPE) -> typing.Iterable[typing.Mapping]:
+    if isinstance(row_or_rows, dict):
+        return [row_or_rows]
+    return row_or_rows
+
+
+@dataclasses.dataclass
+class RowQueueStats:
+    queued_rows: int
+    dropped_rows: int
+
+
+class _RowQueue:
+    """Rows waiting for the StreamTable writer thread, bounded by max_rows.
+
+    When the queue is full, put() applies the overflow policy (see
+    environment.StreamTableOverflowPolicy).
+    """
+
+    def __init__(
+        self, max_rows: int, policy: environment.StreamTableOverflowPolicy
+    ) -> None:
+        self.max_rows = max_rows
+        self.policy = policy
+        self._rows: collections.deque[dict[str, typing.Any]] = collections.deque()
+        self._dropped_rows = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def stats(self) -> RowQueueStats:
+        with self._cond:
+            return RowQueueStats(len(self._rows), self._dropped_rows)
+
+    def put(self, row: dict[str, typing.Any]) -> bool:
+        """Queue a row. Returns False if the policy dropped it."""
+        with self._cond:
+            admitted = self._make_room()
+            if admitted:
+                self._rows.append(row)
+            statsd.gauge("weave.stream_table.queued_rows", len(self._rows))
+            return admitted
+
+    def _make_room(self) -> bool:
+        # Returns whether the new row should be queued.
+        Policy = environment.StreamTableOverflowPolicy
+        if self.policy == Policy.BLOCK:
+            # Nothing drains a closed queue, so don't wait on one.
+            while len(self._rows) >= self.max_rows and not self._closed:
+                self._cond.wait()
+        elif self.policy == Policy.DROP_OLDEST:
+            if len(self._rows) >= self.max_rows:
+                self._rows.popleft()
+                self._record_drop()
+        elif self.policy == Policy.SAMPLE:
+            # Keep every row up to half full, then a fraction falling
+            # linearly to none when full.
+            half = self.max_rows / 2
+            if len(self._rows) >= half and random.random() >= (
+                (self.max_rows - len(self._rows)) / half
+            ):
+                self._record_drop()
+                return False
+        return True
+
+    def _record_drop(self) -> None:
+        self._dropped_rows += 1
+        statsd.increment(
+            "weave.stream_table.dropped_rows", tags=[f"policy:{self.policy.value}"]
+        )
+
+    def get_batch(self, max_rows: int) -> list[dict[str, typing.Any]]:
+        with self._cond:
+            batch = [
+                self._rows.popleft() for _ in range(min(max_rows, len(self._rows)))
+            ]
+            self._cond.notify_all()
+            return batch
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
 class StreamTable(_StreamTableSync):
+    """A StreamTable that logs rows from a background thread.
+
+    log() only queues rows. The writer thread encodes and sends them in
+    batches of environment.stream_table_batch_rows(), whenever a batch is
+    full or every MAX_UNSAVED_SECONDS.
+    """
+
     MAX_UNSAVED_SECONDS = 2
 
     def __init__(
@@ -237,6 +336,8 @@ class StreamTable(_StreamTableSync):
         *,
         project_name: typing.Optional[str] = None,
         entity_name: typing.Optional[str] = None,
+        max_queue_rows: typing.Optional[int] = None,
+        overflow_policy: typing.Optional[environment.StreamTableOverflowPolicy] = None,
         _disable_async_file_stream: bool = False,
     ):
         super().__init__(
@@ -246,46 +347,56 @@ class StreamTable(_StreamTableSync):
             _disable_async_file_stream=_disable_async_file_stream,
         )
 
-        self.queue: queue.Queue = queue.Queue()
+        self.queue = _RowQueue(
+            max_queue_rows or environment.stream_table_max_queue_rows(),
+            overflow_policy or environment.stream_table_overflow_policy(),
+        )
+        self._batch_rows = environment.stream_table_batch_rows()
+        self._wake_rows = min(self._batch_rows, self.queue.max_rows)
         atexit.register(self._at_exit)
         self._lock = threading.Lock()
+        self._wake_event = threading.Event()
         self._join_event = threading.Event()
         self._thread = threading.Thread(target=self._thread_body)
         self._thread.daemon = True
         self._thread.start()
 
     def log(self, row_or_rows: ROW_TYPE) -> None:
-        # weave_types.TypeRegistry.type_of(row_or_rows)
-        self.queue.put(row_or_rows)
+        for row in _iter_rows(row_or_rows):
+            self.queue.put(self._prepare_row(row))
+            # Wake the writer before a blocking put could wait on it.
+            if len(self.queue) >= self._wake_rows:
+                self._wake_event.set()
+
+    def queue_stats(self) -> RowQueueStats:
+        return self.queue.stats()
 
     def _flush(self) -> None:
         with self._lock:
-            for log_payload in self._iterate_queue():
-                super().log(log_payload)
-
-    def _iterate_queue(
-        self,
-    ) -> typing.Generator[ROW_TYPE, None, None]:
-        while True:
-            try:
-                record = self.queue.get_nowait()
-            except queue.Empty:
-                break
-            else:
-                yield record
-                self.queue.task_done()
+            while True:
+                batch = self.queue.get_batch(self._batch_rows)
+                if not batch:
+                    break
+                self._log_rows(batch)
 
     def _thread_body(self) -> None:
         join_requested = False
         while not join_requested:
-            join_requested = self._join_event.wait(self.MAX_UNSAVED_SECONDS)
-            self._flush()
+            self._wake_event.wait(self.MAX_UNSAVED_SECONDS)
+            self._wake_event.clear()
+            join_requested = self._join_event.is_set()
+            try:
+                self._flush()
+            except Exception:
+                logging.exception("StreamTable failed to log rows")
 
     # Override methods of _StreamTableSync
     def finish(self) -> None:
         if hasattr(self, "_thread"):
             self._join_event.set()
+            self._wake_event.set()
             self._thread.join()
+            self.queue.close()
             with self._lock:
                 super().finish()
 
@@ -369,6 +480,38 @@ def w_type_to_type_name(w_type: typing.Union[str, dict]) -> str:
         return w_type["type"]
 
 
+# Rows logged to a table mostly have the same shape, so the types of their
+# leaves repeat. We remember the type of leaf classes whose weave type has no
+# parameters, so their instances skip type inference, and the encoded name of
+# every type we've seen.
+_LEAF_TYPE_CACHE_SIZE = 1000
+_leaf_class_types: dict[type, weave_types.Type] = {}
+_type_names: dict[weave_types.Type, str] = {}
+
+
+def _leaf_type(leaf: typing.Any) -> weave_types.Type:
+    if tag_store.is_tagged(leaf):
+        return weave_types.TypeRegistry.type_of(leaf)
+    leaf_class = type(leaf)
+    w_type = _leaf_class_types.get(leaf_class)
+    if w_type is None:
+        w_type = weave_types.TypeRegistry.type_of(leaf)
+        if not dataclasses.fields(w_type) and len(_leaf_class_types) < (
+            _LEAF_TYPE_CACHE_SIZE
+        ):
+            _leaf_class_types[leaf_class] = w_type
+    return w_type
+
+
+def _type_name(w_type: weave_types.Type, w_type_dict: typing.Union[str, dict]) -> str:
+    type_name = _type_names.get(w_type)
+    if type_name is None:
+        type_name = w_type_to_type_name(w_type_dict)
+        if len(_type_names) < _LEAF_TYPE_CACHE_SIZE:
+            _type_names[w_type] = type_name
+    return type_name
+
+
 def leaf_to_weave(leaf: typing.Any, artifact: WandbLiveRunFiles) -> typing.Any:
     def ref_persister_artifact(
         type: weave_types.Type, refs: typing.Iterable[artifact_base.ArtifactRef]
@@ -382,10 +525,11 @@ def leaf_to_weave(leaf: typing.Any, artifact: WandbLiveRunFiles) -> typing.Any:
                 artifact.set(path, mem_ref._type, mem_ref._obj)
         return artifact
 
-    res = storage.to_python(leaf, None, ref_persister_artifact)
+    leaf_type = _leaf_type(leaf)
+    res = storage.to_python(leaf, leaf_type, ref_persister_artifact)
 
     w_type = res["_type"]
-    type_name = w_type_to_type_name(w_type)
+    type_name = _type_name(leaf_type, w_type)
 
     if ENCODE_ENTIRE_TYPE:
         return {"_type": type_name, "_val": res["_val"]}
@@ -1,3 +1,4 @@
+import contextvars
 import cProfile
 import os
 import logging
@@ -5,9 +6,7 @@ import pathlib
 import time
 import traceback
 import sys
-import base64
 import typing
-import zlib
 import urllib.parse
 import requests
 from flask import json
@@ -23,8 +22,10 @@ import wandb
 from weave import context_state, graph, server, value_or_error
 from weave import storage
 from weave import registry_mem
+from weave import request_capture
 from weave import errors
 from weave import weavejs_fixes
+from weave import weavejs_arrow
 from weave import util
 from weave import engine_trace
 from weave import environment
@@ -284,17 +285,12 @@ def execute():
     """Execute endpoint used by WeaveJS."""
     with tracer.trace("read_request"):
         req_bytes = request.data
-    req_compressed = zlib.compress(req_bytes)
-    req_b64 = base64.b64encode(req_compressed).decode("ascii")
-    logging.info(
-        "Execute request (zlib): %s",
-        req_b64,
-    )
 
     if not request.json:
         abort(400, "Request body must be JSON.")
     if "graphs" not in request.json:
         abort(400, "Request body must contain a 'graphs' key.")
+    request_capture.maybe_capture(req_bytes)
 
     # Simulate browser/server latency
     # import time
@@ -303,10 +299,11 @@ def execute():
     # use a single memartifact to serialize the entire response.
     # fixes https://weights-biases.sentry.io/issues/4022569419
 
+    arrow_results = weavejs_arrow.client_accepts_arrow(request.accept_mimetypes)
     execute_args = {
         "request": request.json,
         "deref": True,
-        "serialize_fn": storage.make_js_serializer(),
+        "serialize_fn": storage.make_js_serializer(arrow_results=arrow_results),
     }
     root_span = tracer.current_root_span()
     tag_store.record_current_tag_store_size()
@@ -352,9 +349,92 @@ def execute():
     if request.headers.get("x-weave-include-execution-time"):
         response_payload["execution_time"] = (elapsed) * 1000
 
+    if arrow_results:
+        return _arrow_multipart_response(response_payload)
     return response_payload
 
 
+def _arrow_multipart_response(response_payload: ResponseDict) -> Response:
+    arrow_parts: list[int] = []
+    results: list[weavejs_arrow.ArrowResult] = []
+    data = response_payload["data"]
+    for i, val in enumerate(data):
+        if isinstance(val, weavejs_arrow.ArrowResult):
+            arrow_parts.append(i)
+            results.append(val)
+            data[i] = None
+    json_payload = json.dumps({**response_payload, "arrow_parts": arrow_parts})
+    boundary = weavejs_arrow.new_boundary()
+    return Response(
+        weavejs_arrow.multipart_response_chunks(
+            json_payload.encode(), results, boundary
+        ),
+        content_type=f"multipart/mixed; boundary={boundary}",
+    )
+
+
+@blueprint.route("/__weave/execute/stream", methods=["POST"])
+def execute_stream():
+    """Streaming execute endpoint used by WeaveJS.
+
+    Responds with newline delimited json, one line per node, in the order the
+    nodes finish. Each line has the node's "index" in the request, the
+    "execution_time" in ms from the start of the request until the node
+    finished, and the node's result in the /__weave/execute response shape.
+    """
+    if not request.json:
+        abort(400, "Request body must be JSON.")
+    if "graphs" not in request.json:
+        abort(400, "Request body must contain a 'graphs' key.")
+    request_capture.maybe_capture(request.data)
+    tag_store.record_current_tag_store_size()
+
+    client_cache_key = _get_client_cache_key_from_request(request)
+    # Execution continues after this function returns, while the response is
+    # streamed. Carry the request's context along.
+    with context_state.set_client_cache_key(client_cache_key):
+        ctx = contextvars.copy_context()
+
+    with client_safe_http_exceptions_as_werkzeug():
+        results = ctx.run(
+            server.handle_request_streaming,
+            request.json,
+            deref=True,
+            serialize_fn=storage.make_js_serializer(),
+        )
+
+    def generate() -> typing.Iterator[bytes]:
+        try:
+            while True:
+                streamed = ctx.run(next, results, None)
+                if streamed is None:
+                    return
+                yield _streamed_result_line(streamed)
+        finally:
+            ctx.run(results.close)
+
+    return Response(generate(), mimetype="application/x-ndjson")
+
+
+def _streamed_result_line(streamed: server.StreamedNodeResult) -> bytes:
+    fixed = streamed.result.transform_and_catch(weavejs_fixes.fixup_data)
+    response_payload = _value_or_errors_to_response(
+        value_or_error.ValueOrErrors([fixed])
+    )
+    _log_errors(
+        response_payload,
+        value_or_error.ValueOrErrors(
+            [] if streamed.node is None else [value_or_error.Value(streamed.node)]
+        ),
+    )
+    line = {
+        "index": streamed.index,
+        "execution_time": streamed.elapsed * 1000,
+        **response_payload,
+    }
+    return (json.dumps(line) + "\n").encode()
+
+
 @blueprint.route("/__weave/execute/v2", methods=["POST"])
 def execute_v2():
     """Execute endpoint used by Weave Python"""
@@ -1,3 +1,5 @@
+import contextlib
+import contextvars
 import dataclasses
 import datetime
 import typing
@@ -8,6 +10,7 @@ from collections.abc import Iterable
 
 
 from . import box
+from . import environment
 from . import errors
 from . import mappers_python
 from . import timestamp as weave_timestamp
@@ -138,17 +141,111 @@ class TypeRegistry:
     def type_from_dict(d: typing.Union[str, dict]) -> "Type":
         # The javascript code sends simple types as just strings
         # instead of {'type': 'string'} for example
-        type_name = d["type"] if isinstance(d, dict) else d
-        type_ = type_name_to_type(type_name)
-        if type_ is None:
-            raise errors.WeaveSerializeError("Can't deserialize type from: %s" % d)
-        return type_.from_dict(d)
+        if isinstance(d, dict) and not _decoding_type.get():
+            try:
+                type_json = json.dumps(d)
+            except (TypeError, ValueError):
+                pass
+            else:
+                return _type_from_json(type_json)
+        return _type_from_dict(d)
+
+
+def _type_from_dict(d: typing.Union[str, dict]) -> "Type":
+    type_name = d["type"] if isinstance(d, dict) else d
+    type_ = type_name_to_type(type_name)
+    if type_ is None:
+        raise errors.WeaveSerializeError("Can't deserialize type from: %s" % d)
+    return type_.from_dict(d)
+
+
+# Type caches
+#
+# Types are immutable, and some operations on them are repeated with the same
+# arguments over and over:
+# - Types without parameters (Int(), String(), ...) are singletons.
+# - type_from_dict results are cached by the JSON of the dict, so decoding the
+#   same type twice gives the same instance. Only the outermost dict is
+#   looked up, the types nested in it are decoded along with it.
+# - assign_type results are memoized by the identity of both types. With the
+#   two above, repeated dispatch against the same types is a lookup.
+#
+# type_cache_stats() counts hits and misses.
+
+TYPE_FROM_DICT_CACHE_SIZE = 10000
+ASSIGN_TYPE_MEMO_SIZE = 100000
+
+
+@dataclasses.dataclass
+class TypeCacheStats:
+    type_from_dict_hits: int = 0
+    type_from_dict_misses: int = 0
+    assign_type_hits: int = 0
+    assign_type_misses: int = 0
+    sampled_type_of: int = 0
+
+
+_type_cache_stats_ctx: contextvars.ContextVar[
+    typing.Optional[TypeCacheStats]
+] = contextvars.ContextVar("_type_cache_stats_ctx", default=None)
+
+
+@contextlib.contextmanager
+def type_cache_stats() -> typing.Iterator[TypeCacheStats]:
+    """Will count type cache hits and misses within this context, including recursively."""
+    stats = _type_cache_stats_ctx.get()
+    token = None
+    if stats is None:
+        stats = TypeCacheStats()
+        token = _type_cache_stats_ctx.set(stats)
+    try:
+        yield stats
+    finally:
+        if token is not None:
+            _type_cache_stats_ctx.reset(token)
+
+
+_decoding_type: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "_decoding_type", default=False
+)
+
+
+@functools.lru_cache(maxsize=TYPE_FROM_DICT_CACHE_SIZE)
+def _type_from_json_cached(type_json: str) -> "Type":
+    stats = _type_cache_stats_ctx.get()
+    if stats is not None:
+        stats.type_from_dict_misses += 1
+    token = _decoding_type.set(True)
+    try:
+        return _type_from_dict(json.loads(type_json))
+    finally:
+        _decoding_type.reset(token)
+
+
+def _type_from_json(type_json: str) -> "Type":
+    stats = _type_cache_stats_ctx.get()
+    if stats is None:
+        return _type_from_json_cached(type_json)
+    misses = stats.type_from_dict_misses
+    result = _type_from_json_cached(type_json)
+    if stats.type_from_dict_misses == misses:
+        stats.type_from_dict_hits += 1
+    return result
+
+
+_parameterless_types: dict[type, "Type"] = {}
+
+# (id(a), id(b)) -> (a, b, a.assign_type(b)). Entries hold on to their types,
+# so their ids can't be reused while they're in the memo.
+_assign_type_memo: dict[typing.Tuple[int, int], typing.Tuple["Type", "Type", bool]] = {}
 
 
 def _clear_global_type_class_cache():
     instance_class_to_potential_type.cache_clear()
     type_name_to_type_map.cache_clear()
     type_name_to_type.cache_clear()
+    _type_from_json_cached.cache_clear()
+    _assign_type_memo.clear()
 
 
 def _cached_hash(self):
@@ -184,6 +281,16 @@ class _TypeSubclassWatcher(type):
         # Override the dataclass __hash__ with our own version
         cls.__hash__ = _cached_hash
 
+    def __call__(cls, *args, **kwargs):
+        if args or kwargs:
+            return super().__call__(*args, **kwargs)
+        instance = _parameterless_types.get(cls)
+        if instance is None:
+            instance = super().__call__()
+            if not dataclasses.fields(instance):
+                _parameterless_types[cls] = instance
+        return instance
+
 
 @dataclasses.dataclass(frozen=True)
 class Type(metaclass=_TypeSubclassWatcher):
@@ -274,6 +381,22 @@ class Type(metaclass=_TypeSubclassWatcher):
         return self._instance_classes()[-1]
 
     def assign_type(self, next_type: "Type") -> bool:
+        key = (id(self), id(next_type))
+        memo = _assign_type_memo.get(key)
+        stats = _type_cache_stats_ctx.get()
+        if memo is not None and memo[0] is self and memo[1] is next_type:
+            if stats is not None:
+                stats.assign_type_hits += 1
+            return memo[2]
+        if stats is not None:
+            stats.assign_type_misses += 1
+        result = self._assign_type_uncached(next_type)
+        if len(_assign_type_memo) >= ASSIGN_TYPE_MEMO_SIZE:
+            _assign_type_memo.clear()
+        _assign_type_memo[key] = (self, next_type, result)
+        return result
+
+    def _assign_type_uncached(self, next_type: "Type") -> bool:
         # assign_type needs to be as fast as possible, so there are optimizations
         # throughout this code path, like checking for class equality instead of using isinstance
 
@@ -786,6 +909,9 @@ class List(Type):
     def type_of_instance(cls, obj):
         if not obj:
             return cls(UnknownType())
+        sampled_type = _sampled_list_object_type(obj)
+        if sampled_type is not None:
+            return cls(sampled_type)
         list_obj_type = TypeRegistry.type_of(obj[0])
         for item in obj[1:]:
             obj_type = TypeRegistry.type_of(item)
@@ -1261,6 +1387,24 @@ def merge_many_types(types: list[Type]) -> Type:
     return t
 
 
+def _sampled_list_object_type(obj: typing.Sequence) -> typing.Optional[Type]:
+    # Opt in with WEAVE_TYPE_OF_SAMPLE_ROWS. If evenly spaced items of a long
+    # list all have the same type, we take it as the type of every item.
+    # Lists whose other items differ get the wrong type!
+    sample_rows = environment.type_of_sample_rows()
+    if sample_rows is None or len(obj) <= sample_rows:
+        return None
+    step = (len(obj) - 1) / (sample_rows - 1)
+    sample_type = TypeRegistry.type_of(obj[0])
+    for i in range(1, sample_rows):
+        if TypeRegistry.type_of(obj[round(i * step)]) != sample_type:
+            return None
+    stats = _type_cache_stats_ctx.get()
+    if stats is not None:
+        stats.sampled_type_of += 1
+    return sample_type
+
+
 def merge_types(a: Type, b: Type) -> Type:
     """Compute the next list object type.
 
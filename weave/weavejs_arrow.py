@@ -0,0 +1,97 @@
+# Arrow IPC encoding of /__weave/execute responses.
+#
+# By default the execute endpoint converts ArrowWeaveList results to python
+# lists, walks them with the weavejs_fixes tree fixups and json encodes them.
+# For large tables that is where most of the request time goes.
+#
+# Clients opt in by sending `Accept: application/vnd.apache.arrow.stream`. They
+# get a multipart/mixed response instead. The first part is the usual json
+# payload, with every top-level ArrowWeaveList result set to null and an extra
+# "arrow_parts" key listing the indexes of those nodes. Each following part is
+# an Arrow IPC stream holding one of those results, in the same order, as a
+# single "value" column. The fixups run as vectorized column transforms (see
+# weavejs_fixes.fixup_arrow_data). Every other result stays json.
+
+import dataclasses
+import io
+import typing
+
+import pyarrow as pa
+
+from . import engine_trace
+from . import util
+from . import weavejs_fixes
+from .ops_arrow import list_ as arrow_list
+from .ops_arrow.arrow import arrow_as_array
+
+statsd = engine_trace.statsd()  # type: ignore
+
+ARROW_STREAM_MIMETYPE = "application/vnd.apache.arrow.stream"
+
+# Rows per record batch in the IPC streams
+RECORD_BATCH_ROWS = 64 * 1024
+
+
+@dataclasses.dataclass
+class ArrowResult:
+    table: pa.Table
+
+
+def client_accepts_arrow(accept_mimetypes: typing.Iterable[tuple[str, float]]) -> bool:
+    # An exact match only, */* doesn't opt in.
+    return any(
+        mimetype == ARROW_STREAM_MIMETYPE and quality > 0
+        for mimetype, quality in accept_mimetypes
+    )
+
+
+def to_arrow_result(obj: typing.Any) -> typing.Optional[ArrowResult]:
+    """Returns the arrow encoding of obj, or None if it should be sent as json."""
+    if not isinstance(obj, arrow_list.ArrowWeaveList):
+        return None
+    value_awl, _ = obj.separate_tags()
+    arr = weavejs_fixes.fixup_arrow_data(arrow_as_array(value_awl._arrow_data))
+    return ArrowResult(pa.table({"value": arr}))
+
+
+def _part_header(boundary: str, content_type: str) -> bytes:
+    return f"--{boundary}\r\nContent-Type: {content_type}\r\n\r\n".encode()
+
+
+def _ipc_stream_chunks(table: pa.Table) -> typing.Iterator[bytes]:
+    buf = io.BytesIO()
+
+    def take() -> bytes:
+        chunk = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        return chunk
+
+    with pa.ipc.new_stream(buf, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=RECORD_BATCH_ROWS):
+            writer.write_batch(batch)
+            yield take()
+    # End of stream marker, and the schema if there were no batches.
+    yield take()
+
+
+def new_boundary() -> str:
+    return f"weave-{util.rand_string_n(24)}"
+
+
+def multipart_response_chunks(
+    json_payload: bytes,
+    arrow_results: list[ArrowResult],
+    boundary: str,
+) -> typing.Iterator[bytes]:
+    yield _part_header(boundary, "application/json")
+    yield json_payload
+    yield b"\r\n"
+    for result in arrow_results:
+        yield _part_header(boundary, ARROW_STREAM_MIMETYPE)
+        for chunk in _ipc_stream_chunks(result.table):
+            statsd.increment("weave.execute.arrow_bytes", len(chunk))
+            yield chunk
+        yield b"\r\n"
+    yield f"--{boundary}--\r\n".encode()
+
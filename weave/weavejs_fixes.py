@@ -7,6 +7,9 @@ import typing
 import copy
 import math
 
+import pyarrow as pa
+import pyarrow.compute as pc
+
 from . import weave_types
 from . import graph
 from . import weave_types
@@ -228,3 +231,60 @@ def fixup_data(data):
     data = remove_nan_and_inf(data)
     data = remove_partialobject_from_types(data)
     return convert_specific_ops_to_generic_ops_data(data)
+
+
+def _arrow_type_needs_fixup(t: pa.DataType) -> bool:
+    if pa.types.is_float32(t) or pa.types.is_float64(t) or pa.types.is_timestamp(t):
+        return True
+    if pa.types.is_dictionary(t):
+        return _arrow_type_needs_fixup(t.value_type)
+    if pa.types.is_list(t) or pa.types.is_large_list(t):
+        return _arrow_type_needs_fixup(t.value_type)
+    if pa.types.is_struct(t) or pa.types.is_union(t):
+        return any(
+            _arrow_type_needs_fixup(t.field(i).type) for i in range(t.num_fields)
+        )
+    return False
+
+
+def fixup_arrow_data(arr: pa.Array) -> pa.Array:
+    """Vectorized fixup_data for Arrow encoded results.
+
+    Also converts timestamps to epoch ms, like storage.to_weavejs does for
+    python values. Arrow data doesn't hold serialized unions, graphs or types,
+    so NaN/inf removal is the only fixup_data step that applies.
+    """
+    t = arr.type
+    if not _arrow_type_needs_fixup(t):
+        return arr
+    if pa.types.is_float32(t) or pa.types.is_float64(t):
+        return pc.if_else(pc.is_finite(arr), arr, pa.scalar(0, t))
+    if pa.types.is_timestamp(t):
+        ms = pc.cast(arr, pa.timestamp("ms", tz=t.tz), safe=False)
+        return ms.cast(pa.int64())
+    mask = arr.is_null() if arr.null_count else None
+    if pa.types.is_dictionary(t):
+        return pa.DictionaryArray.from_arrays(
+            arr.indices, fixup_arrow_data(arr.dictionary)
+        )
+    if pa.types.is_list(t) or pa.types.is_large_list(t):
+        offsets = arr.offsets
+        if len(offsets) and offsets[0].as_py() != 0:
+            offsets = pc.subtract(offsets, offsets[0])
+        list_cls = pa.ListArray if pa.types.is_list(t) else pa.LargeListArray
+        return list_cls.from_arrays(offsets, fixup_arrow_data(arr.flatten()), mask=mask)
+    if pa.types.is_struct(t):
+        # flatten() accounts for slicing, unlike field()
+        return pa.StructArray.from_arrays(
+            [fixup_arrow_data(child) for child in arr.flatten()],
+            names=[t.field(i).name for i in range(t.num_fields)],
+            mask=mask,
+        )
+    # Union
+    children = [fixup_arrow_data(arr.field(i)) for i in range(t.num_fields)]
+    names = [t.field(i).name for i in range(t.num_fields)]
+    if t.mode == "dense":
+        return pa.UnionArray.from_dense(
+            arr.type_codes, arr.offsets, children, names, t.type_codes
+        )
+    return pa.UnionArray.from_sparse(arr.type_codes, children, names, t.type_codes)